@@ -0,0 +1,56 @@
+"""
+Agent für die Überwachung mehrerer Rechner.
+
+Sammelt dieselben Daten wie das Dashboard und schickt sie über TCP an alle
+verbundenen Dashboards (Protokoll: monitor/protocol.py). Das Dashboard
+verbindet sich mit `python main.py --remote host1,host2:9878`.
+
+    python agent.py --port 9878 --interval 1
+
+Wie headless.py importiert dieses Modul weder PySide6 noch numpy.
+"""
+import argparse
+import sys
+
+from monitor.remote import DEFAULT_PORT, AgentServer
+from monitor.system_stats import (configure_backend, configure_processes, create_default_scheduler,
+                                  get_all_system_stats)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="System Monitor Agent (liefert Daten an entfernte Dashboards)")
+    parser.add_argument("-p", "--port", type=int, default=DEFAULT_PORT,
+                        help=f"TCP-Port (Standard: {DEFAULT_PORT}, 0 = beliebiger freier Port)")
+    parser.add_argument("--host", default="0.0.0.0",
+                        help="Adresse, an die der Agent gebunden wird (Standard: 0.0.0.0)")
+    parser.add_argument("-i", "--interval", type=float, default=1.0,
+                        help="Sekunden zwischen zwei Snapshots (Standard: 1)")
+    parser.add_argument("--name", help="Angezeigter Hostname (Standard: Hostname des Rechners)")
+    parser.add_argument("--backend", choices=("auto", "procfs", "psutil"),
+                        help="Quelle der Zähler (Standard: SYSMON_BACKEND oder auto)")
+    parser.add_argument("--group-processes", choices=("name", "user", "cgroup"),
+                        help="Prozessliste nach Name, Benutzer oder cgroup zusammenfassen (Standard: pro PID)")
+    args = parser.parse_args(argv)
+
+    if args.interval <= 0:
+        parser.error("--interval muss größer als 0 sein")
+    try:
+        configure_backend(args.backend)
+        configure_processes(args.group_processes)
+    except (ValueError, OSError) as e:
+        parser.error(str(e))
+
+    scheduler = create_default_scheduler()
+    server = AgentServer(lambda: get_all_system_stats(scheduler), args.host, args.port, args.interval, args.name)
+    try:
+        server.run(bereit=lambda port: print(f"Agent lauscht auf {args.host}:{port}", flush=True))
+    except OSError as e:
+        print(f"Agent konnte nicht starten: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+Gemeinsame Hilfsfunktionen für die Benchmarks (Zeitmessung, Allokationen,
+JSON-Ausgabe und Vergleich mit einem früheren Lauf).
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def _percentile(sortiert, p):
+    if not sortiert:
+        return 0.0
+    k = (len(sortiert) - 1) * p / 100
+    f = int(k)
+    c = min(f + 1, len(sortiert) - 1)
+    return sortiert[f] + (sortiert[c] - sortiert[f]) * (k - f)
+
+
+def measure(func, iterations=200, warmup=5, alloc_iterations=20):
+    """
+    Misst func() `iterations` mal und gibt die Latenzverteilung in µs zurück.
+    Allokationen werden in einem separaten Durchlauf mit tracemalloc gemessen,
+    damit dessen Overhead die Zeiten nicht verfälscht.
+    """
+    for _ in range(warmup):
+        func()
+
+    zeiten = []
+    gc_aktiv = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(iterations):
+            start = time.perf_counter_ns()
+            func()
+            zeiten.append((time.perf_counter_ns() - start) / 1000)
+    finally:
+        if gc_aktiv:
+            gc.enable()
+
+    peaks = []
+    netto = []
+    tracemalloc.start()
+    try:
+        for _ in range(alloc_iterations):
+            tracemalloc.reset_peak()
+            vorher, _ = tracemalloc.get_traced_memory()
+            func()
+            nachher, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - vorher)
+            netto.append(nachher - vorher)
+    finally:
+        tracemalloc.stop()
+
+    zeiten.sort()
+    return {
+        "n": iterations,
+        "mean_us": round(statistics.fmean(zeiten), 2),
+        "min_us": round(zeiten[0], 2),
+        "p50_us": round(_percentile(zeiten, 50), 2),
+        "p90_us": round(_percentile(zeiten, 90), 2),
+        "p99_us": round(_percentile(zeiten, 99), 2),
+        "max_us": round(zeiten[-1], 2),
+        "alloc_peak_bytes": int(statistics.median(peaks)) if peaks else 0,
+        "alloc_net_bytes": int(statistics.median(netto)) if netto else 0,
+    }
+
+
+def metadata():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "zeitpunkt": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def parser(beschreibung):
+    p = argparse.ArgumentParser(description=beschreibung)
+    p.add_argument("--iterations", type=int, default=200, help="Messungen pro Fall")
+    p.add_argument("--filter", default="", help="Nur Fälle, deren Name diesen Text enthält")
+    p.add_argument("--json", help="Ergebnisse als JSON speichern")
+    p.add_argument("--compare", help="Mit einem früher gespeicherten JSON vergleichen")
+    return p
+
+
+def run_cases(cases, args, extra_meta=None):
+    """cases: Liste von (name, func). Misst alle Fälle, gibt eine Tabelle aus und speichert JSON."""
+    alt = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            alt = json.load(f)["results"]
+
+    ergebnisse = {}
+    kopf = f"{'Fall':<44}{'p50 µs':>10}{'p90 µs':>10}{'p99 µs':>10}{'Peak KB':>10}"
+    print(kopf + (f"{'vorher p50':>12}{'Faktor':>8}" if alt else ""))
+    for name, func in cases:
+        if args.filter and args.filter not in name:
+            continue
+        r = measure(func, iterations=args.iterations)
+        ergebnisse[name] = r
+        zeile = (f"{name:<44}{r['p50_us']:>10.1f}{r['p90_us']:>10.1f}{r['p99_us']:>10.1f}"
+                 f"{r['alloc_peak_bytes'] / 1024:>10.1f}")
+        if name in alt:
+            vorher = alt[name]["p50_us"]
+            zeile += f"{vorher:>12.1f}{r['p50_us'] / vorher if vorher else 0:>8.2f}"
+        print(zeile, flush=True)
+
+    if args.json:
+        meta = metadata()
+        meta.update(extra_meta or {})
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": ergebnisse}, f, indent=2)
+    return ergebnisse
@@ -0,0 +1,69 @@
+"""
+Benchmark der Collector in monitor/system_stats.py und des kompletten
+get_all_system_stats()-Zyklus auf dem aktuellen System.
+
+    python benchmarks/collectors.py --json collectors.json
+    python benchmarks/collectors.py --compare collectors.json
+"""
+import sys
+
+import bench_common
+from monitor import protocol, system_stats
+from monitor.alerts import DEFAULT_RULES, AlertEngine, parse_rules
+from monitor.exporter import render_openmetrics
+from monitor.snapshots import snapshot_from_plain, to_plain
+
+
+def cases():
+    # Die Internetprüfung läuft im Hintergrund; gemessen wird nur das Lesen des Caches
+    system_stats.configure_internet_monitor()
+
+    liste = [(f"collector.{spec.name}", spec.func)
+             for spec in system_stats.create_default_scheduler().collectors.values()]
+
+    # Kompletter Zyklus: einmal mit den Standard-Intervallen (typischer Tick) und
+    # einmal mit allen Collectorn in jedem Tick (schlechtester Fall)
+    scheduler = system_stats.create_default_scheduler()
+    liste.append(("get_all_system_stats.tick", lambda: system_stats.get_all_system_stats(scheduler)))
+
+    voll = system_stats.create_default_scheduler()
+
+    def alle():
+        voll.invalidate()
+        return system_stats.get_all_system_stats(voll)
+
+    liste.append(("get_all_system_stats.alle", alle))
+
+    # Weiterverarbeitung eines Snapshots
+    snapshot = alle()
+    liste.append(("snapshot.to_plain", lambda: to_plain(snapshot)))
+    liste.append(("snapshot.render_openmetrics", lambda: render_openmetrics(snapshot)))
+
+    # Remote-Protokoll: ein typischer Tick gegenüber dem vorherigen Snapshot
+    alt = to_plain(snapshot)
+    neu = to_plain(system_stats.get_all_system_stats(scheduler))
+    delta = protocol.encode_frame(protocol.DELTA, 2, neu, basis=alt)[protocol.HEADER.size:]
+    liste.append(("protocol.encode_voll", lambda: protocol.encode_frame(protocol.VOLL, 1, neu)))
+    liste.append(("protocol.encode_delta", lambda: protocol.encode_frame(protocol.DELTA, 2, neu, basis=alt)))
+    liste.append(("protocol.decode_delta", lambda: protocol.decode_payload(protocol.DELTA, delta, alt)))
+    liste.append(("protocol.snapshot_from_plain", lambda: snapshot_from_plain(neu)))
+
+    # Alarmregeln: die Standardregeln und 300 Regeln über Kerne und Prozesse
+    standard = AlertEngine(parse_rules(DEFAULT_RULES))
+    viele = AlertEngine(parse_rules("\n".join(
+        [f"ram.auslastung > {50 + i % 50} for 30s" for i in range(100)]
+        + [f"cpu.alle_kerne.* > {50 + i % 50}" for i in range(100)]
+        + [f"cpu_prozesses.*.cpu_prozent > {i % 100}" for i in range(100)])))
+    liste.append(("alerts.evaluate_standard", lambda: standard.evaluate(snapshot)))
+    liste.append(("alerts.evaluate_300", lambda: viele.evaluate(snapshot)))
+    return liste
+
+
+def main(argv=None):
+    args = bench_common.parser(__doc__.strip().splitlines()[0]).parse_args(argv)
+    bench_common.run_cases(cases(), args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
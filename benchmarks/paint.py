@@ -0,0 +1,177 @@
+"""
+Benchmark für das Zeichnen der Widgets (offscreen) mit synthetischen Daten
+in mehreren Größenordnungen: 4/64/256 Kerne, 100/10k Prozesse, 60/3600
+Verlaufspunkte.
+
+    python benchmarks/paint.py --json paint.json
+    python benchmarks/paint.py --compare paint.json --filter CpuCoreBars
+
+Gemessen wird pro Fall ein Tick (Setter mit neuen Daten + synchrones
+repaint()) sowie mit dem Suffix ".kalt" ein repaint() ohne gecachten
+Hintergrund.
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import bench_common
+from PySide6.QtCore import qVersion
+from PySide6.QtWidgets import QApplication
+
+from monitor.metric_store import MetricStore
+from monitor.snapshots import (BatterySnapshot, BootSnapshot, CpuModi, CpuSnapshot, DiskIOSnapshot,
+                               DiskRateSnapshot, DiskUsageSnapshot, InterfaceSnapshot, InternetSnapshot,
+                               NetzwerkSnapshot, NicRateSnapshot, ProzessEintrag, RamSnapshot,
+                               SystemInfoSnapshot, SystemSnapshot)
+from widgets import system_widgets as sw
+from widgets.host_grid import HostGridWidget, HostKachel
+
+KERNE = (4, 64, 256)
+PROZESSE = (100, 10_000)
+PUNKTE = (60, 3600)
+HOSTS = (10, 120)
+
+
+def make_snapshot(rng, kerne=8, prozesse=100, zeitpunkt=None):
+    """Erzeugt einen vollständigen SystemSnapshot mit Zufallswerten"""
+    kern_werte = tuple(rng.uniform(0, 100) for _ in range(kerne))
+    gb = 1024 ** 3
+    return SystemSnapshot(
+        zeitpunkt=zeitpunkt or time.time(),
+        cpu=CpuSnapshot(sum(kern_werte) / kerne, kern_werte, CpuModi(20.0, 5.0, 1.0, 0.0, 0.5), 3200.0),
+        ram=RamSnapshot(int(rng.uniform(2, 14) * gb), 16 * gb, 4 * gb, rng.uniform(10, 90)),
+        netzwerk=NetzwerkSnapshot(rng.randrange(10 ** 10), rng.randrange(10 ** 10)),
+        io=DiskIOSnapshot(rng.randrange(10 ** 11), rng.randrange(10 ** 11),
+                          rng.randrange(10 ** 6), rng.randrange(10 ** 6)),
+        usage=DiskUsageSnapshot(512 * gb, int(rng.uniform(100, 500) * gb), 100 * gb, rng.uniform(20, 95)),
+        battery=BatterySnapshot(rng.uniform(5, 100), 3600, rng.random() < 0.5),
+        boot=BootSnapshot(time.time() - 86400, 86400.0),
+        system_info=SystemInfoSnapshot("bench-host", "Linux", "6.0", "#1", "x86_64", "x86_64"),
+        internet=InternetSnapshot(True, rng.uniform(5, 50), "8.8.8.8:53", 1.0, False, 0),
+        network_interfaces={f"eth{i}": InterfaceSnapshot(True, (f"10.0.0.{i}",), 1000) for i in range(3)},
+        cpu_prozesses=sorted((ProzessEintrag(f"prozess-{i}", rng.uniform(0, 100), pid=1000 + i,
+                                             rss_bytes=rng.randrange(1, 2 ** 32), threads=rng.randrange(1, 64))
+                              for i in range(prozesse)),
+                             key=lambda p: p.cpu_prozent, reverse=True),
+        disk_raten={f"sd{c}": DiskRateSnapshot(rng.uniform(0, 10 ** 8), rng.uniform(0, 10 ** 8), rng.uniform(0, 500),
+                                               rng.uniform(0, 500), rng.uniform(0, 100), rng.uniform(0, 20))
+                    for c in "abcd"},
+        nic_raten={f"eth{i}": NicRateSnapshot(rng.uniform(0, 10 ** 8), rng.uniform(0, 10 ** 8),
+                                              rng.uniform(0, 10 ** 4), rng.uniform(0, 10 ** 4))
+                   for i in range(3)},
+    )
+
+
+def _widget(cls, *args, size=(380, 190), **kwargs):
+    widget = cls(*args, **kwargs)
+    widget.resize(*size)
+    widget.show()
+    return widget
+
+
+def _tick_case(widget, setter, snapshots):
+    """Abwechselnd zwei Snapshots setzen, damit die Dirty-Prüfung nicht greift"""
+    zustand = {"i": 0}
+
+    def tick():
+        zustand["i"] ^= 1
+        setter(snapshots[zustand["i"]])
+        widget.repaint()
+
+    return tick
+
+
+def _cold_case(widget):
+    def kalt():
+        widget.invalidate_background()
+        widget.repaint()
+
+    return kalt
+
+
+def cases(rng):
+    liste = []
+    paar = [make_snapshot(rng), make_snapshot(rng)]
+
+    einfache = [
+        ("CpuCircleWidget", sw.CpuCircleWidget, lambda w: lambda s: w.set_auslastung(s.cpu.auslastung_prozent)),
+        ("CpuInfoWidget", sw.CpuInfoWidget, lambda w: lambda s: w.set_cpu_info(s.cpu, s.boot)),
+        ("RamWidget", sw.RamWidget, lambda w: lambda s: w.set_ram_data(s.ram)),
+        ("DiskWidget", sw.DiskWidget, lambda w: lambda s: w.set_disk_data(s.usage)),
+        ("DiskIOWidget", sw.DiskIOWidget, lambda w: lambda s: w.set_disk_io_data(s.io)),
+        ("NetworkWidget", sw.NetworkWidget,
+         lambda w: lambda s: w.set_network_data(s.netzwerk, s.internet, s.network_interfaces)),
+        ("BatteryWidget", sw.BatteryWidget, lambda w: lambda s: w.set_battery_data(s.battery)),
+        ("SystemInfoWidget", sw.SystemInfoWidget, lambda w: lambda s: w.set_system_data(s.system_info, s.boot)),
+        ("DiskThroughputWidget", sw.DiskThroughputWidget, lambda w: lambda s: w.set_rates(s.disk_raten, s.zeitpunkt)),
+        ("NicThroughputWidget", sw.NicThroughputWidget, lambda w: lambda s: w.set_rates(s.nic_raten, s.zeitpunkt)),
+    ]
+    for name, cls, setter in einfache:
+        widget = _widget(cls)
+        liste.append((f"paint.{name}", _tick_case(widget, setter(widget), paar)))
+        liste.append((f"paint.{name}.kalt", _cold_case(widget)))
+
+    for kerne in KERNE:
+        snapshots = [make_snapshot(rng, kerne=kerne), make_snapshot(rng, kerne=kerne)]
+        widget = _widget(sw.CpuCoreBarsWidget, size=(380, 190))
+        widget.set_usages(snapshots[0].cpu.alle_kerne)
+        liste.append((f"paint.CpuCoreBarsWidget[{kerne} Kerne]",
+                      _tick_case(widget, lambda s, w=widget: w.set_usages(s.cpu.alle_kerne), snapshots)))
+        liste.append((f"paint.CpuCoreBarsWidget[{kerne} Kerne].kalt", _cold_case(widget)))
+
+    for anzahl in PROZESSE:
+        snapshots = [make_snapshot(rng, prozesse=anzahl), make_snapshot(rng, prozesse=anzahl)]
+        widget = _widget(sw.ProcessListWidget, size=(580, 210))
+        liste.append((f"paint.ProcessListWidget[{anzahl} Prozesse]",
+                      _tick_case(widget, lambda s, w=widget: w.set_processes(s.cpu_prozesses), snapshots)))
+
+    for punkte in PUNKTE:
+        store = MetricStore(capacity=punkte)
+        jetzt = time.time()
+        for i in range(punkte):
+            zeit = jetzt - punkte + i
+            store.append("cpu.auslastung", rng.uniform(0, 100), zeit)
+            store.append("netzwerk.gesendet_rate", rng.uniform(0, 10 ** 7), zeit)
+            store.append("netzwerk.empfangen_rate", rng.uniform(0, 10 ** 7), zeit)
+
+        def neuer_punkt(_s, store=store):
+            zeit = time.time()
+            store.append("cpu.auslastung", rng.uniform(0, 100), zeit)
+            store.append("netzwerk.gesendet_rate", rng.uniform(0, 10 ** 7), zeit)
+            store.append("netzwerk.empfangen_rate", rng.uniform(0, 10 ** 7), zeit)
+
+        for fill in (False, True):
+            suffix = ",gefüllt" if fill else ""
+            cpu = _widget(sw.CpuHistoryWidget, store, "cpu.auslastung", max_points=punkte,
+                          fill_area=fill, size=(300, 180))
+            liste.append((f"paint.CpuHistoryWidget[{punkte} Punkte{suffix}]",
+                          _tick_case(cpu, neuer_punkt, paar)))
+            netz = _widget(sw.NetworkHistoryWidget, store, max_points=punkte, fill_area=fill, size=(380, 180))
+            liste.append((f"paint.NetworkHistoryWidget[{punkte} Punkte{suffix}]",
+                          _tick_case(netz, neuer_punkt, paar)))
+
+    for anzahl in HOSTS:
+        zustaende = [[HostKachel(f"host{i}:9878", f"host{i}", i % 10 != 0, rng.uniform(0, 100), rng.uniform(0, 100))
+                      for i in range(anzahl)] for _ in range(2)]
+        widget = _widget(HostGridWidget, size=(1150, 200))
+        liste.append((f"paint.HostGridWidget[{anzahl} Hosts]",
+                      _tick_case(widget, lambda k, w=widget: w.set_hosts(k, "host1:9878"), zustaende)))
+        liste.append((f"paint.HostGridWidget[{anzahl} Hosts].kalt", _cold_case(widget)))
+    return liste
+
+
+def main(argv=None):
+    args = bench_common.parser(__doc__.strip().splitlines()[0]).parse_args(argv)
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    rng = random.Random(42)
+    liste = cases(rng)
+    app.processEvents()
+    bench_common.run_cases(liste, args, {"qt": qVersion(), "qpa": app.platformName()})
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+Durchsatz des kompletten Dashboards: spielt einen Mitschnitt (--capture von
+main.py/headless.py) oder einen synthetischen Lauf mit voller
+Geschwindigkeit in MainWindow ab (offscreen, ohne psutil) und misst pro
+Frame update_stats(), das Zeichnen aller betroffenen Widgets und beides
+zusammen.
+
+    python benchmarks/replay.py --json replay.json
+    python benchmarks/replay.py --capture vorfall.syscap
+    python benchmarks/replay.py --kerne 192 --prozesse 1000 --compare replay.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import bench_common
+from PySide6.QtCore import QTimer, qVersion
+from PySide6.QtWidgets import QApplication
+
+from monitor.capture import CapturePlayer, CaptureWriter, read_capture
+from paint import make_snapshot
+
+
+def synthetic_capture(path, anzahl, kerne, prozesse):
+    """Schreibt `anzahl` Zufalls-Snapshots im Abstand von 1 s als Mitschnitt"""
+    rng = random.Random(1)
+    writer = CaptureWriter(path)
+    start = 1_700_000_000.0
+    for i in range(anzahl):
+        writer.append(make_snapshot(rng, kerne, prozesse, zeitpunkt=start + i))
+    writer.close()
+
+
+def replay(path):
+    import main
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    window = main.MainWindow(player=CapturePlayer(read_capture(path), speed=None))
+    window.show()
+
+    def warten():
+        if window.player.fertig:
+            app.quit()
+        else:
+            QTimer.singleShot(20, warten)
+
+    warten()
+    app.exec()
+    window.close()
+    return window.replay_stats
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--capture", help="Diesen Mitschnitt abspielen statt eines synthetischen")
+    p.add_argument("--snapshots", type=int, default=600, help="Länge des synthetischen Laufs")
+    p.add_argument("--kerne", type=int, default=16)
+    p.add_argument("--prozesse", type=int, default=200)
+    p.add_argument("--json", help="Ergebnis als JSON speichern")
+    p.add_argument("--compare", help="Mit einem früher gespeicherten JSON vergleichen")
+    args = p.parse_args(argv)
+
+    if args.capture:
+        stats = replay(args.capture)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "synthetisch.syscap")
+            synthetic_capture(path, args.snapshots, args.kerne, args.prozesse)
+            stats = replay(path)
+
+    # Den Bericht (fps, Perzentile) gibt MainWindow am Ende der Wiedergabe selbst aus
+    ergebnis = stats.summary()
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            alt = json.load(f)["results"]
+        for name in ("fps", "frame_p50_ms", "frame_p95_ms", "paint_p95_ms"):
+            if alt.get(name):
+                print(f"{name:<16}{alt[name]:>10.2f} -> {ergebnis[name]:>10.2f}  ({ergebnis[name] / alt[name]:.2f}x)")
+
+    if args.json:
+        meta = bench_common.metadata()
+        meta.update({"qt": qVersion(), "capture": args.capture,
+                     "kerne": args.kerne, "prozesse": args.prozesse})
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": ergebnis}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
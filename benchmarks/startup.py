@@ -0,0 +1,136 @@
+"""
+Startzeit-Benchmark für das Dashboard.
+
+Startet das Programm mehrmals in frischen Python-Prozessen (offscreen) und
+misst jeweils ab Prozessbeginn:
+
+    import_ms       Import von main (Qt, Widgets, ...)
+    first_paint_ms  erstes Paint-Event des Fensters
+    first_data_ms   erster Snapshot im GUI-Thread
+    all_groups_ms   alle aufgeklappten Gruppen gebaut
+
+    python benchmarks/startup.py --runs 10 --json startup.json
+    python benchmarks/startup.py --compare startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+_START = time.perf_counter()
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+METRIKEN = ("import_ms", "first_paint_ms", "first_data_ms", "all_groups_ms")
+
+
+def _ms():
+    return round((time.perf_counter() - _START) * 1000, 1)
+
+
+def run_child(timeout_s):
+    """Ein einzelner Durchlauf; gibt die Messwerte als JSON auf stdout aus"""
+    sys.path.insert(0, ROOT)
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    werte = {}
+    import main
+    from PySide6.QtCore import QEvent, QObject, QTimer
+    from PySide6.QtWidgets import QApplication
+    werte["import_ms"] = _ms()
+
+    app = QApplication(sys.argv[:1])
+
+    class PaintWatcher(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint and "first_paint_ms" not in werte:
+                werte["first_paint_ms"] = _ms()
+            return False
+
+    watcher = PaintWatcher()
+    app.installEventFilter(watcher)
+
+    original = main.MainWindow.on_snapshot_ready
+
+    def on_snapshot_ready(self):
+        original(self)
+        werte.setdefault("first_data_ms", _ms())
+
+    main.MainWindow.on_snapshot_ready = on_snapshot_ready
+
+    window = main.MainWindow()
+    window.show()
+
+    def check():
+        if "all_groups_ms" not in werte and all(g.is_built for g in window.groups if g.isChecked()):
+            werte["all_groups_ms"] = _ms()
+        if all(name in werte for name in METRIKEN):
+            app.quit()
+        else:
+            QTimer.singleShot(1, check)
+
+    QTimer.singleShot(0, check)
+    QTimer.singleShot(int(timeout_s * 1000), app.quit)
+    app.exec()
+
+    app.removeEventFilter(watcher)
+    window.close()
+    print(json.dumps(werte))
+
+
+def run_benchmark(runs, timeout_s):
+    ergebnisse = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), "--child",
+                              "--timeout", str(timeout_s)],
+                             capture_output=True, text=True, check=True)
+        ergebnisse.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return ergebnisse
+
+
+def summarize(ergebnisse):
+    zusammenfassung = {}
+    for name in METRIKEN:
+        werte = [r[name] for r in ergebnisse if name in r]
+        if werte:
+            zusammenfassung[name] = {"median": statistics.median(werte), "min": min(werte), "max": max(werte)}
+    return zusammenfassung
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=10.0, help="Abbruch pro Durchlauf (Sekunden)")
+    parser.add_argument("--json", help="Ergebnis als JSON speichern")
+    parser.add_argument("--compare", help="Mit einem früher gespeicherten Ergebnis vergleichen")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        run_child(args.timeout)
+        return 0
+
+    zusammenfassung = summarize(run_benchmark(args.runs, args.timeout))
+    alt = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            alt = json.load(f)["summary"]
+
+    print(f"{'Metrik':<16}{'Median':>10}{'Min':>10}{'Max':>10}" + (f"{'Vorher':>10}{'Delta':>10}" if alt else ""))
+    for name, w in zusammenfassung.items():
+        zeile = f"{name:<16}{w['median']:>10.1f}{w['min']:>10.1f}{w['max']:>10.1f}"
+        if alt and name in alt:
+            vorher = alt[name]["median"]
+            zeile += f"{vorher:>10.1f}{w['median'] - vorher:>+10.1f}"
+        print(zeile)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"runs": args.runs, "python": sys.version.split()[0], "summary": zusammenfassung}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""
+Headless-Modus: sammelt dieselben Daten wie das Dashboard, aber ohne Qt.
+
+Pro Intervall wird ein kompakter JSON-Datensatz als eine Zeile (NDJSON)
+nach stdout oder in eine Datei geschrieben. Gedacht für Server ohne Display,
+z. B. unter systemd oder supervisord:
+
+    python headless.py --interval 5 --fields cpu.auslastung_prozent,ram,netzwerk
+    python -m headless --output /var/log/sysmon.ndjson --count 60
+
+Dieses Modul darf weder PySide6 noch numpy importieren (numpy nur mit --record).
+"""
+import argparse
+import json
+import signal
+import sys
+import time
+
+from monitor.snapshots import to_plain
+from monitor.internet import targets_from_env
+from monitor.system_stats import (configure_backend, configure_processes, create_default_scheduler,
+                                  get_all_system_stats)
+
+
+def parse_fields(value):
+    """
+    "cpu.auslastung_prozent,ram" -> {"cpu": [["auslastung_prozent"]], "ram": [[]]}
+    Ein leerer Pfad bedeutet: den ganzen Collector ausgeben.
+    """
+    felder = {}
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, *pfad = item.split(".")
+        felder.setdefault(name, []).append(pfad)
+    return felder
+
+
+def _select(wert, pfade):
+    """Wählt die Pfade aus einem verschachtelten dict aus"""
+    if any(not pfad for pfad in pfade) or not isinstance(wert, dict):
+        return wert
+    auswahl = {}
+    for schluessel, *rest in pfade:
+        if schluessel not in wert:
+            continue
+        teil = _select(wert[schluessel], [rest])
+        if rest and isinstance(auswahl.get(schluessel), dict):
+            auswahl[schluessel].update(teil)
+        else:
+            auswahl[schluessel] = teil
+    return auswahl
+
+
+def build_record(snapshot, felder=None):
+    """Wandelt einen SystemSnapshot in ein (gefiltertes) dict für json.dumps um"""
+    record = {"zeitpunkt": round(snapshot.zeitpunkt, 3)}
+    namen = felder or [name for name in snapshot._fields if name not in ("zeitpunkt", "aktualisiert")]
+    for name in namen:
+        wert = to_plain(getattr(snapshot, name))
+        record[name] = _select(wert, felder[name]) if felder else wert
+    return record
+
+
+def run(interval=1.0, felder=None, output=sys.stdout, count=None, recorder=None, exporter=None, alerts=None,
+        capture=None):
+    """
+    Sammelt alle `interval` Sekunden einen Datensatz und schreibt ihn als NDJSON-Zeile.
+    Mit `recorder` wird jeder Snapshot zusätzlich binär aufgezeichnet, mit
+    `exporter` für Prometheus bereitgestellt, mit `alerts` (AlertEngine) auf
+    Alarmregeln geprüft und mit `capture` (CaptureWriter) vollständig mitgeschnitten.
+    """
+    # Für Aufzeichnung/Export/Mitschnitt werden alle Collector gebraucht, --fields filtert dann nur die Ausgabe
+    namen = list(felder) if felder and recorder is None and exporter is None and capture is None else None
+    if namen is not None and alerts is not None:
+        namen += [name for name in alerts.collectors if name not in namen]
+    scheduler = create_default_scheduler(namen)
+    encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=str)
+
+    geschrieben = 0
+    start = time.monotonic()
+    while count is None or geschrieben < count:
+        snapshot = get_all_system_stats(scheduler)
+        if recorder is not None:
+            recorder.append(snapshot)
+        if exporter is not None:
+            exporter.publish(snapshot)
+        if alerts is not None:
+            alerts.evaluate(snapshot)
+        if capture is not None:
+            capture.append(snapshot)
+        if output is not None:
+            output.write(encoder.encode(build_record(snapshot, felder)))
+            output.write("\n")
+            output.flush()
+        geschrieben += 1
+
+        # Feste Taktung ohne Drift; verpasste Ticks werden übersprungen, nicht nachgeholt
+        if count is not None and geschrieben >= count:
+            break
+        vergangen = time.monotonic() - start
+        time.sleep(interval - vergangen % interval)
+    return geschrieben
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="System Monitor ohne GUI (NDJSON-Ausgabe)")
+    parser.add_argument("-i", "--interval", type=float, default=1.0,
+                        help="Sekunden zwischen zwei Datensätzen (Standard: 1)")
+    parser.add_argument("-f", "--fields", default="",
+                        help="Kommagetrennte Felder, z. B. cpu.auslastung_prozent,ram,io (Standard: alle)")
+    parser.add_argument("-o", "--output", default="-",
+                        help="Zieldatei (wird angehängt), - für stdout oder none")
+    parser.add_argument("-n", "--count", type=int, default=None,
+                        help="Nach n Datensätzen beenden (Standard: endlos)")
+    parser.add_argument("--record", metavar="VERZEICHNIS",
+                        help="Snapshots zusätzlich binär in VERZEICHNIS aufzeichnen (siehe monitor/recorder.py)")
+    parser.add_argument("--retention-days", type=float, default=7,
+                        help="Aufzeichnungen älter als n Tage löschen (Standard: 7)")
+    parser.add_argument("--metrics-port", type=int,
+                        help="Prometheus/OpenMetrics-Endpunkt auf diesem Port starten (/metrics)")
+    parser.add_argument("--metrics-host", default="0.0.0.0",
+                        help="Adresse für den Metrik-Endpunkt (Standard: 0.0.0.0)")
+    parser.add_argument("--capture", metavar="DATEI",
+                        help="Vollständige Snapshots in DATEI mitschneiden (abspielen mit main.py --replay)")
+    parser.add_argument("--alerts", metavar="DATEI",
+                        help="Alarmregeln aus DATEI prüfen und Alarme nach stderr schreiben (siehe monitor/alerts.py)")
+    parser.add_argument("--backend", choices=("auto", "procfs", "psutil"),
+                        help="Quelle der Zähler (Standard: SYSMON_BACKEND oder auto)")
+    parser.add_argument("--group-processes", choices=("name", "user", "cgroup"),
+                        help="Prozessliste nach Name, Benutzer oder cgroup zusammenfassen (Standard: pro PID)")
+    args = parser.parse_args(argv)
+
+    if args.interval <= 0:
+        parser.error("--interval muss größer als 0 sein")
+    felder = parse_fields(args.fields) or None
+    try:
+        configure_backend(args.backend)
+        configure_processes(args.group_processes)
+        targets_from_env()  # nur prüfen; der Monitor startet erst, wenn "internet" gesammelt wird
+    except (ValueError, OSError) as e:
+        parser.error(str(e))
+
+    alerts = None
+    if args.alerts:
+        from monitor.alerts import AlertEngine, load_rules
+        try:
+            alerts = AlertEngine(load_rules(args.alerts), log=sys.stderr)
+        except (OSError, ValueError) as e:
+            parser.error(f"--alerts: {e}")
+
+    capture = None
+    if args.capture:
+        from monitor.capture import CaptureWriter
+        capture = CaptureWriter(args.capture)
+
+    # SIGTERM vom Supervisor wie Strg+C behandeln
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    recorder = None
+    if args.record:
+        from monitor.recorder import Recorder
+        recorder = Recorder(args.record, max_age_s=args.retention_days * 86400)
+
+    exporter = None
+    if args.metrics_port is not None:
+        from monitor.exporter import MetricsExporter
+        exporter = MetricsExporter(args.metrics_port, args.metrics_host)
+        exporter.start()
+
+    if args.output == "none":
+        output = None
+    elif args.output == "-":
+        output = sys.stdout
+    else:
+        output = open(args.output, "a", encoding="utf-8")
+    try:
+        run(args.interval, felder, output, args.count, recorder, exporter, alerts, capture)
+    except ValueError as e:
+        parser.error(str(e))
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
+    finally:
+        if output not in (None, sys.stdout):
+            output.close()
+        if recorder is not None:
+            recorder.close()
+        if exporter is not None:
+            exporter.stop()
+        if capture is not None:
+            capture.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
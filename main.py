@@ -1,84 +1,94 @@
+import argparse
 import sys
-from PySide6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout,
-                               QLabel, QGridLayout, QScrollArea, QGroupBox, QFrame)
-from widgets.system_widgets import (RamWidget, DiskWidget, NetworkWidget, BatteryWidget,
-                                    SystemInfoWidget, ProcessListWidget, DiskIOWidget,
-                                    CpuInfoWidget, NetworkHistoryWidget, CpuCircleWidget, CpuCoreBarsWidget, CpuHistoryWidget)
-from monitor.system_stats import get_all_system_stats
-from PySide6.QtCore import QTimer
-from PySide6.QtGui import QFont
+import time
+from PySide6.QtWidgets import QApplication, QWidget, QVBoxLayout, QLabel, QScrollArea
+from PySide6.QtGui import QKeySequence, QShortcut
+from PySide6.QtCore import QCoreApplication, QEvent, QTimer, Qt
+from monitor.collector import StatsCollector, CollectorThread
+from monitor.instrumentation import profiler
+from widgets.lazy_group import LazyGroup
+from widgets.layered import repaint_stats
+
+# Die Widget-Module (und damit numpy) werden erst beim Bauen der Gruppen
+# importiert, damit das Fenster sofort erscheint.
+
+# Verlauf pro Laufwerk/Netzwerkkarte in Punkten (10 min bei 1 s Takt)
+GERAETE_VERLAUF = 600
+
+# Erfassungstakt bei sichtbarem bzw. minimiertem/verdecktem Fenster
+VORDERGRUND_MS = 1000
+HINTERGRUND_MS = 5000
+
+# Collector für die Zeitreihen in record_metrics; laufen auch im Hintergrund weiter
+VERLAUF_COLLECTOR = ("cpu", "ram", "netzwerk", "io", "disk_raten", "nic_raten")
+
+# Abfragetakt der Host-Übersicht im Remote-Modus (die Agenten senden in ihrem eigenen Takt)
+REMOTE_TICK_MS = 250
 
 
 class MainWindow(QWidget):
-    def __init__(self):
+    def __init__(self, collapsed=(), recorder=None, exporter=None, hub=None, alerts=None, capture=None,
+                 player=None, heatmap_cores=None):
         super().__init__()
+        self.recorder = recorder
+        self.exporter = exporter
+        self.hub = hub  # RemoteHub im Remote-Modus, sonst wird lokal gesammelt
+        self.alerts = alerts  # AlertEngine, wertet jeden lokalen Snapshot im Collector-Thread aus
+        self.capture = capture  # CaptureWriter für vollständige Snapshots (--capture)
+        self.player = player  # CapturePlayer beim Abspielen eines Mitschnitts, dann ohne psutil
+        self.heatmap_cores = heatmap_cores  # ab so vielen Kernen Heatmap statt Balken (None: Standard)
         self.setWindowTitle("System Monitor Dashboard")
         self.setMinimumSize(1200, 950)
         self.resize(1250, 950)
 
+        # Gemeinsame Zeitreihen für alle Verlaufs-Widgets (wird beim ersten Zugriff angelegt)
+        self.metrics = None
+        self._geraete_reihen = set()  # disk./nic.-Reihen des letzten Snapshots
+
         # Hauptlayout
         main_layout = QVBoxLayout()
+        self.main_layout = main_layout
 
-        # CPU-Sektion (Gruppe 1) - erweitert
-        cpu_group = self.create_group_box("CPU Performance")
-        cpu_group.setMinimumSize(1150, 225)
-        cpu_layout = QHBoxLayout()
+        # Gruppen zuerst nur als leere Rahmen anlegen; die Widgets werden nach dem
+        # ersten Anzeigen (oder beim Aufklappen) gebaut
+        self.groups = [
+            LazyGroup("CPU Performance", self.build_cpu_group, self.update_cpu_group,
+                      minimum_size=(1150, 225), collectors=("cpu", "boot")),
+            LazyGroup("Memory / Storage", self.build_memory_group, self.update_memory_group,
+                      collectors=("ram", "usage", "io", "disk_raten")),
+            LazyGroup("Network / Power", self.build_network_group, self.update_network_group,
+                      minimum_size=(1150, 225),
+                      collectors=("netzwerk", "internet", "network_interfaces", "nic_raten", "battery")),
+            LazyGroup("System Info / Processes", self.build_system_group, self.update_system_group,
+                      minimum_size=(1150, 250), collectors=("system_info", "boot", "cpu_prozesses")),
+        ]
+        for group in self.groups:
+            if group.title() in collapsed:
+                group.setChecked(False)
+            group.toggled.connect(self.schedule_demand_update)
+            main_layout.addWidget(group)
 
-        self.cpu_circle = CpuCircleWidget()
-        self.cpu_bars = CpuCoreBarsWidget()
-        self.cpu_history = CpuHistoryWidget()
-        self.cpu_info = CpuInfoWidget()  # Neues Widget für CPU-Info
-
-        cpu_layout.addWidget(self.cpu_circle)
-        cpu_layout.addWidget(self.cpu_bars)
-        cpu_layout.addWidget(self.cpu_history)
-        cpu_layout.addWidget(self.cpu_info)
-        cpu_group.setLayout(cpu_layout)
-
-        # Memory & Storage Sektion (Gruppe 2)
-        memory_group = self.create_group_box("Memory / Storage")
-        memory_layout = QHBoxLayout()
+        # Im Remote-Modus: Host-Auswahl und Übersicht aller Hosts über den Gruppen
+        self.selected_host = None
+        if hub is not None:
+            main_layout.insertWidget(0, self.build_host_group())
 
-        self.ram_widget = RamWidget()
-        self.disk_widget = DiskWidget()
-        self.disk_io_widget = DiskIOWidget()
+        # Aktive Alarme ganz oben; ausgeblendet, solange keiner aktiv ist
+        self.alert_banner = None
+        if alerts is not None:
+            from widgets.alert_banner import AlertBannerWidget
+            self.alert_banner = AlertBannerWidget()
+            main_layout.insertWidget(0, self.alert_banner)
 
-        memory_layout.addWidget(self.ram_widget)
-        memory_layout.addWidget(self.disk_widget)
-        memory_layout.addWidget(self.disk_io_widget)
-        memory_group.setLayout(memory_layout)
+        # Statuszeile (Dauer der letzten Erfassung)
+        self.status_label = QLabel("Warte auf erste Erfassung ...")
+        self.status_label.setStyleSheet("color: #888888; font-size: 11px;")
+        main_layout.addWidget(self.status_label)
 
-        # Network & Power Sektion (Gruppe 3) - erweitert
-        network_group = self.create_group_box("Network / Power")
-        network_group.setMinimumSize(1150, 225)
-        network_layout = QHBoxLayout()
-
-        self.network_widget = NetworkWidget()
-        self.network_history = NetworkHistoryWidget()  # Neues Widget für Netzwerk-Verlauf
-        self.battery_widget = BatteryWidget()
-
-        network_layout.addWidget(self.network_widget)
-        network_layout.addWidget(self.network_history)
-        network_layout.addWidget(self.battery_widget)
-        network_group.setLayout(network_layout)
-
-        # System Info & Processes Sektion (Gruppe 4)
-        system_group = self.create_group_box("System Info / Processes")
-        system_group.setMinimumSize(1150, 250)
-        system_layout = QHBoxLayout()
-
-        self.system_info_widget = SystemInfoWidget()
-        self.process_list_widget = ProcessListWidget()
-
-        system_layout.addWidget(self.system_info_widget)
-        system_layout.addWidget(self.process_list_widget)
-        system_group.setLayout(system_layout)
-
-        # Alle Gruppen zum Hauptlayout hinzufügen
-        main_layout.addWidget(cpu_group)
-        main_layout.addWidget(memory_group)
-        main_layout.addWidget(network_group)
-        main_layout.addWidget(system_group)
+        # Profiler-Panel (F12) wird erst beim ersten Einblenden gebaut
+        self.profiler_panel = None
+        QShortcut(QKeySequence(Qt.Key_F12), self, self.toggle_profiler)
+        QShortcut(QKeySequence("Ctrl+E"), self, self.export_profile)
 
         # Scroll Area für bessere Übersicht
         scroll_area = QScrollArea()
@@ -86,6 +96,7 @@ class MainWindow(QWidget):
         scroll_widget.setLayout(main_layout)
         scroll_area.setWidget(scroll_widget)
         scroll_area.setWidgetResizable(True)
+        scroll_area.verticalScrollBar().valueChanged.connect(self.schedule_demand_update)
 
         # Hauptlayout mit Scroll Area
         final_layout = QVBoxLayout()
@@ -133,58 +144,584 @@ class MainWindow(QWidget):
             }
         """)
 
-        # Timer für Updates
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_stats)
-        self.timer.start(1000)  # aktualisiere alle 1 Sekunde
+        self.collector = None
+        self.collector_thread = None
+        self.replay_stats = None
+        if player is not None:
+            # Abspielen im GUI-Thread; bei voller Geschwindigkeit ein Frame pro Durchlauf der Event-Loop
+            from monitor.capture import ReplayStats
+            self.replay_timer = QTimer(self)
+            self.replay_timer.setSingleShot(True)
+            self.replay_timer.timeout.connect(self.on_replay_tick)
+            if player.speed is None:
+                self.replay_stats = ReplayStats()
+            self.replay_timer.start(0)
+        elif hub is None:
+            # Erfassung läuft in eigenem Thread, die GUI bekommt nur fertige Snapshots
+            self.collector = StatsCollector(interval_ms=1000)  # aktualisiere alle 1 Sekunde
+            self.collector.snapshot_ready.connect(self.on_snapshot_ready)
+            if recorder is not None:
+                # Aufzeichnung im Worker-Thread, damit auch verworfene Snapshots gespeichert werden
+                self.collector.add_listener(recorder.append)
+            if exporter is not None:
+                # Prometheus-Text einmal pro Zyklus rendern, Scrapes lesen nur den Cache
+                self.collector.add_listener(exporter.publish)
+            if capture is not None:
+                self.collector.add_listener(capture.append)
+            if alerts is not None:
+                # Auch verworfene Snapshots auswerten, sonst könnten kurze Spitzen fehlen
+                self.collector.add_listener(alerts.evaluate)
+            self.collector_thread = CollectorThread(self.collector)
+            self.collector_thread.start()
+        else:
+            # Die Verbindungen laufen im Hub-Thread; die GUI holt nur den jeweils neuesten Stand ab
+            self.remote_timer = QTimer(self)
+            self.remote_timer.setInterval(REMOTE_TICK_MS)
+            self.remote_timer.timeout.connect(self.on_remote_tick)
+            self.remote_timer.start()
+            self.select_host(next(iter(hub.hosts)))
 
-        # Erste Aktualisierung
-        self.update_stats()
+        # Takt und Collector an Fensterzustand und sichtbare Gruppen anpassen (gebündelt)
+        self._demand = None
+        self._demand_timer = QTimer(self)
+        self._demand_timer.setSingleShot(True)
+        self._demand_timer.setInterval(50)
+        self._demand_timer.timeout.connect(self.update_demand)
 
-    def create_group_box(self, title):
-        """Erstellt eine GroupBox mit einheitlichem Styling"""
-        group = QGroupBox(title)
-        group.setMinimumHeight(180)
-        return group
+        # Aufgeklappte Gruppen werden erst nach dem ersten Zeichnen gebaut (siehe paintEvent)
+        self._pending_groups = [group for group in self.groups if group.isChecked()]
+        self._first_paint_done = False
 
-    def update_stats(self):
-        """Aktualisiert alle Widget-Daten"""
-        try:
-            # Alle Systemdaten abrufen
-            stats = get_all_system_stats()
-
-            # CPU Widgets aktualisieren
-            cpu = stats["cpu"]
-            self.cpu_circle.set_auslastung(cpu["auslastung_prozent"])
-            self.cpu_bars.set_usages(cpu["alle_kerne"])
-            self.cpu_history.add_value(cpu["auslastung_prozent"])
-            self.cpu_info.set_cpu_info(cpu, stats["boot"])  # Neues Widget aktualisieren
-
-            # Memory & Storage Widgets aktualisieren
-            self.ram_widget.set_ram_data(stats["ram"])
-            self.disk_widget.set_disk_data(stats["usage"])
-            self.disk_io_widget.set_disk_io_data(stats["io"])
-
-            # Network & Power Widgets aktualisieren
-            self.network_widget.set_network_data(
-                stats["netzwerk"],
-                stats["internet"],
-                stats["network_interfaces"]
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._first_paint_done:
+            self._first_paint_done = True
+            QTimer.singleShot(0, self.build_next_group)
+
+    def schedule_demand_update(self, *_):
+        self._demand_timer.start()
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Verdeckte Fenster melden sich (je nach Plattform) über Expose-Events am QWindow
+        self.windowHandle().installEventFilter(self)
+        self.schedule_demand_update()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.schedule_demand_update()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            self.schedule_demand_update()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.schedule_demand_update()
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Expose:
+            self.schedule_demand_update()
+        return super().eventFilter(obj, event)
+
+    def window_on_screen(self):
+        """False, wenn das Fenster minimiert, versteckt oder (soweit erkennbar) ganz verdeckt ist"""
+        if not self.isVisible() or self.isMinimized():
+            return False
+        handle = self.windowHandle()
+        return handle is None or handle.isExposed()
+
+    def update_demand(self):
+        """
+        Sichtbare Gruppen bekommen Daten im vollen Takt, Gruppen außerhalb des
+        sichtbaren Bereichs werden nicht mehr gesammelt. Ist das Fenster
+        minimiert oder verdeckt, laufen nur noch die Zeitreihen im langsamen
+        Takt weiter. Aufzeichnung, Export und Mitschnitt brauchen dagegen immer alle Werte.
+        """
+        im_vordergrund = self.window_on_screen()
+        for group in self.groups:
+            group.set_on_screen(im_vordergrund and not group.visibleRegion().isEmpty())
+
+        if self.collector is None:
+            return  # Remote-Modus oder Wiedergabe: hier wird nicht gesammelt
+        if self.recorder is not None or self.exporter is not None or self.capture is not None:
+            demand = (VORDERGRUND_MS, None)
+        elif im_vordergrund:
+            benoetigt = set(VERLAUF_COLLECTOR)
+            for group in self.groups:
+                if group.needs_data:
+                    benoetigt.update(group.collectors)
+            if self.alerts is not None:
+                benoetigt.update(self.alerts.collectors)
+            demand = (VORDERGRUND_MS, frozenset(benoetigt))
+        else:
+            # Alarme sollen auch bei minimiertem Fenster auslösen
+            benoetigt = set(VERLAUF_COLLECTOR)
+            if self.alerts is not None:
+                benoetigt.update(self.alerts.collectors)
+            demand = (HINTERGRUND_MS, frozenset(benoetigt))
+
+        if demand != self._demand:
+            self._demand = demand
+            self.collector.set_demand(*demand)
+
+    def build_next_group(self):
+        """Baut eine Gruppe pro Durchlauf der Event-Loop, damit das Fenster bedienbar bleibt"""
+        while self._pending_groups:
+            group = self._pending_groups.pop(0)
+            if not group.is_built and group.isChecked():
+                group.ensure_built()
+                break
+        if self._pending_groups:
+            QTimer.singleShot(0, self.build_next_group)
+
+    def get_metrics(self):
+        if self.metrics is None:
+            from monitor.metric_store import MetricStore
+            self.metrics = MetricStore(capacity=3600)  # 1 h bei 1 s Takt
+            if self.recorder is not None:
+                self.restore_history(self.metrics)
+        return self.metrics
+
+    def restore_history(self, metrics):
+        """Füllt die Zeitreihen mit der letzten Stunde aus der Aufzeichnung"""
+        daten = self.recorder.last(metrics.capacity)
+        if not len(daten):
+            return
+        zeiten = daten["zeitpunkt"]
+        metrics.extend("cpu.auslastung", daten["cpu_auslastung"], zeiten)
+        metrics.extend("ram.auslastung", daten["ram_auslastung"], zeiten)
+        metrics.extend_rate("netzwerk.gesendet_rate", daten["netzwerk_gesendet"], zeiten)
+        metrics.extend_rate("netzwerk.empfangen_rate", daten["netzwerk_empfangen"], zeiten)
+        metrics.extend_rate("io.read_rate", daten["io_read"], zeiten)
+        metrics.extend_rate("io.write_rate", daten["io_write"], zeiten)
+
+    def build_host_group(self):
+        from PySide6.QtWidgets import QComboBox, QGroupBox
+        from widgets.host_grid import HostGridWidget
+
+        box = QGroupBox(f"Hosts ({len(self.hub.hosts)})")
+        layout = QVBoxLayout(box)
+        self.host_selector = QComboBox()
+        for adresse in self.hub.hosts:
+            self.host_selector.addItem(adresse, adresse)
+        self.host_selector.currentIndexChanged.connect(
+            lambda index: self.select_host(self.host_selector.itemData(index)))
+        self.host_grid = HostGridWidget()
+        self.host_grid.host_selected.connect(self.select_host)
+        layout.addWidget(self.host_selector)
+        layout.addWidget(self.host_grid)
+        return box
+
+    def select_host(self, adresse):
+        """Zeigt die Details eines anderen Hosts; die Zeitreihen beginnen dabei neu"""
+        if adresse is None or adresse == self.selected_host:
+            return
+        self.selected_host = adresse
+        index = self.host_selector.findData(adresse)
+        if index != self.host_selector.currentIndex():
+            self.host_selector.setCurrentIndex(index)
+        if self.metrics is not None:
+            self.metrics.clear()
+        self.show_remote_snapshot(self.hub.take(adresse, auch_alt=True))
+        self.update_host_grid()
+
+    def on_remote_tick(self):
+        """Übersicht aktualisieren und den neuesten Stand des ausgewählten Hosts anzeigen"""
+        self.update_host_grid()
+        self.show_remote_snapshot(self.hub.take(self.selected_host))
+
+        hosts = self.hub.hosts.values()
+        self.status_label.setText(
+            f"Hosts verbunden: {sum(host.verbunden for host in hosts)}/{len(self.hub.hosts)}"
+            f"  |  Frames: {sum(host.frames for host in hosts)}"
+            f"  |  Vom Agenten ausgelassen: {sum(host.luecken for host in hosts)}"
+            f"  |  Repaints: {repaint_stats.angefordert} (übersprungen: {repaint_stats.uebersprungen})"
+        )
+
+    def show_remote_snapshot(self, plain):
+        if plain is None:
+            return
+        from monitor.snapshots import snapshot_from_plain
+
+        if profiler.enabled:
+            start = time.perf_counter_ns()
+            self.update_stats(snapshot_from_plain(plain))
+            profiler.record("gui.update_stats", time.perf_counter_ns() - start)
+            if self.profiler_panel is not None and self.profiler_panel.isVisible():
+                self.profiler_panel.set_summary(profiler.summary())
+        else:
+            self.update_stats(snapshot_from_plain(plain))
+
+    def update_host_grid(self):
+        from widgets.host_grid import HostKachel
+
+        kacheln = []
+        for index, host in enumerate(self.hub.hosts.values()):
+            plain = host.plain
+            cpu = ram = None
+            if plain is not None:
+                cpu = (plain.get("cpu") or {}).get("auslastung_prozent")
+                ram = (plain.get("ram") or {}).get("auslastung")
+            kacheln.append(HostKachel(host.adresse, host.name, host.verbunden, cpu, ram, host.fehler))
+            # Sobald der Agent seinen Hostnamen gemeldet hat, diesen auch in der Auswahl zeigen
+            if host.hostname and self.host_selector.itemText(index) == host.adresse:
+                self.host_selector.setItemText(index, f"{host.hostname} ({host.adresse})")
+        self.host_grid.set_hosts(kacheln, self.selected_host)
+        titel = f"System Monitor Dashboard – {self.hub.hosts[self.selected_host].name}"
+        if self.windowTitle() != titel:
+            self.setWindowTitle(titel)
+
+    def on_replay_tick(self):
+        """Zeigt den nächsten fälligen Snapshot des Mitschnitts und plant den folgenden"""
+        start = time.perf_counter_ns()
+        stats = self.player.take()
+        if stats is not None:
+            if self.alerts is not None:
+                self.alerts.evaluate(stats)
+            self.update_stats(stats)
+            if self.alert_banner is not None:
+                self.alert_banner.set_alerts(self.alerts.aktive())
+        if self.replay_stats is not None and stats is not None and not self._pending_groups:
+            # Ausstehende Repaints sofort ausführen, damit jeder Frame einzeln gemessen wird;
+            # gemessen erst, wenn alle Gruppen gebaut sind
+            gezeichnet = time.perf_counter_ns()
+            QCoreApplication.sendPostedEvents(None, QEvent.UpdateRequest)
+            ende = time.perf_counter_ns()
+            self.replay_stats.add(gezeichnet - start, ende - gezeichnet, ende - start)
+
+        if self.player.fertig:
+            self.status_label.setText(f"Wiedergabe beendet: {self.player.gezeigt} Snapshots"
+                                      f"  |  Verworfen: {self.player.verworfen}")
+            if self.replay_stats is not None:
+                print(self.replay_stats.format())
+                self.status_label.setText(self.replay_stats.format().splitlines()[0])
+            return
+        if stats is not None and (self.replay_stats is None or self.player.gezeigt % 100 == 0):
+            self.status_label.setText(
+                f"Wiedergabe: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(stats.zeitpunkt))}"
+                f"  |  Snapshots: {self.player.gezeigt}  |  Verworfen: {self.player.verworfen}"
+                f"  |  Repaints: {repaint_stats.angefordert} (übersprungen: {repaint_stats.uebersprungen})"
             )
-            self.network_history.add_network_data(stats["netzwerk"])  # Neues Widget aktualisieren
-            self.battery_widget.set_battery_data(stats["battery"])
+        self.replay_timer.start(int(self.player.wartezeit() * 1000))
+
+    def build_cpu_group(self, layout):
+        from widgets.system_widgets import CpuCircleWidget, CpuCoreBarsWidget, CpuHistoryWidget, CpuInfoWidget
+
+        self.cpu_circle = CpuCircleWidget()
+        self.cpu_bars = CpuCoreBarsWidget(heatmap_threshold=self.heatmap_cores)
+        # Die NUMA-/Sockel-Gruppierung stammt von diesem Rechner, passt also nur beim lokalen Sammeln
+        self.cpu_bars.use_topology = self.hub is None and self.player is None
+        self.cpu_history = CpuHistoryWidget(self.get_metrics(), "cpu.auslastung", fill_area=True)
+        self.cpu_info = CpuInfoWidget()  # Neues Widget für CPU-Info
+
+        layout.addWidget(self.cpu_circle)
+        layout.addWidget(self.cpu_bars)
+        layout.addWidget(self.cpu_history)
+        layout.addWidget(self.cpu_info)
+
+    def build_memory_group(self, layout):
+        from widgets.system_widgets import RamWidget, DiskWidget, DiskIOWidget, DiskThroughputWidget
+
+        self.ram_widget = RamWidget()
+        self.disk_widget = DiskWidget()
+        self.disk_io_widget = DiskIOWidget()
+        self.disk_throughput = DiskThroughputWidget(self.get_metrics())
+
+        layout.addWidget(self.ram_widget)
+        layout.addWidget(self.disk_widget)
+        layout.addWidget(self.disk_io_widget)
+        layout.addWidget(self.disk_throughput)
+
+    def build_network_group(self, layout):
+        from widgets.system_widgets import NetworkWidget, NetworkHistoryWidget, NicThroughputWidget, BatteryWidget
+
+        self.network_widget = NetworkWidget()
+        self.network_history = NetworkHistoryWidget(self.get_metrics())  # Neues Widget für Netzwerk-Verlauf
+        self.nic_throughput = NicThroughputWidget(self.get_metrics())
+        self.battery_widget = BatteryWidget()
+
+        layout.addWidget(self.network_widget)
+        layout.addWidget(self.network_history)
+        layout.addWidget(self.nic_throughput)
+        layout.addWidget(self.battery_widget)
+
+    def build_system_group(self, layout):
+        from widgets.system_widgets import SystemInfoWidget, ProcessListWidget
+
+        self.system_info_widget = SystemInfoWidget()
+        self.process_list_widget = ProcessListWidget()
+
+        layout.addWidget(self.system_info_widget)
+        layout.addWidget(self.process_list_widget)
+
+    def closeEvent(self, event):
+        self._demand_timer.stop()
+        if self.collector_thread is not None:
+            self.collector_thread.stop()
+        if self.hub is not None:
+            self.remote_timer.stop()
+            self.hub.stop()
+        if self.player is not None:
+            self.replay_timer.stop()
+        if self.capture is not None:
+            self.capture.close()
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.exporter is not None:
+            self.exporter.stop()
+        super().closeEvent(event)
+
+    def toggle_profiler(self):
+        """Blendet das Profiler-Panel ein/aus; die Messung läuft nur, solange es sichtbar ist"""
+        if self.profiler_panel is None:
+            from widgets.profiler_panel import ProfilerPanel
+            self.profiler_panel = ProfilerPanel()
+            self.profiler_panel.hide()
+            # oberhalb der Gruppen einfügen, damit es ohne Scrollen sichtbar ist
+            self.main_layout.insertWidget(0, self.profiler_panel)
+
+        sichtbar = not self.profiler_panel.isVisible()
+        self.profiler_panel.setVisible(sichtbar)
+        profiler.enable(sichtbar)
+        if sichtbar:
+            self.profiler_panel.set_summary(profiler.summary())
+
+    def export_profile(self):
+        if not profiler.summary():
+            return
+        try:
+            path = profiler.export_json()
+        except OSError as e:
+            print(f"Profil konnte nicht gespeichert werden: {e}")
+            return
+        print(f"Profil gespeichert: {path}")
+
+    def on_snapshot_ready(self):
+        """Holt den neuesten Snapshot aus dem Collector-Thread ab"""
+        latest = self.collector.take_latest()
+        if latest is None:
+            return
+        stats, dauer_ms = latest
+        if profiler.enabled:
+            start = time.perf_counter_ns()
+            self.update_stats(stats)
+            profiler.record("gui.update_stats", time.perf_counter_ns() - start)
+            if self.profiler_panel is not None and self.profiler_panel.isVisible():
+                self.profiler_panel.set_summary(profiler.summary())
+        else:
+            self.update_stats(stats)
+        if self.alert_banner is not None:
+            self.alert_banner.set_alerts(self.alerts.aktive())
+        self.status_label.setText(
+            f"Letzte Erfassung: {dauer_ms:.0f} ms  |  Zyklen: {self.collector.zyklen}"
+            f"  |  Verworfen: {self.collector.verworfen}"
+            f"  |  Repaints: {repaint_stats.angefordert} (übersprungen: {repaint_stats.uebersprungen})"
+        )
 
-            # System Info und Prozesse aktualisieren
-            self.system_info_widget.set_system_data(stats["system_info"], stats["boot"])
-            self.process_list_widget.set_processes(stats["cpu_prozesses"])
+    def record_metrics(self, stats):
+        """Schreibt die Werte des Snapshots in die gemeinsamen Zeitreihen"""
+        metrics = self.get_metrics()
+        zeit = stats.zeitpunkt
+        metrics.append("cpu.auslastung", stats.cpu.auslastung_prozent, zeit)
+        metrics.append("ram.auslastung", stats.ram.auslastung, zeit)
+        metrics.append_rate("netzwerk.gesendet_rate", stats.netzwerk.gesendet_bytes, zeit)
+        metrics.append_rate("netzwerk.empfangen_rate", stats.netzwerk.empfangen_bytes, zeit)
+        metrics.append_rate("io.read_rate", stats.io.read_bytes, zeit)
+        metrics.append_rate("io.write_rate", stats.io.write_bytes, zeit)
+        # Raten pro Gerät kommen fertig aus monitor/rates.py; kürzerer Verlauf, da es viele Geräte sein können
+        reihen = set()
+        for name, rate in (stats.disk_raten or {}).items():
+            for reihe, wert in ((f"disk.{name}.read_rate", rate.read_bytes_s),
+                                (f"disk.{name}.write_rate", rate.write_bytes_s)):
+                metrics.series(reihe, GERAETE_VERLAUF).append(wert, zeit)
+                reihen.add(reihe)
+        for name, rate in (stats.nic_raten or {}).items():
+            for reihe, wert in ((f"nic.{name}.empfangen_rate", rate.empfangen_bytes_s),
+                                (f"nic.{name}.gesendet_rate", rate.gesendet_bytes_s)):
+                metrics.series(reihe, GERAETE_VERLAUF).append(wert, zeit)
+                reihen.add(reihe)
+        # Reihen verschwundener Geräte (USB-Stick, VPN-Tunnel, Container-veth) wieder freigeben
+        for reihe in self._geraete_reihen - reihen:
+            metrics.remove(reihe)
+        self._geraete_reihen = reihen
 
+    def update_stats(self, stats):
+        """Aktualisiert alle Widget-Daten (nur gebaute, aufgeklappte Gruppen)"""
+        try:
+            # Zeitreihen immer füllen, auch wenn die Verlaufs-Widgets eingeklappt sind
+            self.record_metrics(stats)
+            for group in self.groups:
+                group.update_stats(stats)
         except Exception as e:
             print(f"Fehler beim Aktualisieren der Stats: {e}")
 
+    def update_cpu_group(self, stats):
+        cpu = stats.cpu
+        self.cpu_circle.set_auslastung(cpu.auslastung_prozent)
+        self.cpu_bars.set_usages(cpu.alle_kerne)
+        self.cpu_history.update()
+        self.cpu_info.set_cpu_info(cpu, stats.boot)  # Neues Widget aktualisieren
+
+    def update_memory_group(self, stats):
+        self.ram_widget.set_ram_data(stats.ram)
+        self.disk_widget.set_disk_data(stats.usage)
+        self.disk_io_widget.set_disk_io_data(stats.io)
+        self.disk_throughput.set_rates(stats.disk_raten, stats.zeitpunkt)
+
+    def update_network_group(self, stats):
+        self.network_widget.set_network_data(
+            stats.netzwerk,
+            stats.internet,
+            stats.network_interfaces
+        )
+        self.network_history.update()  # Neues Widget aktualisieren
+        self.nic_throughput.set_rates(stats.nic_raten, stats.zeitpunkt)
+        self.battery_widget.set_battery_data(stats.battery)
+
+    def update_system_group(self, stats):
+        self.system_info_widget.set_system_data(stats.system_info, stats.boot)
+        self.process_list_widget.set_processes(stats.cpu_prozesses)
+
+def parse_args(argv):
+    """Eigene Optionen; alles Übrige wird an QApplication weitergereicht"""
+    parser = argparse.ArgumentParser(description="System Monitor Dashboard")
+    parser.add_argument("--record", metavar="VERZEICHNIS",
+                        help="Snapshots dauerhaft in VERZEICHNIS aufzeichnen")
+    parser.add_argument("--retention-days", type=float, default=7,
+                        help="Aufzeichnungen älter als n Tage löschen (Standard: 7)")
+    parser.add_argument("--metrics-port", type=int,
+                        help="Prometheus/OpenMetrics-Endpunkt auf diesem Port starten (/metrics)")
+    parser.add_argument("--metrics-host", default="0.0.0.0",
+                        help="Adresse für den Metrik-Endpunkt (Standard: 0.0.0.0)")
+    parser.add_argument("--backend", choices=("auto", "procfs", "psutil"),
+                        help="Quelle der Zähler (Standard: SYSMON_BACKEND oder auto)")
+    parser.add_argument("--group-processes", choices=("name", "user", "cgroup"),
+                        help="Prozessliste nach Name, Benutzer oder cgroup zusammenfassen (Standard: pro PID)")
+    parser.add_argument("--remote", action="append", metavar="HOST[:PORT],...",
+                        help="Statt lokal zu sammeln, Agenten (agent.py) auf diesen Hosts anzeigen")
+    parser.add_argument("--remote-file", metavar="DATEI",
+                        help="Agenten-Adressen aus DATEI lesen (eine pro Zeile, # für Kommentare)")
+    parser.add_argument("--capture", metavar="DATEI",
+                        help="Vollständige Snapshots in DATEI mitschneiden (zum Abspielen mit --replay)")
+    parser.add_argument("--replay", metavar="DATEI",
+                        help="Mitschnitt abspielen statt zu sammeln")
+    parser.add_argument("--speed", default="1", metavar="1|10|max",
+                        help="Geschwindigkeit beim Abspielen; max misst dabei fps und Zeichenzeiten (Standard: 1)")
+    parser.add_argument("--alerts", metavar="DATEI",
+                        help="Alarmregeln aus DATEI (siehe monitor/alerts.py), none zum Abschalten "
+                             "(Standard: eingebaute Regeln für CPU, RAM und Platte)")
+    parser.add_argument("--heatmap-cores", type=int, metavar="N",
+                        help="Kerne ab mehr als N als Heatmap statt als Balken zeigen (Standard: 64)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Profiler-Panel beim Start einblenden (sonst mit F12)")
+    args, qt_args = parser.parse_known_args(argv[1:])
+
+    args.remote_hosts = [adresse.strip() for wert in args.remote or () for adresse in wert.split(",") if adresse.strip()]
+    if args.remote_file:
+        try:
+            with open(args.remote_file, encoding="utf-8") as f:
+                args.remote_hosts += [zeile.split("#")[0].strip() for zeile in f if zeile.split("#")[0].strip()]
+        except OSError as e:
+            parser.error(str(e))
+    if args.remote_hosts:
+        from monitor.remote import DEFAULT_PORT, parse_address
+        try:
+            for adresse in args.remote_hosts:
+                parse_address(adresse, DEFAULT_PORT)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.remote_hosts and (args.record or args.metrics_port is not None):
+        parser.error("--record und --metrics-port gibt es nur beim lokalen Sammeln (auf dem Agenten: headless.py)")
+
+    if args.replay and (args.remote_hosts or args.record or args.metrics_port is not None or args.capture):
+        parser.error("--replay lässt sich nicht mit --remote, --record, --metrics-port oder --capture kombinieren")
+    if args.capture and args.remote_hosts:
+        parser.error("--capture gibt es nur beim lokalen Sammeln")
+    if args.replay:
+        from monitor.capture import read_capture_info
+        try:
+            read_capture_info(args.replay)
+        except (OSError, ValueError) as e:
+            parser.error(f"--replay: {e}")
+    if args.speed == "max":
+        args.speed = None
+    else:
+        try:
+            args.speed = float(args.speed)
+        except ValueError:
+            parser.error(f"--speed: Zahl oder max erwartet, nicht {args.speed!r}")
+        if args.speed <= 0:
+            parser.error("--speed muss größer als 0 sein")
+
+    if not args.remote_hosts and not args.replay:
+        from monitor.internet import targets_from_env
+        try:
+            targets_from_env()
+        except ValueError as e:
+            parser.error(str(e))
+
+    # Regeln schon hier übersetzen, damit Fehler mit Zeilennummer vor dem Fensteraufbau erscheinen
+    args.alert_rules = None
+    if args.alerts != "none" and not args.remote_hosts:
+        from monitor.alerts import DEFAULT_RULES, load_rules, parse_rules
+        try:
+            args.alert_rules = load_rules(args.alerts) if args.alerts else parse_rules(DEFAULT_RULES)
+        except (OSError, ValueError) as e:
+            parser.error(f"--alerts: {e}")
+    elif args.alerts not in (None, "none"):
+        parser.error("--alerts gibt es nur beim lokalen Sammeln (auf dem Agenten: headless.py --alerts)")
+    return args, qt_args
+
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    window = MainWindow()
+    args, qt_args = parse_args(sys.argv)
+    app = QApplication(sys.argv[:1] + qt_args)
+
+    if args.backend is not None:
+        from monitor.system_stats import configure_backend
+        configure_backend(args.backend)
+    if args.group_processes is not None:
+        from monitor.system_stats import configure_processes
+        configure_processes(args.group_processes)
+
+    recorder = None
+    if args.record:
+        from monitor.recorder import Recorder
+        recorder = Recorder(args.record, max_age_s=args.retention_days * 86400)
+
+    exporter = None
+    if args.metrics_port is not None:
+        from monitor.exporter import MetricsExporter
+        exporter = MetricsExporter(args.metrics_port, args.metrics_host)
+        exporter.start()
+
+    hub = None
+    if args.remote_hosts:
+        from monitor.remote import RemoteHub
+        # Doppelte Adressen nur einmal verbinden
+        hub = RemoteHub(dict.fromkeys(args.remote_hosts))
+        hub.start()
+
+    capture = None
+    if args.capture:
+        from monitor.capture import CaptureWriter
+        capture = CaptureWriter(args.capture)
+
+    player = None
+    if args.replay:
+        from monitor.capture import CapturePlayer, read_capture
+        player = CapturePlayer(read_capture(args.replay), args.speed)
+
+    alerts = None
+    if args.alert_rules is not None:
+        from monitor.alerts import AlertEngine
+        alerts = AlertEngine(args.alert_rules, log=sys.stderr)
+
+    window = MainWindow(recorder=recorder, exporter=exporter, hub=hub, alerts=alerts, capture=capture,
+                        player=player, heatmap_cores=args.heatmap_cores)
+    if args.profile or profiler.enabled:  # auch über SYSMON_PROFILE=1
+        window.toggle_profiler()
     window.show()
     sys.exit(app.exec())
\ No newline at end of file
@@ -0,0 +1,359 @@
+"""
+Schwellwert-Alarme, die bei jedem Snapshot inkrementell ausgewertet werden.
+
+Regeln werden einmal aus einer kurzen Textform übersetzt (eine pro Zeile):
+
+    ram_hoch: ram.auslastung > 80 for 30s clear 75 kritisch
+    kern_voll: cpu.alle_kerne.* >= 98 for 1m
+    platte_busy: disk_raten.*.auslastung_prozent > 90 for 10s clear 70
+
+    name:      optional, sonst der Metrikpfad
+    metrik:    Pfad in den Snapshot (Felder wie in to_plain()); ein "*" steht
+               für jedes Element einer Liste bzw. jeden Schlüssel eines dicts
+               und erzeugt einen eigenen Alarm pro Kern/Gerät/Prozess
+    for:       Bedingung muss so lange ununterbrochen gelten (s, m, h)
+    clear:     Hysterese; der Alarm endet erst, wenn dieser Wert erreicht ist
+    schwere:   warnung (Standard) oder kritisch
+
+Pro Tick wird jede Regel genau einmal ausgewertet; der Zustand pro Regel
+und Instanz (seit wann erfüllt, aktiv ja/nein) wird mitgeführt, der Verlauf
+also nie erneut durchsucht. Regeln, deren Collector in diesem Tick nicht
+gelaufen ist, werden übersprungen.
+
+    engine = AlertEngine(parse_rules(text), log=sys.stderr)
+    for ereignis in engine.evaluate(snapshot):
+        ...
+"""
+import collections
+import operator
+import re
+import threading
+import time
+import typing
+from typing import NamedTuple, Optional
+
+from monitor.snapshots import (CpuSnapshot, DiskRateSnapshot, InterfaceSnapshot, NicRateSnapshot, ProzessEintrag,
+                               SystemSnapshot)
+
+WARNUNG = "warnung"
+KRITISCH = "kritisch"
+
+AUSGELOEST = "ausgelöst"
+AUFGEHOBEN = "aufgehoben"
+
+# Entsprechen den bisher fest eingebauten Farbwechseln der Widgets
+DEFAULT_RULES = """
+ram_hoch: ram.auslastung > 80 clear 75
+platte_voll: usage.percent > 85 clear 80 kritisch
+cpu_hoch: cpu.auslastung_prozent > 90 for 30s clear 80
+"""
+
+_VERGLEICHE = {
+    ">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le,
+    "==": operator.eq, "!=": operator.ne,
+}
+_EINHEITEN = {"": 1, "s": 1, "m": 60, "h": 3600}
+
+# Elementtyp der Listen/dicts, über die ein "*" laufen kann
+_ELEMENTE = {
+    (CpuSnapshot, "alle_kerne"): float,
+    (InterfaceSnapshot, "addresses"): str,
+    (SystemSnapshot, "network_interfaces"): InterfaceSnapshot,
+    (SystemSnapshot, "cpu_prozesses"): ProzessEintrag,
+    (SystemSnapshot, "disk_raten"): DiskRateSnapshot,
+    (SystemSnapshot, "nic_raten"): NicRateSnapshot,
+}
+
+_REGEL = re.compile(
+    r"^(?:(?P<name>[\w.\-]+)\s*:\s*)?"
+    r"(?P<metrik>[\w.*]+)\s*(?P<op>>=|<=|==|!=|>|<)\s*(?P<schwelle>-?[\d.]+)"
+    r"(?:\s+for\s+(?P<dauer>[\d.]+)(?P<einheit>[smh]?))?"
+    r"(?:\s+clear\s+(?P<clear>-?[\d.]+))?"
+    r"(?:\s+(?P<schwere>warnung|kritisch))?\s*$"
+)
+
+
+class AlertEvent(NamedTuple):
+    zeitpunkt: float
+    regel: str
+    metrik: str
+    instanz: Optional[str]   # Kern, Gerät oder Prozess bei Regeln mit "*"
+    zustand: str             # AUSGELOEST oder AUFGEHOBEN
+    wert: Optional[float]    # None, wenn die Instanz verschwunden ist
+    vergleich: str
+    schwelle: float
+    schwere: str
+
+    @property
+    def text(self):
+        ziel = self.metrik.replace("*", self.instanz) if self.instanz is not None else self.metrik
+        if self.wert is None:
+            return f"{self.regel}: {ziel} nicht mehr vorhanden"
+        if self.zustand == AUFGEHOBEN:
+            return f"{self.regel}: {ziel} = {self.wert:g}"
+        return f"{self.regel}: {ziel} = {self.wert:g} ({self.vergleich} {self.schwelle:g})"
+
+
+class Rule:
+    """Eine übersetzte Regel; der Metrikpfad ist in Schritte vor und nach dem "*" zerlegt"""
+
+    __slots__ = ("name", "metrik", "vergleich", "schwelle", "dauer", "clear", "schwere",
+                 "teil", "_vor", "_nach", "_wildcard", "_op")
+
+    def __init__(self, metrik, vergleich, schwelle, dauer=0.0, clear=None, schwere=WARNUNG, name=None):
+        if vergleich not in _VERGLEICHE:
+            raise ValueError(f"Unbekannter Vergleich {vergleich!r}")
+        if schwere not in (WARNUNG, KRITISCH):
+            raise ValueError(f"Unbekannte Schwere {schwere!r}")
+        teile = metrik.split(".")
+        if teile[0] not in SystemSnapshot._fields or teile[0] in ("zeitpunkt", "aktualisiert"):
+            raise ValueError(f"Unbekannte Metrik {metrik!r}")
+        if teile.count("*") > 1 or teile[0] == "*":
+            raise ValueError(f"Höchstens ein '*' nach dem Collector-Namen: {metrik!r}")
+        _pruefe_pfad(metrik, teile)
+        if clear is not None:
+            # Die Hysterese muss auf der "guten" Seite der Schwelle liegen
+            if vergleich in ("==", "!="):
+                raise ValueError("clear ist nur mit <, <=, > und >= möglich")
+            if (vergleich in (">", ">=") and clear > schwelle) or (vergleich in ("<", "<=") and clear < schwelle):
+                raise ValueError(f"clear {clear:g} liegt auf der falschen Seite von {schwelle:g}")
+
+        self.name = name or metrik
+        self.metrik = metrik
+        self.vergleich = vergleich
+        self.schwelle = float(schwelle)
+        self.dauer = float(dauer)
+        self.clear = float(schwelle if clear is None else clear)
+        self.schwere = schwere
+        self.teil = teile[0]  # Collector, von dem die Regel abhängt
+        self._op = _VERGLEICHE[vergleich]
+        self._wildcard = "*" in teile
+        if self._wildcard:
+            stern = teile.index("*")
+            self._vor, self._nach = teile[1:stern], teile[stern + 1:]
+        else:
+            self._vor, self._nach = teile[1:], []
+
+    def erfuellt(self, wert):
+        return self._op(wert, self.schwelle)
+
+    def aufgehoben(self, wert):
+        # Ohne Hysterese: sobald die Bedingung nicht mehr gilt
+        return not self._op(wert, self.clear)
+
+    def werte(self, snapshot):
+        """(instanz, wert) für alle Instanzen; instanz ist None bei Regeln ohne "*" """
+        obj = _folge(getattr(snapshot, self.teil), self._vor)
+        if obj is None:
+            return ()
+        if not self._wildcard:
+            return ((None, obj),)
+        if isinstance(obj, dict):
+            paare = obj.items()
+        elif obj and hasattr(obj[0], "_fields"):
+            paare = ((_schluessel(i, element), element) for i, element in enumerate(obj))
+        else:
+            paare = zip(_indizes(len(obj)), obj)  # z. B. Kerne: Instanz ist der Index
+        if not self._nach:
+            return paare
+        return ((instanz, _folge(element, self._nach)) for instanz, element in paare)
+
+
+def _pruefe_pfad(metrik, teile):
+    """Prüft den Pfad gegen die Snapshot-Typen, damit ein Tippfehler nicht zu einer stummen Regel wird"""
+    typ, element = SystemSnapshot, None
+    for schritt in teile:
+        if schritt == "*":
+            if element is None:
+                raise ValueError(f"'*' geht nur bei Listen und dicts (Kerne, Geräte, Prozesse): {metrik!r}")
+            typ, element = element, None
+            continue
+        if element is not None:
+            raise ValueError(f"Unbekannte Metrik {metrik!r}: vor {schritt!r} fehlt ein '*'")
+        if not hasattr(typ, "_fields"):
+            raise ValueError(f"Unbekannte Metrik {metrik!r}: {schritt!r} ist kein Feld eines Zahlenwerts")
+        if schritt not in typ._fields:
+            raise ValueError(f"Unbekanntes Feld {schritt!r} in {metrik!r} (möglich: {', '.join(typ._fields)})")
+        element = _ELEMENTE.get((typ, schritt))
+        typ = _ohne_optional(typing.get_type_hints(typ)[schritt])
+    if element is not None or typ not in (int, float, bool):
+        raise ValueError(f"{metrik!r} ist kein Zahlenwert")
+
+
+def _ohne_optional(annotation):
+    # Optional[float] -> float
+    if typing.get_origin(annotation) is typing.Union:
+        return next(a for a in typing.get_args(annotation) if a is not type(None))
+    return annotation
+
+
+def _folge(obj, schritte):
+    for schritt in schritte:
+        if obj is None:
+            return None
+        obj = obj.get(schritt) if isinstance(obj, dict) else getattr(obj, schritt, None)
+    return obj
+
+
+_INDIZES = []
+
+
+def _indizes(n):
+    # Die Instanz-Namen "0", "1", ... werden nur einmal erzeugt
+    while len(_INDIZES) < n:
+        _INDIZES.append(str(len(_INDIZES)))
+    return _INDIZES
+
+
+def _schluessel(index, element):
+    # Prozesse über Name und PID bzw. Gruppenname, damit ein Alarm beim Umsortieren erhalten bleibt
+    pid = getattr(element, "pid", None)
+    name = getattr(element, "name", None)
+    if pid is not None:
+        return f"{name}[{pid}]"
+    return name if name is not None else str(index)
+
+
+def parse_rule(text):
+    """Übersetzt eine Zeile wie "ram.auslastung > 80 for 30s clear 75" in eine Rule"""
+    treffer = _REGEL.match(text.strip())
+    if treffer is None:
+        raise ValueError(f"Regel nicht verstanden: {text.strip()!r}")
+    g = treffer.groupdict()
+    dauer = float(g["dauer"]) * _EINHEITEN[g["einheit"] or ""] if g["dauer"] else 0.0
+    return Rule(g["metrik"], g["op"], float(g["schwelle"]), dauer,
+                float(g["clear"]) if g["clear"] is not None else None, g["schwere"] or WARNUNG, g["name"])
+
+
+def parse_rules(text):
+    """Eine Regel pro Zeile; Leerzeilen und Kommentare (#) werden übersprungen"""
+    regeln = []
+    for nummer, zeile in enumerate(text.splitlines(), 1):
+        zeile = zeile.split("#")[0].strip()
+        if not zeile:
+            continue
+        try:
+            regeln.append(parse_rule(zeile))
+        except ValueError as e:
+            raise ValueError(f"Zeile {nummer}: {e}") from None
+    return regeln
+
+
+def load_rules(path):
+    with open(path, encoding="utf-8") as f:
+        return parse_rules(f.read())
+
+
+def format_event(ereignis):
+    """Eine Log-Zeile, z. B. "2026-01-01 12:00:00 ALARM [kritisch] ram_hoch: ram.auslastung = 91.2 (> 80)" """
+    zeit = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ereignis.zeitpunkt))
+    if ereignis.zustand == AUSGELOEST:
+        return f"{zeit} ALARM [{ereignis.schwere}] {ereignis.text}"
+    return f"{zeit} ENDE  {ereignis.text}"
+
+
+class _Zustand:
+    __slots__ = ("seit", "aktiv", "tick")
+
+    def __init__(self, tick):
+        self.seit = None      # Zeitpunkt, ab dem die Bedingung ununterbrochen gilt
+        self.aktiv = False
+        self.tick = tick      # zuletzt gesehen in diesem Tick
+
+
+class AlertEngine:
+    """
+    Wertet die Regeln gegen jeden Snapshot aus. evaluate() läuft im
+    Collector-Thread, aktive() und letzte() dürfen aus dem GUI-Thread
+    gelesen werden.
+    """
+
+    def __init__(self, regeln, log=None, verlauf=100):
+        self.regeln = list(regeln)
+        self.log = log  # Datei-Objekt für Log-Zeilen (z. B. sys.stderr) oder None
+        self._zustaende = [{} for _ in self.regeln]  # pro Regel: instanz -> _Zustand
+        self._aktive = {}  # (regel-index, instanz) -> AlertEvent
+        self._letzte = collections.deque(maxlen=verlauf)
+        self._lock = threading.Lock()
+        self._tick = 0
+
+    @property
+    def collectors(self):
+        """Collector, die für die Regeln laufen müssen"""
+        return frozenset(regel.teil for regel in self.regeln)
+
+    def evaluate(self, snapshot):
+        """Gibt die in diesem Tick ausgelösten und aufgehobenen AlertEvents zurück"""
+        jetzt = snapshot.zeitpunkt
+        aktualisiert = snapshot.aktualisiert
+        ereignisse = []
+        self._tick = tick = self._tick + 1
+        for index, (regel, zustaende) in enumerate(zip(self.regeln, self._zustaende)):
+            # Nicht neu gesammelte Werte nicht erneut bewerten (leere Menge = unbekannt, z. B. aus Aufzeichnungen)
+            if aktualisiert and regel.teil not in aktualisiert:
+                continue
+            op = regel._op
+            schwelle = regel.schwelle
+            besucht = 0
+            for instanz, wert in regel.werte(snapshot):
+                if wert is None:
+                    continue
+                zustand = zustaende.get(instanz)
+                if zustand is None:
+                    if not op(wert, schwelle):
+                        continue  # Zustand wird erst angelegt, wenn die Bedingung einmal gilt
+                    zustand = zustaende[instanz] = _Zustand(tick)
+                if not zustand.aktiv:
+                    if not op(wert, schwelle):
+                        del zustaende[instanz]  # ruhige Instanzen belegen keinen Zustand
+                        continue
+                    if zustand.seit is None:
+                        zustand.seit = jetzt
+                    if jetzt - zustand.seit >= regel.dauer:
+                        zustand.aktiv = True
+                        ereignisse.append((index, self._ereignis(regel, instanz, AUSGELOEST, wert, jetzt)))
+                elif regel.aufgehoben(wert):
+                    del zustaende[instanz]
+                    ereignisse.append((index, self._ereignis(regel, instanz, AUFGEHOBEN, wert, jetzt)))
+                    continue
+                zustand.tick = tick
+                besucht += 1
+
+            if len(zustaende) > besucht:
+                # Verschwundene Kerne/Geräte/Prozesse: offene Alarme beenden, Zustand vergessen
+                for instanz in [i for i, z in zustaende.items() if z.tick != tick]:
+                    if zustaende.pop(instanz).aktiv:
+                        ereignisse.append((index, self._ereignis(regel, instanz, AUFGEHOBEN, None, jetzt)))
+
+        if ereignisse:
+            self._melden(ereignisse)
+        return [ereignis for _, ereignis in ereignisse]
+
+    @staticmethod
+    def _ereignis(regel, instanz, zustand, wert, jetzt):
+        return AlertEvent(jetzt, regel.name, regel.metrik, instanz, zustand,
+                          None if wert is None else float(wert), regel.vergleich, regel.schwelle, regel.schwere)
+
+    def _melden(self, ereignisse):
+        with self._lock:
+            for index, ereignis in ereignisse:
+                schluessel = (index, ereignis.instanz)
+                if ereignis.zustand == AUSGELOEST:
+                    self._aktive[schluessel] = ereignis
+                else:
+                    self._aktive.pop(schluessel, None)
+                self._letzte.append(ereignis)
+        if self.log is not None:
+            for _, ereignis in ereignisse:
+                print(format_event(ereignis), file=self.log, flush=True)
+
+    def aktive(self):
+        """Aktive Alarme, kritische zuerst, dann nach Beginn"""
+        with self._lock:
+            aktive = list(self._aktive.values())
+        return sorted(aktive, key=lambda e: (e.schwere != KRITISCH, e.zeitpunkt))
+
+    def letzte(self):
+        """Die letzten Ereignisse (ausgelöst und aufgehoben), älteste zuerst"""
+        with self._lock:
+            return list(self._letzte)
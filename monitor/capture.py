@@ -0,0 +1,197 @@
+"""
+Mitschnitt vollständiger Snapshots zum späteren Abspielen (main.py --replay).
+
+Anders als monitor/recorder.py, das nur wenige Kennzahlen pro Satz für die
+Verläufe speichert, enthält ein Mitschnitt alles, was get_all_system_stats()
+geliefert hat (Kerne, Prozesse, Geräte ...). Die Datei ist eine Folge von
+Frames aus monitor/protocol.py: ein HALLO-Frame mit Metadaten, dann pro
+Snapshot ein DELTA gegenüber dem vorherigen und alle KEYFRAME_INTERVAL
+Snapshots ein VOLL-Frame. Ein abgeschnittenes Ende (Absturz beim Schreiben)
+wird beim Lesen ignoriert.
+
+    writer = CaptureWriter("last.syscap")
+    collector.add_listener(writer.append)
+    ...
+    for snapshot in read_capture("last.syscap"):
+        ...
+
+Dieses Modul braucht weder PySide6 noch numpy.
+"""
+import socket
+import threading
+import time
+
+from monitor import protocol
+from monitor.snapshots import snapshot_from_plain, to_plain
+
+KEYFRAME_INTERVAL = 300
+
+
+class CaptureWriter:
+    """Hängt Snapshots an eine Mitschnitt-Datei an; append() passt als Collector-Listener"""
+
+    def __init__(self, path, keyframe_interval=KEYFRAME_INTERVAL):
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self.anzahl = 0
+        self._basis = None
+        self._lock = threading.Lock()
+        self._datei = open(path, "wb")
+        self._datei.write(protocol.encode_frame(protocol.HALLO, 0, {
+            "host": socket.gethostname(), "start": time.time(), "version": protocol.VERSION}))
+
+    def append(self, snapshot):
+        plain = to_plain(snapshot)
+        with self._lock:
+            if self._datei is None:
+                return
+            self.anzahl += 1
+            if self._basis is None or (self.anzahl - 1) % self.keyframe_interval == 0:
+                frame = protocol.encode_frame(protocol.VOLL, self.anzahl, plain)
+            else:
+                frame = protocol.encode_frame(protocol.DELTA, self.anzahl, plain, basis=self._basis)
+            self._basis = plain
+            self._datei.write(frame)
+            # Pro Snapshot (typisch 1/s) sichern, damit ein Absturz höchstens den letzten kostet
+            self._datei.flush()
+
+    def close(self):
+        with self._lock:
+            if self._datei is not None:
+                self._datei.close()
+                self._datei = None
+
+
+def read_capture_info(path):
+    """Metadaten aus dem HALLO-Frame (host, start, version)"""
+    with open(path, "rb") as f:
+        for typ, _, wert in _frames(f):
+            return wert
+    raise protocol.ProtocolError("Leerer Mitschnitt")
+
+
+def read_capture(path):
+    """Liefert die Snapshots eines Mitschnitts der Reihe nach (als SystemSnapshot)"""
+    with open(path, "rb") as f:
+        basis = None
+        for typ, _, plain in _frames(f, lambda: basis):
+            if typ == protocol.HALLO:
+                continue
+            basis = plain
+            yield snapshot_from_plain(plain)
+
+
+def _frames(datei, basis=lambda: None):
+    erster = True
+    while True:
+        kopf = datei.read(protocol.HEADER.size)
+        if len(kopf) < protocol.HEADER.size:
+            return
+        typ, seq, laenge = protocol.parse_header(kopf)
+        if erster and typ != protocol.HALLO:
+            raise protocol.ProtocolError("Keine Mitschnitt-Datei (HALLO fehlt)")
+        erster = False
+        nutzdaten = datei.read(laenge)
+        if len(nutzdaten) < laenge:
+            return  # beim Schreiben abgebrochen
+        yield typ, seq, protocol.decode_payload(typ, nutzdaten, basis())
+
+
+class CapturePlayer:
+    """
+    Gibt Snapshots im ursprünglichen Abstand geteilt durch `speed` heraus;
+    mit speed=None so schnell wie möglich (jeder Aufruf von take() liefert
+    den nächsten). Kommt der Aufrufer nicht hinterher, werden überholte
+    Snapshots wie beim StatsCollector verworfen.
+    """
+
+    def __init__(self, snapshots, speed=1.0):
+        self.speed = speed
+        self.gezeigt = 0
+        self.verworfen = 0
+        self._snapshots = iter(snapshots)
+        self._naechster = next(self._snapshots, None)
+        self._start = None  # (monotonic beim Start, zeitpunkt des ersten Snapshots)
+
+    @property
+    def fertig(self):
+        return self._naechster is None
+
+    def _faellig_ab(self, snapshot):
+        start_mono, start_zeit = self._start
+        return start_mono + (snapshot.zeitpunkt - start_zeit) / self.speed
+
+    def take(self, jetzt=None):
+        """Der neueste fällige Snapshot oder None"""
+        if self._naechster is None:
+            return None
+        if self.speed is None:
+            snapshot, self._naechster = self._naechster, next(self._snapshots, None)
+            self.gezeigt += 1
+            return snapshot
+        if jetzt is None:
+            jetzt = time.monotonic()
+        if self._start is None:
+            self._start = (jetzt, self._naechster.zeitpunkt)
+        snapshot = None
+        while self._naechster is not None and self._faellig_ab(self._naechster) <= jetzt:
+            if snapshot is not None:
+                self.verworfen += 1
+            snapshot, self._naechster = self._naechster, next(self._snapshots, None)
+        if snapshot is not None:
+            self.gezeigt += 1
+        return snapshot
+
+    def wartezeit(self, jetzt=None):
+        """Sekunden bis zum nächsten Snapshot (0 bei speed=None, None am Ende)"""
+        if self._naechster is None:
+            return None
+        if self.speed is None or self._start is None:
+            return 0.0
+        if jetzt is None:
+            jetzt = time.monotonic()
+        return max(0.0, self._faellig_ab(self._naechster) - jetzt)
+
+
+class ReplayStats:
+    """Dauern pro Frame beim Abspielen mit voller Geschwindigkeit (für den Bericht in main.py --speed max)"""
+
+    def __init__(self):
+        self.update_ns = []
+        self.paint_ns = []
+        self.frame_ns = []
+        self._start = None
+        self._ende = None
+
+    def add(self, update_ns, paint_ns, frame_ns):
+        if self._start is None:
+            self._start = time.perf_counter_ns() - frame_ns
+        self.update_ns.append(update_ns)
+        self.paint_ns.append(paint_ns)
+        self.frame_ns.append(frame_ns)
+        self._ende = time.perf_counter_ns()
+
+    def summary(self):
+        dauer_s = (self._ende - self._start) / 1e9 if self._start is not None else 0.0
+        ergebnis = {"frames": len(self.frame_ns), "dauer_s": round(dauer_s, 3),
+                    "fps": round(len(self.frame_ns) / dauer_s, 1) if dauer_s > 0 else 0.0}
+        for name, werte in (("update", self.update_ns), ("paint", self.paint_ns), ("frame", self.frame_ns)):
+            sortiert = sorted(werte)
+            for p in (50, 95, 99):
+                ergebnis[f"{name}_p{p}_ms"] = round(_percentile(sortiert, p) / 1e6, 3)
+            ergebnis[f"{name}_max_ms"] = round(sortiert[-1] / 1e6, 3) if sortiert else 0.0
+        return ergebnis
+
+    def format(self):
+        s = self.summary()
+        zeilen = [f"Wiedergabe: {s['frames']} Frames in {s['dauer_s']:.2f} s = {s['fps']:.1f} fps",
+                  f"{'':<8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"]
+        for name in ("update", "paint", "frame"):
+            zeilen.append(f"{name:<8}" + "".join(f"{s[f'{name}_{k}_ms']:>10.2f}" for k in ("p50", "p95", "p99", "max")))
+        return "\n".join(zeilen)
+
+
+def _percentile(sortiert, p):
+    if not sortiert:
+        return 0.0
+    return sortiert[min(len(sortiert) - 1, int(len(sortiert) * p / 100))]
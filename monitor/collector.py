@@ -0,0 +1,171 @@
+import threading
+import time
+
+from PySide6.QtCore import QCoreApplication, QMetaObject, QObject, QThread, QTimer, Qt, Signal, Slot
+
+from monitor.instrumentation import profiler
+
+
+class StatsCollector(QObject):
+    """
+    Sammelt die Systemdaten in einem eigenen QThread.
+
+    Fertige Snapshots werden nicht in eine Queue gestellt, sondern in einem
+    einzelnen Slot abgelegt. Das Signal snapshot_ready wird nur gesendet, wenn
+    der vorherige Snapshot bereits abgeholt wurde – veraltete Snapshots werden
+    also einfach überschrieben.
+
+    Ohne collect_func wird monitor.system_stats (und damit psutil) erst im
+    Worker-Thread importiert, damit der Start der GUI nicht darauf wartet.
+    Der Collector hat dann einen eigenen Scheduler, dessen Takt und aktive
+    Collector die GUI über set_demand() an ihre Sichtbarkeit anpasst.
+    """
+
+    snapshot_ready = Signal()
+
+    def __init__(self, interval_ms=1000, collect_func=None):
+        super().__init__()
+        self.interval_ms = interval_ms
+        self.collect_func = collect_func
+        self.scheduler = None
+        self.timer = None
+        self._demand = None  # (interval_ms, collector-namen) aus set_demand()
+
+        self._lock = threading.Lock()
+        self._latest = None
+        self._pending = False
+
+        self.zyklen = 0
+        self.verworfen = 0
+        self.letzte_dauer_ms = 0.0
+        self.listeners = []
+
+    @Slot()
+    def start(self):
+        """Startet die periodische Erfassung (läuft im Worker-Thread)"""
+        if self.collect_func is None:
+            from monitor.system_stats import create_default_scheduler, get_all_system_stats
+            self.scheduler = create_default_scheduler()
+            self.collect_func = lambda: get_all_system_stats(self.scheduler)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.collect)
+        self._take_demand()
+        self.timer.start(self.interval_ms)
+        self.collect()
+
+    def set_demand(self, interval_ms, collectors=None):
+        """
+        Aus dem GUI-Thread: neues Intervall und benötigte Collector (None = alle).
+        Steigt der Bedarf (kürzeres Intervall oder neue Collector), wird sofort
+        ein Zyklus nachgeholt, statt auf den nächsten Timer-Tick zu warten.
+        """
+        with self._lock:
+            self._demand = (interval_ms, collectors)
+        QMetaObject.invokeMethod(self, "apply_demand", Qt.QueuedConnection)
+
+    @Slot()
+    def apply_demand(self):
+        """Übernimmt den Bedarf aus set_demand() (läuft im Worker-Thread)"""
+        if self.timer is None:
+            return  # wird in start() übernommen
+        intervall_vorher = self.interval_ms
+        gestiegen = self._take_demand()
+        if gestiegen:
+            self.timer.start(self.interval_ms)  # Takt ab jetzt neu zählen
+            self.collect()
+        elif self.interval_ms != intervall_vorher:
+            self.timer.start(self.interval_ms)
+
+    def _take_demand(self):
+        """Setzt Intervall und aktive Collector; True, wenn mehr als bisher gebraucht wird"""
+        with self._lock:
+            demand = self._demand
+            self._demand = None
+        if demand is None:
+            return False
+        interval_ms, collectors = demand
+        gestiegen = interval_ms < self.interval_ms
+        self.interval_ms = interval_ms
+        if self.scheduler is not None:
+            vorher = self._active_names()
+            self.scheduler.set_active(collectors)
+            gestiegen = gestiegen or bool(self._active_names() - vorher)
+        return gestiegen
+
+    def _active_names(self):
+        return {name for name, spec in self.scheduler.collectors.items() if spec.aktiv}
+
+    def add_listener(self, func):
+        """
+        func(stats) wird im Worker-Thread für jeden Snapshot aufgerufen – auch
+        für solche, die die GUI später verwirft (z. B. für die Aufzeichnung).
+        """
+        self.listeners.append(func)
+
+    @Slot()
+    def stop(self):
+        """Stoppt die Erfassung und gibt das Objekt an den GUI-Thread zurück"""
+        if self.timer is not None:
+            self.timer.stop()
+            self.timer = None  # späte set_demand()-Aufrufe nicht mehr übernehmen
+        self.moveToThread(QCoreApplication.instance().thread())
+
+    @Slot()
+    def collect(self):
+        """Führt einen Erfassungszyklus aus und legt das Ergebnis ab"""
+        start = time.perf_counter()
+        try:
+            stats = self.collect_func()
+        except Exception as e:
+            print(f"Fehler beim Erfassen der Stats: {e}")
+            return
+        dauer_ms = (time.perf_counter() - start) * 1000
+        if profiler.enabled:
+            profiler.record("zyklus.erfassung", int(dauer_ms * 1e6))
+
+        for listener in self.listeners:
+            try:
+                listener(stats)
+            except Exception as e:
+                print(f"Fehler im Listener {listener!r}: {e}")
+
+        with self._lock:
+            self.zyklen += 1
+            self.letzte_dauer_ms = dauer_ms
+            if self._pending:
+                # Der letzte Snapshot wurde nie abgeholt -> verwerfen
+                self.verworfen += 1
+            self._latest = (stats, dauer_ms)
+            notify = not self._pending
+            self._pending = True
+
+        if notify:
+            self.snapshot_ready.emit()
+
+    def take_latest(self):
+        """Gibt den neuesten Snapshot als (stats, dauer_ms) zurück (oder None)"""
+        with self._lock:
+            latest = self._latest
+            self._latest = None
+            self._pending = False
+        return latest
+
+
+class CollectorThread:
+    """Verbindet einen StatsCollector mit einem eigenen QThread"""
+
+    def __init__(self, collector: StatsCollector):
+        self.collector = collector
+        self.thread = QThread()
+        self.thread.setObjectName("StatsCollector")
+        collector.moveToThread(self.thread)
+        self.thread.started.connect(collector.start)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self, timeout_ms=3000):
+        if self.thread.isRunning():
+            QMetaObject.invokeMethod(self.collector, "stop", Qt.BlockingQueuedConnection)
+        self.thread.quit()
+        self.thread.wait(timeout_ms)
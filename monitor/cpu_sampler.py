@@ -0,0 +1,87 @@
+import time
+
+import psutil
+
+
+# Felder, die zusätzlich als eigene Prozentwerte ausgegeben werden
+MODI = ("user", "system", "iowait", "steal", "irq")
+
+# guest/guest_nice sind unter Linux bereits in user/nice enthalten
+_DOPPELT_GEZAEHLT = ("guest", "guest_nice")
+
+# Zeiten, in denen der Kern nichts zu tun hatte
+_LEERLAUF = ("idle", "iowait")
+
+
+class CpuSampler:
+    """
+    Zustandsbehafteter CPU-Sampler auf Basis von cpu_times()-Deltas.
+
+    Statt zweimal blockierend zu messen, wird der vorherige Snapshot von
+    psutil.cpu_times(percpu=True) gespeichert. Gesamt-, Kern- und Modus-Werte
+    stammen so aus demselben Intervall und ein Aufruf kostet nur wenige
+    Mikrosekunden. Beim ersten Aufruf wird gegen den Systemstart gemessen.
+    """
+
+    def __init__(self, times_func=None):
+        self.times_func = times_func or (lambda: psutil.cpu_times(percpu=True))
+        self._last_times = None
+        self._last_zeit = None
+        self._last_result = None
+
+    def sample(self):
+        jetzt = time.monotonic()
+        times = self.times_func()
+
+        if self._last_times is None or len(self._last_times) != len(times):
+            # Erster Aufruf (oder Hotplug): Differenz gegen Null = Mittel seit Boot
+            vorher = [None] * len(times)
+            intervall = None
+        else:
+            vorher = self._last_times
+            intervall = jetzt - self._last_zeit
+
+        kerne = []
+        summe_gesamt = 0.0
+        summe_busy = 0.0
+        summe_modi = dict.fromkeys(MODI, 0.0)
+
+        for neu, alt in zip(times, vorher):
+            deltas = _deltas(neu, alt)
+            gesamt = sum(v for k, v in deltas.items() if k not in _DOPPELT_GEZAEHLT)
+            busy = gesamt - sum(deltas.get(k, 0.0) for k in _LEERLAUF)
+
+            kerne.append(_prozent(busy, gesamt))
+            summe_gesamt += gesamt
+            summe_busy += busy
+            for modus in MODI:
+                summe_modi[modus] += deltas.get(modus, 0.0)
+
+        if summe_gesamt <= 0 and self._last_result is not None:
+            # Innerhalb eines Clock-Ticks erneut aufgerufen -> alten Wert behalten
+            return self._last_result
+
+        self._last_times = times
+        self._last_zeit = jetzt
+
+        self._last_result = {
+            "auslastung_prozent": _prozent(summe_busy, summe_gesamt),
+            "alle_kerne": kerne,
+            "modi": {modus: _prozent(wert, summe_gesamt) for modus, wert in summe_modi.items()},
+            "intervall": intervall,  # tatsächlich vergangene Zeit in s (None beim ersten Aufruf)
+        }
+        return self._last_result
+
+
+def _deltas(neu, alt):
+    if alt is None:
+        return dict(zip(neu._fields, neu))
+    # Zähler können durch Rundung minimal zurückspringen -> nicht negativ werden lassen.
+    # Beide Seiten stammen aus derselben Quelle, also gleiche Feldreihenfolge
+    return {k: (v - a if v > a else 0.0) for k, v, a in zip(neu._fields, neu, alt)}
+
+
+def _prozent(teil, gesamt):
+    if gesamt <= 0:
+        return 0.0
+    return round(min(100.0, max(0.0, teil / gesamt * 100)), 1)
@@ -0,0 +1,213 @@
+"""
+Prometheus/OpenMetrics-Endpunkt für die gesammelten Snapshots.
+
+Der Text wird einmal pro Erfassungszyklus in publish() erzeugt (im
+Collector-Thread) und als fertiges bytes-Objekt abgelegt. Ein Scrape liest
+nur diese Referenz – es wird also weder neu gesammelt noch neu formatiert,
+und beliebig viele gleichzeitige Scrapes blockieren weder GUI noch Collector.
+
+    exporter = MetricsExporter(port=9877)
+    exporter.start()
+    collector.add_listener(exporter.publish)
+"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PREFIX = "sysmon_"
+TOP_PROZESSE = 10
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class _Writer:
+    """Sammelt die Zeilen einer Ausgabe; jede Metrik-Familie wird genau einmal deklariert"""
+
+    def __init__(self):
+        self.zeilen = []
+
+    def family(self, name, typ, hilfe, samples, unit=None):
+        """samples: Liste von (labels-dict oder None, wert); Werte None werden ausgelassen"""
+        samples = [(labels, wert) for labels, wert in samples if wert is not None]
+        if not samples:
+            return
+        name = PREFIX + name
+        self.zeilen.append(f"# TYPE {name} {typ}")
+        if unit:
+            self.zeilen.append(f"# UNIT {name} {unit}")
+        self.zeilen.append(f"# HELP {name} {hilfe}")
+        sample_name = name + "_total" if typ == "counter" else name
+        for labels, wert in samples:
+            if labels:
+                label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+                self.zeilen.append(f"{sample_name}{{{label_text}}} {_format(wert)}")
+            else:
+                self.zeilen.append(f"{sample_name} {_format(wert)}")
+
+    def render(self):
+        self.zeilen.append("# EOF")
+        return ("\n".join(self.zeilen) + "\n").encode("utf-8")
+
+
+def _format(wert):
+    if isinstance(wert, bool):
+        return "1" if wert else "0"
+    if isinstance(wert, int):
+        return str(wert)
+    return repr(float(wert))
+
+
+def render_openmetrics(snapshot):
+    """Wandelt einen SystemSnapshot in OpenMetrics-Text (bytes) um"""
+    w = _Writer()
+
+    cpu = snapshot.cpu
+    if cpu is not None:
+        w.family("cpu_usage_percent", "gauge", "Gesamte CPU-Auslastung.", [(None, cpu.auslastung_prozent)])
+        w.family("cpu_core_usage_percent", "gauge", "CPU-Auslastung pro Kern.",
+                 [({"core": i}, wert) for i, wert in enumerate(cpu.alle_kerne)])
+        w.family("cpu_mode_percent", "gauge", "Anteil der CPU-Zeit pro Modus.",
+                 [({"mode": modus}, wert) for modus, wert in zip(cpu.modi._fields, cpu.modi)])
+        if cpu.takt:
+            w.family("cpu_frequency_hertz", "gauge", "Aktueller CPU-Takt.", [(None, cpu.takt * 1e6)], unit="hertz")
+
+    ram = snapshot.ram
+    if ram is not None:
+        w.family("memory_used_bytes", "gauge", "Genutzter Arbeitsspeicher.", [(None, ram.genutzt_bytes)], unit="bytes")
+        w.family("memory_total_bytes", "gauge", "Gesamter Arbeitsspeicher.", [(None, ram.gesamt_bytes)], unit="bytes")
+        w.family("memory_free_bytes", "gauge", "Freier Arbeitsspeicher.", [(None, ram.frei_bytes)], unit="bytes")
+        w.family("memory_usage_percent", "gauge", "Auslastung des Arbeitsspeichers.", [(None, ram.auslastung)])
+
+    usage = snapshot.usage
+    if usage is not None:
+        w.family("disk_used_bytes", "gauge", "Belegter Platz auf der Festplatte.", [(None, usage.used_bytes)], unit="bytes")
+        w.family("disk_total_bytes", "gauge", "Größe der Festplatte.", [(None, usage.total_bytes)], unit="bytes")
+        w.family("disk_usage_percent", "gauge", "Belegung der Festplatte.", [(None, usage.percent)])
+
+    io = snapshot.io
+    if io is not None:
+        w.family("disk_read_bytes", "counter", "Gelesene Bytes seit Boot.", [(None, io.read_bytes)], unit="bytes")
+        w.family("disk_written_bytes", "counter", "Geschriebene Bytes seit Boot.", [(None, io.write_bytes)], unit="bytes")
+        w.family("disk_reads", "counter", "Leseoperationen seit Boot.", [(None, io.read_count)])
+        w.family("disk_writes", "counter", "Schreiboperationen seit Boot.", [(None, io.write_count)])
+
+    if snapshot.disk_raten:
+        geraete = [({"device": name}, r) for name, r in snapshot.disk_raten.items()]
+        w.family("disk_device_read_bytes_per_second", "gauge", "Leserate pro Laufwerk.",
+                 [(labels, r.read_bytes_s) for labels, r in geraete])
+        w.family("disk_device_write_bytes_per_second", "gauge", "Schreibrate pro Laufwerk.",
+                 [(labels, r.write_bytes_s) for labels, r in geraete])
+        w.family("disk_device_ops_per_second", "gauge", "Lese- und Schreiboperationen pro Sekunde und Laufwerk.",
+                 [(dict(labels, op=op), wert) for labels, r in geraete
+                  for op, wert in (("read", r.read_ops_s), ("write", r.write_ops_s))])
+        w.family("disk_device_utilization_percent", "gauge", "Anteil der Zeit mit laufenden Anfragen.",
+                 [(labels, r.auslastung_prozent) for labels, r in geraete])
+        w.family("disk_device_await_seconds", "gauge", "Mittlere Dauer einer Anfrage.",
+                 [(labels, r.wartezeit_ms / 1000 if r.wartezeit_ms is not None else None) for labels, r in geraete],
+                 unit="seconds")
+
+    netzwerk = snapshot.netzwerk
+    if netzwerk is not None:
+        w.family("network_sent_bytes", "counter", "Gesendete Bytes seit Boot.", [(None, netzwerk.gesendet_bytes)], unit="bytes")
+        w.family("network_received_bytes", "counter", "Empfangene Bytes seit Boot.", [(None, netzwerk.empfangen_bytes)], unit="bytes")
+
+    if snapshot.network_interfaces:
+        w.family("network_interface_up", "gauge", "Netzwerk-Interface aktiv (1) oder nicht (0).",
+                 [({"interface": name}, info.is_up) for name, info in snapshot.network_interfaces.items()])
+
+    if snapshot.nic_raten:
+        geraete = [({"interface": name}, r) for name, r in snapshot.nic_raten.items()]
+        w.family("network_interface_transmit_bytes_per_second", "gauge", "Senderate pro Interface.",
+                 [(labels, r.gesendet_bytes_s) for labels, r in geraete])
+        w.family("network_interface_receive_bytes_per_second", "gauge", "Empfangsrate pro Interface.",
+                 [(labels, r.empfangen_bytes_s) for labels, r in geraete])
+        w.family("network_interface_packets_per_second", "gauge", "Pakete pro Sekunde und Interface.",
+                 [(dict(labels, direction=richtung), wert) for labels, r in geraete
+                  for richtung, wert in (("transmit", r.gesendet_pakete_s), ("receive", r.empfangen_pakete_s))])
+        w.family("network_interface_errors_per_second", "gauge", "Fehler pro Sekunde und Interface.",
+                 [(labels, r.fehler_s) for labels, r in geraete])
+        w.family("network_interface_drops_per_second", "gauge", "Verworfene Pakete pro Sekunde und Interface.",
+                 [(labels, r.verworfen_s) for labels, r in geraete])
+
+    internet = snapshot.internet
+    if internet is not None:
+        w.family("internet_up", "gauge", "Internetverbindung erreichbar.", [(None, internet.connection)])
+        if internet.rtt_ms is not None:
+            w.family("internet_rtt_seconds", "gauge", "Letzte gemessene Verbindungszeit zum Prüfziel.",
+                     [(None, internet.rtt_ms / 1000)], unit="seconds")
+
+    battery = snapshot.battery
+    if battery is not None:
+        w.family("battery_percent", "gauge", "Ladestand des Akkus.", [(None, battery.percent)])
+        w.family("battery_power_plugged", "gauge", "Netzteil angeschlossen.", [(None, battery.power_plugged)])
+
+    if snapshot.boot is not None:
+        w.family("boot_time_seconds", "gauge", "Boot-Zeitpunkt (Unix-Zeit).", [(None, snapshot.boot.timestamp)], unit="seconds")
+
+    if snapshot.cpu_prozesses:
+        # Stabile Labels (PID und Name bzw. Gruppe), damit ein Prozess bei Platzwechseln seine Reihe behält
+        top = [({"pid": p.pid, "name": p.name} if p.pid is not None else {"group": p.name}, p)
+               for p in snapshot.cpu_prozesses[:TOP_PROZESSE]]
+        w.family("process_cpu_percent", "gauge", "CPU-Auslastung der aktivsten Prozesse.",
+                 [(labels, p.cpu_prozent) for labels, p in top])
+        w.family("process_resident_bytes", "gauge", "Residenter Speicher der aktivsten Prozesse.",
+                 [(labels, p.rss_bytes) for labels, p in top], unit="bytes")
+        w.family("process_threads", "gauge", "Threads der aktivsten Prozesse.",
+                 [(labels, p.threads) for labels, p in top])
+
+    w.family("collection_timestamp_seconds", "gauge", "Zeitpunkt der letzten Erfassung (Unix-Zeit).",
+             [(None, snapshot.zeitpunkt)], unit="seconds")
+    return w.render()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.server.exporter.payload
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # kein Log pro Scrape
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # Standard (5) reicht bei vielen gleichzeitigen Scrapes nicht
+
+
+class MetricsExporter:
+    """HTTP-Endpunkt (/metrics) in einem eigenen Daemon-Thread"""
+
+    def __init__(self, port=9877, host="0.0.0.0"):
+        self.host = host
+        self.port = port
+        self.payload = b"# EOF\n"  # bis zum ersten Snapshot
+        self.renders = 0
+        self._server = None
+        self._thread = None
+
+    def publish(self, snapshot):
+        """Rendert den Text für einen neuen Snapshot; Scrapes lesen danach nur noch self.payload"""
+        self.payload = render_openmetrics(snapshot)
+        self.renders += 1
+
+    def start(self):
+        self._server = _Server((self.host, self.port), _Handler)
+        self._server.exporter = self
+        self.port = self._server.server_address[1]  # bei port=0 den tatsächlichen Port übernehmen
+        self._thread = threading.Thread(target=self._server.serve_forever, name="MetricsExporter", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
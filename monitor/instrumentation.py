@@ -0,0 +1,100 @@
+"""
+Leichtgewichtige Laufzeitmessung für Collector, Widgets und GUI-Updates.
+
+Die Messpunkte prüfen nur `profiler.enabled`; ist der Profiler aus, kostet
+ein Messpunkt also einen Attributzugriff. Eingeschaltet werden die Dauern in
+rollierenden Fenstern (die letzten `window` Werte pro Komponente) abgelegt,
+aus denen summary() p50/p95/max berechnet.
+
+    from monitor.instrumentation import profiler
+    if profiler.enabled:
+        start = time.perf_counter_ns()
+        ...
+        profiler.record("collector.cpu", time.perf_counter_ns() - start)
+"""
+import json
+import os
+import threading
+import time
+
+
+class RollingStats:
+    """Ringpuffer der letzten `window` Dauern (ns) einer Komponente"""
+
+    __slots__ = ("window", "werte", "pos", "anzahl", "summe_ns", "max_ns")
+
+    def __init__(self, window=600):
+        self.window = window
+        self.werte = [0] * window
+        self.pos = 0
+        self.anzahl = 0       # insgesamt gemessen (nicht nur im Fenster)
+        self.summe_ns = 0
+        self.max_ns = 0       # Maximum seit dem letzten reset()
+
+    def add(self, dauer_ns):
+        self.werte[self.pos] = dauer_ns
+        self.pos = (self.pos + 1) % self.window
+        self.anzahl += 1
+        self.summe_ns += dauer_ns
+        if dauer_ns > self.max_ns:
+            self.max_ns = dauer_ns
+
+    def summary(self):
+        n = min(self.anzahl, self.window)
+        if n == 0:
+            return None
+        fenster = sorted(self.werte[:n] if self.anzahl < self.window else self.werte)
+        return {
+            "n": self.anzahl,
+            "p50_ms": fenster[n // 2] / 1e6,
+            "p95_ms": fenster[min(n - 1, int(n * 0.95))] / 1e6,
+            "max_ms": fenster[-1] / 1e6,
+            "max_gesamt_ms": self.max_ns / 1e6,
+            "mean_ms": self.summe_ns / self.anzahl / 1e6,
+        }
+
+
+class Profiler:
+    """Sammelt RollingStats pro Komponente (z. B. "collector.cpu", "paint.RamWidget")"""
+
+    def __init__(self, window=600, enabled=False):
+        self.window = window
+        self.enabled = enabled
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+
+    def record(self, name, dauer_ns):
+        stats = self._stats.get(name)
+        if stats is None:
+            with self._lock:
+                stats = self._stats.setdefault(name, RollingStats(self.window))
+        stats.add(dauer_ns)
+
+    def reset(self):
+        with self._lock:
+            self._stats = {}
+
+    def summary(self):
+        """{name: {n, p50_ms, p95_ms, max_ms, ...}} sortiert nach Komponente"""
+        ergebnis = {}
+        for name in sorted(self._stats):
+            werte = self._stats[name].summary()
+            if werte is not None:
+                ergebnis[name] = werte
+        return ergebnis
+
+    def export_json(self, path=None):
+        """Schreibt die aktuelle Zusammenfassung als JSON und gibt den Pfad zurück"""
+        if path is None:
+            path = f"sysmon-profile-{time.strftime('%Y%m%d-%H%M%S')}.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"zeitpunkt": time.time(), "window": self.window,
+                       "komponenten": self.summary()}, f, indent=2)
+        return path
+
+
+# Gemeinsame Instanz; mit SYSMON_PROFILE=1 schon beim Start aktiv
+profiler = Profiler(enabled=os.environ.get("SYSMON_PROFILE") == "1")
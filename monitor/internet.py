@@ -0,0 +1,158 @@
+import os
+import socket
+import threading
+import time
+
+from monitor.snapshots import InternetSnapshot
+
+
+# Standard-Ziele: öffentliche DNS-Server (TCP-Port 53)
+DNS_PORT = 53
+DEFAULT_TARGETS = (("8.8.8.8", DNS_PORT), ("1.1.1.1", DNS_PORT))
+
+
+def parse_address(text, default_port=DNS_PORT):
+    """ "host", "host:port" oder "[::1]:port" -> (host, port) """
+    text = text.strip()
+    if text.startswith("["):
+        host, _, rest = text[1:].partition("]")
+        port = rest[1:] if rest.startswith(":") else ""
+    elif text.count(":") == 1:
+        host, _, port = text.partition(":")
+    else:
+        host, port = text, ""  # Hostname oder IPv6 ohne Port
+    if not host or (port and not port.isdigit()):
+        raise ValueError(f"Ungültige Adresse: {text!r}")
+    return host, int(port) if port else default_port
+
+
+def targets_from_env():
+    """
+    Ziele aus SYSMON_INTERNET_TARGETS="127.0.0.1:8053,8.8.8.8,[::1]:53"
+    (ohne Port: 53); ValueError bei ungültigen Einträgen
+    """
+    value = os.environ.get("SYSMON_INTERNET_TARGETS")
+    if not value or not value.strip():
+        return DEFAULT_TARGETS
+    targets = []
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        try:
+            host, port = parse_address(item)
+        except ValueError as e:
+            raise ValueError(f"SYSMON_INTERNET_TARGETS: {e}") from None
+        if not 0 < port < 65536:
+            raise ValueError(f"SYSMON_INTERNET_TARGETS: Port {port} in {item.strip()!r} außerhalb von 1-65535")
+        targets.append((host, port))
+    return targets or DEFAULT_TARGETS
+
+
+def probe(host, port, timeout=1.0):
+    """
+    Baut eine TCP-Verbindung auf und schließt sie sofort wieder.
+    Gibt die Round-Trip-Zeit in ms zurück oder None bei Fehler.
+    """
+    start = time.perf_counter()
+    try:
+        # create_connection setzt den Timeout nur für diesen Socket
+        with socket.create_connection((host, port), timeout=timeout):
+            pass
+    except OSError:
+        return None
+    return (time.perf_counter() - start) * 1000
+
+
+class InternetMonitor:
+    """
+    Prüft die Internet-Erreichbarkeit in einem eigenen Thread.
+
+    Das Dashboard liest nur den zwischengespeicherten Zustand über state()
+    und wartet nie auf das Netzwerk. Solange keine Verbindung besteht, wird
+    das Prüfintervall exponentiell bis max_interval verlängert. Ist der
+    letzte Messwert älter als ttl, gilt er als veraltet.
+    """
+
+    def __init__(self, targets=DEFAULT_TARGETS, interval=5.0, timeout=1.0,
+                 ttl=30.0, backoff_start=1.0, max_interval=60.0):
+        self.targets = tuple(targets)
+        self.interval = interval
+        self.timeout = timeout
+        self.ttl = ttl
+        self.backoff_start = backoff_start
+        self.max_interval = max_interval
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self._connection = None
+        self._rtt_ms = None
+        self._ziel = None
+        self._zeitpunkt = None
+        self._fehlversuche = 0
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="InternetMonitor", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def refresh(self):
+        """Erzwingt eine sofortige neue Prüfung (z. B. nach Netzwerkwechsel)"""
+        self._wake.set()
+
+    def check_once(self):
+        """Prüft alle Ziele der Reihe nach, bis eines erreichbar ist"""
+        for host, port in self.targets:
+            if self._stop.is_set():
+                return
+            rtt = probe(host, port, self.timeout)
+            if rtt is not None:
+                self._setzen(True, rtt, (host, port))
+                return
+        self._setzen(False, None, None)
+
+    def state(self):
+        """Gibt den zuletzt gemessenen Zustand zurück (blockiert nie)"""
+        with self._lock:
+            alter = time.monotonic() - self._zeitpunkt if self._zeitpunkt is not None else None
+            return InternetSnapshot(
+                connection=bool(self._connection),
+                rtt_ms=self._rtt_ms,
+                ziel=f"{self._ziel[0]}:{self._ziel[1]}" if self._ziel else None,
+                alter_s=alter,
+                veraltet=alter is None or alter > self.ttl,
+                fehlversuche=self._fehlversuche,
+            )
+
+    def next_delay(self):
+        """Wartezeit bis zur nächsten Prüfung (exponentieller Backoff bei Offline)"""
+        with self._lock:
+            if self._connection or self._fehlversuche == 0:
+                return self.interval
+            # Nie öfter als im Online-Takt prüfen: ab dem größeren der beiden Werte verdoppeln
+            start = max(self.interval, self.backoff_start)
+            return min(self.max_interval, start * 2 ** (self._fehlversuche - 1))
+
+    def _setzen(self, connection, rtt_ms, ziel):
+        with self._lock:
+            self._connection = connection
+            self._rtt_ms = rtt_ms
+            self._ziel = ziel
+            self._zeitpunkt = time.monotonic()
+            self._fehlversuche = 0 if connection else self._fehlversuche + 1
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.check_once()
+            self._wake.wait(self.next_delay())
+            self._wake.clear()
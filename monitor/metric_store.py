@@ -0,0 +1,180 @@
+import threading
+import time
+
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Vorab allokierter Ringpuffer für eine Zeitreihe (Werte + Zeitstempel).
+
+    Jeder Wert wird doppelt geschrieben (Position i und i + capacity). Dadurch
+    liegen die letzten n Werte immer zusammenhängend im Speicher und können
+    ohne Kopie als NumPy-View zurückgegeben werden. append() ist O(1).
+    """
+
+    def __init__(self, capacity, dtype=np.float64):
+        self.capacity = int(capacity)
+        self._werte = np.zeros(2 * self.capacity, dtype=dtype)
+        self._zeiten = np.zeros(2 * self.capacity, dtype=np.float64)
+        self._pos = 0       # nächste Schreibposition in [0, capacity)
+        self._anzahl = 0
+
+    def __len__(self):
+        return self._anzahl
+
+    def append(self, wert, zeit=None):
+        if zeit is None:
+            zeit = time.time()
+        i = self._pos
+        j = i + self.capacity
+        self._werte[i] = self._werte[j] = wert
+        self._zeiten[i] = self._zeiten[j] = zeit
+        self._pos = (i + 1) % self.capacity
+        if self._anzahl < self.capacity:
+            self._anzahl += 1
+
+    def extend(self, werte, zeiten):
+        """Hängt viele Werte auf einmal an (z. B. beim Laden einer Aufzeichnung)"""
+        werte = np.asarray(werte)[-self.capacity:]
+        zeiten = np.asarray(zeiten)[-self.capacity:]
+        n = len(werte)
+        if n == 0:
+            return
+        indizes = (self._pos + np.arange(n)) % self.capacity
+        self._werte[indizes] = self._werte[indizes + self.capacity] = werte
+        self._zeiten[indizes] = self._zeiten[indizes + self.capacity] = zeiten
+        self._pos = (self._pos + n) % self.capacity
+        self._anzahl = min(self.capacity, self._anzahl + n)
+
+    def clear(self):
+        self._pos = 0
+        self._anzahl = 0
+
+    def _slice(self, n):
+        n = self._anzahl if n is None else max(0, min(int(n), self._anzahl))
+        ende = self._pos + self.capacity
+        return slice(ende - n, ende)
+
+    def values(self, n=None):
+        """Die letzten n Werte (älteste zuerst) als schreibgeschützte View"""
+        return _readonly(self._werte[self._slice(n)])
+
+    def timestamps(self, n=None):
+        return _readonly(self._zeiten[self._slice(n)])
+
+    def last(self, default=0.0):
+        if not self._anzahl:
+            return default
+        return self._werte[self._pos + self.capacity - 1].item()
+
+    def window(self, sekunden, jetzt=None):
+        """Werte und Zeitstempel der letzten `sekunden` (Binärsuche über die Zeitstempel)"""
+        zeiten = self.timestamps()
+        if jetzt is None:
+            jetzt = zeiten[-1] if len(zeiten) else time.time()
+        start = np.searchsorted(zeiten, jetzt - sekunden, side="left")
+        return self.values()[start:], zeiten[start:]
+
+    def min(self, n=None, default=0.0):
+        werte = self.values(n)
+        return werte.min().item() if len(werte) else default
+
+    def max(self, n=None, default=0.0):
+        werte = self.values(n)
+        return werte.max().item() if len(werte) else default
+
+    def mean(self, n=None, default=0.0):
+        werte = self.values(n)
+        return werte.mean().item() if len(werte) else default
+
+
+def _readonly(view):
+    view.flags.writeable = False
+    return view
+
+
+class MetricStore:
+    """
+    Zentrale Ablage aller Zeitreihen, auf die mehrere Widgets zugreifen können.
+
+    Geschrieben wird aus dem GUI-Thread (bzw. dem Thread, der die Snapshots
+    verarbeitet); das Anlegen neuer Reihen ist zusätzlich mit einem Lock
+    geschützt.
+    """
+
+    def __init__(self, capacity=3600):
+        self.capacity = capacity
+        self._series = {}
+        self._letzte_zaehler = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, name):
+        return name in self._series
+
+    def names(self):
+        return list(self._series)
+
+    def series(self, name, capacity=None) -> RingBuffer:
+        """Gibt die Zeitreihe `name` zurück und legt sie bei Bedarf an"""
+        ring = self._series.get(name)
+        if ring is None:
+            with self._lock:
+                ring = self._series.get(name)
+                if ring is None:
+                    ring = RingBuffer(capacity or self.capacity)
+                    self._series[name] = ring
+        return ring
+
+    def remove(self, name):
+        """Entfernt die Zeitreihe `name` (z. B. für ein abgestecktes Gerät)"""
+        with self._lock:
+            self._series.pop(name, None)
+        self._letzte_zaehler.pop(name, None)
+
+    def clear(self):
+        """Leert alle Zeitreihen (z. B. beim Wechsel auf einen anderen Host)"""
+        for ring in list(self._series.values()):
+            ring.clear()
+        self._letzte_zaehler = {}
+
+    def append(self, name, wert, zeit=None):
+        self.series(name).append(wert, zeit)
+
+    def append_rate(self, name, zaehler, zeit):
+        """
+        Speichert die Änderungsrate eines kumulativen Zählers pro Sekunde.
+        Beim ersten Wert (oder wenn der Zähler zurückspringt) wird 0 gespeichert.
+        """
+        letzter = self._letzte_zaehler.get(name)
+        self._letzte_zaehler[name] = (zaehler, zeit)
+        rate = 0.0
+        if letzter is not None:
+            delta = zaehler - letzter[0]
+            dauer = zeit - letzter[1]
+            if delta > 0 and dauer > 0:
+                rate = delta / dauer
+        self.append(name, rate, zeit)
+
+    def extend(self, name, werte, zeiten):
+        self.series(name).extend(werte, zeiten)
+
+    def extend_rate(self, name, zaehler, zeiten):
+        """Wie append_rate, aber für ganze Arrays (Raten per np.diff)"""
+        zaehler = np.asarray(zaehler, dtype=np.float64)
+        zeiten = np.asarray(zeiten, dtype=np.float64)
+        if len(zaehler) == 0:
+            return
+        raten = np.zeros(len(zaehler))
+        delta = np.diff(zaehler)
+        dauer = np.diff(zeiten)
+        gueltig = (delta > 0) & (dauer > 0)
+        raten[1:][gueltig] = delta[gueltig] / dauer[gueltig]
+        self.extend(name, raten, zeiten)
+        self._letzte_zaehler[name] = (zaehler[-1].item(), zeiten[-1].item())
+
+    def values(self, name, n=None):
+        return self.series(name).values(n)
+
+    def window(self, name, sekunden, jetzt=None):
+        return self.series(name).window(sekunden, jetzt)
@@ -0,0 +1,215 @@
+import heapq
+import os
+import sys
+import time
+from operator import itemgetter
+
+import psutil
+
+from monitor.snapshots import ProzessEintrag
+
+# Mögliche Zusammenfassungen für top(); None = jeder Prozess (PID) einzeln
+GRUPPIERUNGEN = (None, "name", "user", "cgroup")
+
+# Unter Linux CPU-Zeit und Startzeit direkt aus /proc/<pid>/stat (eine Datei, ein read)
+_PROC_STAT = sys.platform.startswith("linux") and os.path.exists("/proc/self/stat")
+_CLK_TCK = os.sysconf("SC_CLK_TCK") if _PROC_STAT else 100
+
+
+def _stat_lesen(pid):
+    """(cpu_zeit_s, startzeit_ticks) aus /proc/<pid>/stat oder None, wenn der Prozess weg ist"""
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            daten = f.read()
+    except OSError:
+        return None
+    # Der Name (Feld 2) kann Leerzeichen und Klammern enthalten -> erst nach der letzten ')' zerlegen
+    felder = daten.rpartition(b")")[2].split()
+    try:
+        return (int(felder[11]) + int(felder[12])) / _CLK_TCK, int(felder[19])
+    except (IndexError, ValueError):
+        return None
+
+
+class _Eintrag:
+    __slots__ = ("proc", "name", "cpu_zeit", "start", "user", "cgroup")
+
+    def __init__(self, proc, name, cpu_zeit, start=None):
+        self.proc = proc
+        self.name = name
+        self.cpu_zeit = cpu_zeit
+        self.start = start  # Startzeit in Ticks aus /proc/<pid>/stat (nur Linux)
+        self.user = None    # erst bei Gruppierung nach Benutzer gelesen
+        self.cgroup = None  # erst bei Gruppierung nach cgroup gelesen
+
+
+class ProcessCache:
+    """
+    Hält psutil.Process-Objekte über mehrere Ticks hinweg.
+
+    Schlüssel ist (pid, create_time), damit wiederverwendete PIDs nicht mit
+    dem alten Prozess verwechselt werden. Die CPU-Auslastung ergibt sich aus
+    der Differenz der cpu_times() zum vorherigen Tick – ohne sleep. Der Name
+    wird nur für neue Prozesse gelesen, die Kosten eines Ticks hängen also
+    vor allem von der Prozess-Fluktuation ab. Unter Linux kommen CPU-Zeit und
+    Startzeit aus demselben Lesen von /proc/<pid>/stat, so fällt eine
+    wiederverwendete PID sofort auf; sonst wird create_time nur geprüft, wenn
+    die CPU-Zeit nicht gestiegen ist.
+
+    top() wählt die n aktivsten Zeilen mit heapq.nlargest statt alle zu
+    sortieren; Speicher (RSS) und Threads liest es nur für diese Zeilen.
+    """
+
+    def __init__(self):
+        self._eintraege = {}   # (pid, create_time) -> _Eintrag
+        self._pid_index = {}   # pid -> (pid, create_time)
+        self._last_zeit = None
+
+    def __len__(self):
+        return len(self._eintraege)
+
+    def update(self):
+        """Liest alle Prozesse einmal und gibt [(pid, name, cpu_prozent), ...] zurück"""
+        jetzt = time.monotonic()
+        intervall = jetzt - self._last_zeit if self._last_zeit is not None else None
+        self._last_zeit = jetzt
+
+        pids = psutil.pids()
+        aktiv = set(pids)
+
+        # Beendete Prozesse entfernen
+        for pid in [pid for pid in self._pid_index if pid not in aktiv]:
+            self._entfernen(pid)
+
+        ergebnis = []
+        for pid in pids:
+            schluessel = self._pid_index.get(pid)
+            if schluessel is None:
+                self._neu(pid)
+                continue
+
+            eintrag = self._eintraege[schluessel]
+            if eintrag.start is not None:
+                werte = _stat_lesen(pid)
+                if werte is None:
+                    self._entfernen(pid)
+                    continue
+                cpu_zeit, start = werte
+                wiederverwendet = start != eintrag.start
+            else:
+                try:
+                    with eintrag.proc.oneshot():
+                        times = eintrag.proc.cpu_times()
+                except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                    self._entfernen(pid)
+                    continue
+                except psutil.AccessDenied:
+                    continue
+                cpu_zeit = times.user + times.system
+                # Ein neuer Prozess unter derselben PID hat meist weniger oder gleich viel
+                # CPU-Zeit; nur dann create_time neu vergleichen (is_running() tut genau das)
+                wiederverwendet = cpu_zeit <= eintrag.cpu_zeit and not eintrag.proc.is_running()
+
+            if wiederverwendet:
+                self._entfernen(pid)
+                self._neu(pid)
+                continue
+
+            delta = cpu_zeit - eintrag.cpu_zeit
+            eintrag.cpu_zeit = cpu_zeit
+            if intervall and delta > 0:
+                ergebnis.append((pid, eintrag.name, delta / intervall * 100))
+
+        return ergebnis
+
+    def _neu(self, pid):
+        try:
+            proc = psutil.Process(pid)
+            with proc.oneshot():
+                name = proc.name() or "unbekannt"
+                times = proc.cpu_times()
+                schluessel = (pid, proc.create_time())
+        except (psutil.NoSuchProcess, psutil.ZombieProcess, psutil.AccessDenied):
+            return
+        cpu_zeit = times.user + times.system
+        start = None
+        if _PROC_STAT:
+            werte = _stat_lesen(pid)
+            if werte is None:
+                return
+            cpu_zeit, start = werte
+        self._eintraege[schluessel] = _Eintrag(proc, name, cpu_zeit, start)
+        self._pid_index[pid] = schluessel
+
+    def _entfernen(self, pid):
+        schluessel = self._pid_index.pop(pid, None)
+        if schluessel is not None:
+            self._eintraege.pop(schluessel, None)
+
+    def top(self, n=10, gruppierung=None):
+        """
+        Aktualisiert alle Prozesse und gibt die n aktivsten als [ProzessEintrag, ...]
+        absteigend nach CPU zurück. Mit gruppierung="name", "user" oder "cgroup"
+        werden CPU, Speicher und Threads der in diesem Tick aktiven Prozesse summiert.
+        """
+        if gruppierung not in GRUPPIERUNGEN:
+            raise ValueError(f"Unbekannte Gruppierung: {gruppierung}")
+        messung = self.update()
+
+        if gruppierung is None:
+            return [ProzessEintrag(name, cpu, pid, *self._details([pid]))
+                    for pid, name, cpu in heapq.nlargest(n, messung, key=itemgetter(2))]
+
+        gruppen = {}  # Schlüssel -> [cpu, [pid, ...]]
+        for pid, name, cpu in messung:
+            schluessel = name if gruppierung == "name" else self._gruppe(pid, gruppierung)
+            gruppe = gruppen.get(schluessel)
+            if gruppe is None:
+                gruppen[schluessel] = [cpu, [pid]]
+            else:
+                gruppe[0] += cpu
+                gruppe[1].append(pid)
+
+        beste = heapq.nlargest(n, gruppen.items(), key=lambda item: item[1][0])
+        return [ProzessEintrag(schluessel, cpu, None, *self._details(pids), anzahl=len(pids))
+                for schluessel, (cpu, pids) in beste]
+
+    def _gruppe(self, pid, gruppierung):
+        eintrag = self._eintraege[self._pid_index[pid]]
+        if gruppierung == "user":
+            if eintrag.user is None:
+                try:
+                    eintrag.user = eintrag.proc.username()
+                except (psutil.Error, KeyError):
+                    eintrag.user = "unbekannt"
+            return eintrag.user
+        if eintrag.cgroup is None:
+            eintrag.cgroup = _cgroup(pid)
+        return eintrag.cgroup
+
+    def _details(self, pids):
+        """(rss_bytes, threads) summiert über pids; beendete Prozesse zählen nicht mit"""
+        rss = 0
+        threads = 0
+        for pid in pids:
+            proc = self._eintraege[self._pid_index[pid]].proc
+            try:
+                with proc.oneshot():
+                    rss += proc.memory_info().rss
+                    threads += proc.num_threads()
+            except psutil.Error:
+                continue
+        return rss, threads
+
+
+def _cgroup(pid):
+    """cgroup-Pfad eines Prozesses (cgroup v2, sonst der erste Eintrag); ohne cgroups "-" """
+    try:
+        with open(f"/proc/{pid}/cgroup", "rb") as f:
+            zeilen = f.read().decode(errors="replace").splitlines()
+    except OSError:
+        return "-"
+    for zeile in zeilen:
+        if zeile.startswith("0::"):
+            return zeile[3:] or "/"
+    return zeilen[0].split(":", 2)[-1] if zeilen else "-"
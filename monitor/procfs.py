@@ -0,0 +1,308 @@
+"""
+Schneller Linux-Pfad für die Zähler, die jeden Tick gelesen werden.
+
+psutil öffnet, liest, parst und schließt für jeden Aufruf eine oder mehrere
+Dateien unter /proc. ProcFs hält /proc/stat, /proc/meminfo, /proc/net/dev
+und /proc/diskstats dauerhaft offen, liest sie nach seek(0) in einen
+wiederverwendeten Puffer und parst nur die benötigten Felder.
+
+Die Werte entsprechen denen von psutil (gleiche Felder, gleiche Einheiten).
+Mit proc_root/sys_root lässt sich ein nachgebautes /proc-Verzeichnis
+verwenden, z. B. für Tests:
+
+    procfs = ProcFs(proc_root="/tmp/fake/proc", sys_root="/tmp/fake/sys")
+    procfs.cpu_times()
+"""
+import functools
+import glob
+import os
+import sys
+from typing import NamedTuple
+
+SEKTOR_BYTES = 512  # /proc/diskstats zählt immer in 512-Byte-Sektoren
+
+
+class CpuTimes(NamedTuple):
+    """Wie psutil.cpu_times() unter Linux, in Sekunden"""
+    user: float
+    nice: float
+    system: float
+    idle: float
+    iowait: float
+    irq: float
+    softirq: float
+    steal: float
+    guest: float
+    guest_nice: float
+
+
+class MemInfo(NamedTuple):
+    total: int
+    available: int
+    used: int
+    free: int
+    percent: float
+
+
+class NetIO(NamedTuple):
+    bytes_sent: int
+    bytes_recv: int
+
+
+class DiskIO(NamedTuple):
+    read_count: int
+    write_count: int
+    read_bytes: int
+    write_bytes: int
+
+
+class DiskCounters(NamedTuple):
+    """Zähler eines Laufwerks wie psutil.disk_io_counters(perdisk=True); Zeiten in ms"""
+    read_count: int
+    write_count: int
+    read_bytes: int
+    write_bytes: int
+    read_time: int
+    write_time: int
+    busy_time: int
+
+
+class NicCounters(NamedTuple):
+    """Zähler einer Netzwerkkarte wie psutil.net_io_counters(pernic=True)"""
+    bytes_sent: int
+    bytes_recv: int
+    packets_sent: int
+    packets_recv: int
+    errin: int
+    errout: int
+    dropin: int
+    dropout: int
+
+
+class ProcFile:
+    """Dauerhaft geöffnete Datei, die bei jedem read() neu vom Anfang gelesen wird"""
+
+    def __init__(self, path, size=4096):
+        self.path = path
+        self._file = open(path, "rb", buffering=0)
+        self._puffer = bytearray(size)
+
+    def read(self):
+        """Aktueller Inhalt als bytes"""
+        f = self._file
+        f.seek(0)
+        gelesen = 0
+        while True:
+            if gelesen == len(self._puffer):
+                # Datei größer als gedacht -> Puffer verdoppeln und behalten
+                self._puffer.extend(bytes(len(self._puffer)))
+            with memoryview(self._puffer) as ansicht:
+                n = f.readinto(ansicht[gelesen:])
+            if not n:
+                break
+            gelesen += n
+        with memoryview(self._puffer) as ansicht:
+            return bytes(ansicht[:gelesen])
+
+    def close(self):
+        self._file.close()
+
+
+@functools.lru_cache(maxsize=256)
+def ist_partition(name, sys_root="/sys"):
+    """
+    True für Partitionen: unter Linux stehen nur ganze Laufwerke (auch loop/zram)
+    unter /sys/block. Ohne /sys/block (andere Systeme) gilt nichts als Partition.
+    """
+    block = os.path.join(sys_root, "block")
+    return os.path.isdir(block) and not os.path.exists(os.path.join(block, name.replace("/", "!")))
+
+
+class ProcFs:
+    """Liest CPU-Zeiten, Speicher, Netzwerk- und Festplattenzähler direkt aus /proc und /sys"""
+
+    def __init__(self, proc_root="/proc", sys_root="/sys"):
+        self.proc_root = proc_root
+        self.sys_root = sys_root
+        self._tick = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+        self._dateien = []
+        try:
+            self._stat = self._open("stat")
+            self._meminfo = self._open("meminfo")
+            self._net_dev = self._open("net/dev")
+            self._diskstats = self._open("diskstats")
+        except OSError:
+            self.close()
+            raise
+        self._ist_geraet = {}  # Gerätename -> True, wenn ganzes Laufwerk (keine Partition)
+        self._takt_dateien = None  # erst beim ersten cpu_freq_mhz() suchen
+        self._cpuinfo_datei = None
+
+    def _open(self, name):
+        datei = ProcFile(os.path.join(self.proc_root, name))
+        self._dateien.append(datei)
+        return datei
+
+    def close(self):
+        for datei in self._dateien:
+            datei.close()
+        self._dateien = []
+
+    def cpu_times(self):
+        """Liste von CpuTimes pro Kern (wie psutil.cpu_times(percpu=True))"""
+        daten = self._stat.read()
+        # Die cpu-Zeilen stehen am Anfang; die lange intr-Zeile danach wird gar nicht erst zerlegt
+        ende = daten.find(b"\nintr")
+        if ende != -1:
+            daten = daten[:ende]
+        tick = self._tick
+        ergebnis = []
+        for zeile in daten.split(b"\n"):
+            if not zeile.startswith(b"cpu") or zeile.startswith(b"cpu "):
+                continue
+            werte = [int(v) / tick for v in zeile.split()[1:11]]
+            # Ältere Kernel kennen steal/guest/guest_nice noch nicht
+            werte.extend([0.0] * (10 - len(werte)))
+            ergebnis.append(CpuTimes(*werte))
+        return ergebnis
+
+    def memory(self):
+        """Arbeitsspeicher mit denselben Formeln wie psutil.virtual_memory()"""
+        daten = self._meminfo.read()
+        # Gezielt nach den wenigen Schlüsseln suchen statt alle ~50 Zeilen zu zerlegen
+        werte = {}
+        for name in (b"MemTotal", b"MemFree", b"MemAvailable", b"Buffers", b"Cached", b"SReclaimable"):
+            wert = _meminfo_feld(daten, name)
+            if wert is not None:
+                werte[name] = wert
+
+        total = werte[b"MemTotal"]
+        free = werte[b"MemFree"]
+        available = werte.get(b"MemAvailable", 0)
+        if not available:
+            # Kernel vor 3.14 (oder Kernel-Fehler): wie `free` schätzen
+            available = free + werte.get(b"Buffers", 0) + werte.get(b"Cached", 0) + werte.get(b"SReclaimable", 0)
+        if available > total:
+            available = free  # typisch für Container mit verzerrten Werten
+        prozent = round((total - available) / total * 100, 1) if total else 0.0
+        return MemInfo(total=total, available=available, used=total - available, free=free, percent=prozent)
+
+    def net_io(self):
+        """Summe über alle Interfaces (wie psutil.net_io_counters())"""
+        gesendet = 0
+        empfangen = 0
+        # Die ersten beiden Zeilen sind Überschriften
+        for zeile in self._net_dev.read().split(b"\n")[2:]:
+            doppelpunkt = zeile.rfind(b":")
+            if doppelpunkt == -1:
+                continue
+            felder = zeile[doppelpunkt + 1:].split()
+            empfangen += int(felder[0])
+            gesendet += int(felder[8])
+        return NetIO(bytes_sent=gesendet, bytes_recv=empfangen)
+
+    def net_io_pernic(self):
+        """{interface: NicCounters}"""
+        ergebnis = {}
+        for zeile in self._net_dev.read().split(b"\n")[2:]:
+            doppelpunkt = zeile.rfind(b":")
+            if doppelpunkt == -1:
+                continue
+            f = zeile[doppelpunkt + 1:].split()
+            ergebnis[zeile[:doppelpunkt].strip().decode()] = NicCounters(
+                bytes_sent=int(f[8]), bytes_recv=int(f[0]), packets_sent=int(f[9]), packets_recv=int(f[1]),
+                errin=int(f[2]), errout=int(f[10]), dropin=int(f[3]), dropout=int(f[11]))
+        return ergebnis
+
+    def disk_io_perdisk(self):
+        """{laufwerk: DiskCounters} für ganze Laufwerke; Partitionen würden doppelt zählen"""
+        ergebnis = {}
+        for zeile in self._diskstats.read().split(b"\n"):
+            f = zeile.split()
+            if len(f) < 14 or not self._laufwerk(f[2]):
+                continue
+            ergebnis[f[2].decode()] = DiskCounters(
+                read_count=int(f[3]), write_count=int(f[7]),
+                read_bytes=int(f[5]) * SEKTOR_BYTES, write_bytes=int(f[9]) * SEKTOR_BYTES,
+                read_time=int(f[6]), write_time=int(f[10]), busy_time=int(f[12]))
+        return ergebnis
+
+    def disk_io(self):
+        """Summe über alle ganzen Laufwerke ohne Partitionen (wie psutil.disk_io_counters())"""
+        lesen = schreiben = gelesen = geschrieben = 0
+        for zeile in self._diskstats.read().split(b"\n"):
+            felder = zeile.split()
+            if len(felder) < 14:
+                continue
+            if not self._laufwerk(felder[2]):
+                continue
+            lesen += int(felder[3])
+            gelesen += int(felder[5])
+            schreiben += int(felder[7])
+            geschrieben += int(felder[9])
+        return DiskIO(read_count=lesen, write_count=schreiben,
+                      read_bytes=gelesen * SEKTOR_BYTES, write_bytes=geschrieben * SEKTOR_BYTES)
+
+    def _laufwerk(self, name):
+        # Das Ergebnis ändert sich für einen Namen nicht -> nur neue Namen prüfen (Schlüssel bleibt bytes)
+        ist_geraet = self._ist_geraet.get(name)
+        if ist_geraet is None:
+            ist_geraet = self._ist_geraet[name] = not ist_partition(name.decode(), self.sys_root)
+        return ist_geraet
+
+    def cpu_freq_mhz(self):
+        """Mittlerer aktueller Takt aller Kerne in MHz oder None"""
+        if self._takt_dateien is None:
+            self._takt_dateien = self._open_takt_dateien()
+        if self._takt_dateien:
+            werte = [int(datei.read()) / 1000 for datei in self._takt_dateien]  # kHz
+        else:
+            cpuinfo = self._cpuinfo()
+            if cpuinfo is None:
+                return None
+            werte = [float(zeile.partition(b":")[2])
+                     for zeile in cpuinfo.read().split(b"\n") if zeile.startswith(b"cpu MHz")]
+        return sum(werte) / len(werte) if werte else None
+
+    def _open_takt_dateien(self):
+        basis = os.path.join(self.sys_root, "devices", "system", "cpu")
+        pfade = (glob.glob(os.path.join(basis, "cpufreq", "policy[0-9]*", "scaling_cur_freq"))
+                 or glob.glob(os.path.join(basis, "cpu[0-9]*", "cpufreq", "scaling_cur_freq")))
+        dateien = []
+        for pfad in sorted(pfade):
+            try:
+                dateien.append(ProcFile(pfad, size=64))
+            except OSError:
+                continue
+        self._dateien.extend(dateien)
+        return dateien
+
+    def _cpuinfo(self):
+        # Nur ohne cpufreq nötig (z. B. in VMs); die Datei ist groß, daher erst bei Bedarf öffnen
+        if self._cpuinfo_datei is None:
+            try:
+                self._cpuinfo_datei = self._open("cpuinfo")
+            except OSError:
+                self._cpuinfo_datei = False  # nicht erneut versuchen
+        return self._cpuinfo_datei or None
+
+
+def _meminfo_feld(daten, name):
+    """Wert der Zeile `name:   123 kB` in Bytes oder None"""
+    schluessel = name + b":"
+    if daten.startswith(schluessel):
+        start = 0
+    else:
+        # Mit Zeilenumbruch suchen, damit z. B. "Cached:" nicht in "SwapCached:" gefunden wird
+        start = daten.find(b"\n" + schluessel)
+        if start == -1:
+            return None
+        start += 1
+    start += len(schluessel)
+    ende = daten.find(b"\n", start)
+    return int(daten[start:ende if ende != -1 else None].split()[0]) * 1024
+
+
+def available(proc_root="/proc"):
+    """True, wenn der procfs-Pfad auf diesem System nutzbar ist"""
+    return sys.platform.startswith("linux") and os.path.exists(os.path.join(proc_root, "stat"))
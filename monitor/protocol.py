@@ -0,0 +1,238 @@
+"""
+Kompaktes Binärprotokoll zwischen Agent (agent.py) und Dashboard.
+
+Ein Frame besteht aus einem 12-Byte-Header und einem kodierten Wert:
+
+    magic "SM" | version (1) | typ (1) | seq (4) | länge (4) | nutzdaten
+
+Die Nutzdaten sind der Snapshot in der Form von to_plain() (dicts, Listen,
+Zahlen, Strings), binär kodiert mit einem Typ-Byte pro Wert und Varints für
+ganze Zahlen. DELTA-Frames beschreiben nur die Änderung gegenüber dem
+zuletzt auf derselben Verbindung gesendeten Frame: unveränderte Schlüssel
+fehlen, ganze Zahlen (Zähler) werden als Differenz übertragen. Weil der
+Agent pro Verbindung gegen den zuletzt *gesendeten* Stand kodiert, dürfen
+Zwischenstände ausgelassen werden, ohne dass der Empfänger aus dem Tritt
+kommt.
+
+    frame = encode_frame(DELTA, seq, neu, basis=alt)
+    typ, seq, laenge = parse_header(kopf)
+    neu = decode_payload(typ, nutzdaten, basis=alt)
+"""
+import struct
+
+MAGIC = b"SM"
+VERSION = 1
+HEADER = struct.Struct("!2sBBII")
+MAX_PAYLOAD = 16 * 1024 * 1024
+
+# Frame-Typen
+HALLO = 0   # erster Frame einer Verbindung: {"host": ..., "interval": ...}
+VOLL = 1    # vollständiger Snapshot
+DELTA = 2   # Änderung gegenüber dem vorherigen Frame dieser Verbindung
+
+# Typ-Bytes der Werte
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _LIST, _DICT, _FLOAT32 = range(9)
+_DICT_DELTA, _INT_DELTA = 0x10, 0x11
+
+_FLOAT_STRUCT = struct.Struct("!d")
+_FLOAT32_STRUCT = struct.Struct("!f")
+_FEHLT = object()
+
+
+class ProtocolError(ValueError):
+    """Ungültiger oder unerwarteter Frame"""
+
+
+def _varint(out, n):
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _zigzag(out, n):
+    _varint(out, (n << 1) if n >= 0 else ((-n << 1) - 1))
+
+
+def _str(out, text):
+    daten = text.encode("utf-8")
+    _varint(out, len(daten))
+    out += daten
+
+
+def encode_value(value, out):
+    """Hängt `value` kodiert an das bytearray `out` an"""
+    if value is None:
+        out.append(_NONE)
+    elif value is True:
+        out.append(_TRUE)
+    elif value is False:
+        out.append(_FALSE)
+    elif type(value) is int:
+        out.append(_INT)
+        _zigzag(out, value)
+    elif type(value) is float:
+        try:
+            kurz = _FLOAT32_STRUCT.pack(value)
+        except OverflowError:
+            kurz = None
+        # Ganze Prozente, 0.0-Raten usw. passen verlustfrei in 4 Bytes
+        if kurz is not None and _FLOAT32_STRUCT.unpack(kurz)[0] == value:
+            out.append(_FLOAT32)
+            out += kurz
+        else:
+            out.append(_FLOAT)
+            out += _FLOAT_STRUCT.pack(value)
+    elif type(value) is str:
+        out.append(_STR)
+        _str(out, value)
+    elif isinstance(value, (list, tuple)):
+        out.append(_LIST)
+        _varint(out, len(value))
+        for v in value:
+            encode_value(v, out)
+    elif isinstance(value, dict):
+        out.append(_DICT)
+        _varint(out, len(value))
+        for k, v in value.items():
+            _str(out, k)
+            encode_value(v, out)
+    else:
+        raise TypeError(f"Nicht kodierbar: {type(value).__name__}")
+
+
+def encode_delta(alt, neu, out):
+    """Kodiert `neu` als Änderung gegenüber `alt` (beides Werte im to_plain()-Format)"""
+    if type(alt) is dict and type(neu) is dict:
+        geaendert = [k for k, v in neu.items() if k not in alt or alt[k] != v]
+        entfernt = [k for k in alt if k not in neu]
+        out.append(_DICT_DELTA)
+        _varint(out, len(geaendert))
+        for k in geaendert:
+            _str(out, k)
+            if k in alt:
+                encode_delta(alt[k], neu[k], out)
+            else:
+                encode_value(neu[k], out)
+        _varint(out, len(entfernt))
+        for k in entfernt:
+            _str(out, k)
+    elif type(alt) is int and type(neu) is int:
+        out.append(_INT_DELTA)
+        _zigzag(out, neu - alt)
+    else:
+        encode_value(neu, out)
+
+
+def _read_varint(buf, pos):
+    n = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        n |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return n, pos
+        shift += 7
+
+
+def _read_zigzag(buf, pos):
+    n, pos = _read_varint(buf, pos)
+    return (n >> 1) ^ -(n & 1), pos
+
+
+def _read_str(buf, pos):
+    laenge, pos = _read_varint(buf, pos)
+    return bytes(buf[pos:pos + laenge]).decode("utf-8"), pos + laenge
+
+
+def decode_value(buf, pos=0, alt=_FEHLT):
+    """Liest einen Wert ab `pos`; Delta-Werte werden auf `alt` angewendet. Gibt (wert, pos) zurück."""
+    tag = buf[pos]
+    pos += 1
+    if tag == _NONE:
+        return None, pos
+    if tag == _TRUE:
+        return True, pos
+    if tag == _FALSE:
+        return False, pos
+    if tag == _INT:
+        return _read_zigzag(buf, pos)
+    if tag == _FLOAT:
+        return _FLOAT_STRUCT.unpack_from(buf, pos)[0], pos + 8
+    if tag == _FLOAT32:
+        return _FLOAT32_STRUCT.unpack_from(buf, pos)[0], pos + 4
+    if tag == _STR:
+        return _read_str(buf, pos)
+    if tag == _LIST:
+        n, pos = _read_varint(buf, pos)
+        liste = []
+        for _ in range(n):
+            wert, pos = decode_value(buf, pos)
+            liste.append(wert)
+        return liste, pos
+    if tag == _DICT:
+        n, pos = _read_varint(buf, pos)
+        d = {}
+        for _ in range(n):
+            k, pos = _read_str(buf, pos)
+            d[k], pos = decode_value(buf, pos)
+        return d, pos
+    if tag == _DICT_DELTA:
+        if type(alt) is not dict:
+            raise ProtocolError("Dict-Delta ohne Basis")
+        d = dict(alt)
+        n, pos = _read_varint(buf, pos)
+        for _ in range(n):
+            k, pos = _read_str(buf, pos)
+            d[k], pos = decode_value(buf, pos, alt.get(k, _FEHLT))
+        n, pos = _read_varint(buf, pos)
+        for _ in range(n):
+            k, pos = _read_str(buf, pos)
+            d.pop(k, None)
+        return d, pos
+    if tag == _INT_DELTA:
+        if type(alt) is not int:
+            raise ProtocolError("Zahl-Delta ohne Basis")
+        delta, pos = _read_zigzag(buf, pos)
+        return alt + delta, pos
+    raise ProtocolError(f"Unbekannter Typ {tag:#x}")
+
+
+def encode_frame(typ, seq, value, basis=None):
+    """Baut einen kompletten Frame; bei typ=DELTA wird gegen `basis` kodiert"""
+    out = bytearray(HEADER.size)
+    if typ == DELTA:
+        encode_delta(basis, value, out)
+    else:
+        encode_value(value, out)
+    HEADER.pack_into(out, 0, MAGIC, VERSION, typ, seq & 0xFFFFFFFF, len(out) - HEADER.size)
+    return bytes(out)
+
+
+def parse_header(kopf):
+    """Gibt (typ, seq, länge der Nutzdaten) zurück"""
+    magic, version, typ, seq, laenge = HEADER.unpack(kopf)
+    if magic != MAGIC:
+        raise ProtocolError("Kein Frame des System Monitors")
+    if version != VERSION:
+        raise ProtocolError(f"Protokollversion {version} nicht unterstützt")
+    if typ not in (HALLO, VOLL, DELTA):
+        raise ProtocolError(f"Unbekannter Frame-Typ {typ}")
+    if laenge > MAX_PAYLOAD:
+        raise ProtocolError(f"Frame zu groß ({laenge} Bytes)")
+    return typ, seq, laenge
+
+
+def decode_payload(typ, nutzdaten, basis=None):
+    """Dekodiert die Nutzdaten eines Frames; DELTA braucht den vorherigen Stand als basis"""
+    if typ == DELTA and basis is None:
+        raise ProtocolError("Delta-Frame ohne vorherigen Snapshot")
+    try:
+        wert, pos = decode_value(nutzdaten, 0, basis if typ == DELTA else _FEHLT)
+    except (IndexError, struct.error, UnicodeDecodeError, TypeError, RecursionError) as e:
+        # TypeError z. B. bei einem Delta auf einen Wert anderen Typs, RecursionError bei absurd tiefer Verschachtelung
+        raise ProtocolError(f"Beschädigter Frame: {type(e).__name__}: {e}") from e
+    if pos != len(nutzdaten):
+        raise ProtocolError("Überzählige Bytes im Frame")
+    return wert
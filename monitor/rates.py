@@ -0,0 +1,144 @@
+"""
+Raten pro Gerät (Festplatten, Netzwerkkarten) aus kumulativen Zählern.
+
+Die Raten werden gegen die tatsächlich vergangene Zeit (time.monotonic)
+gebildet, nicht gegen ein angenommenes Intervall – ein verspäteter Tick
+ergibt also keinen Ausschlag. Läuft einer der als 32 Bit bekannten Zähler
+über (die Millisekunden-Felder in /proc/diskstats), wird der Überlauf
+herausgerechnet; springt ein Zähler sonst zurück (Treiber neu geladen,
+Gerät neu angelegt), beginnt die Messung für dieses Gerät neu.
+
+    disks = DiskRates()
+    raten = disks.update(psutil.disk_io_counters(perdisk=True))  # {name: DiskRateSnapshot}
+"""
+import time
+
+from monitor.snapshots import DiskRateSnapshot, NicRateSnapshot
+
+WRAP_32 = 2 ** 32
+
+
+def counter_delta(neu, alt, bits=64):
+    """
+    Differenz zweier Zählerstände; None, wenn der Zähler zurückgesetzt wurde.
+    Nur bei bits=32 gilt ein Rücksprung als Überlauf – bei 64-Bit-Zählern
+    wäre ein Reset aus 2-4 GiB sonst ein falscher Ausschlag.
+    """
+    if neu >= alt:
+        return neu - alt
+    if bits == 32 and WRAP_32 // 2 <= alt < WRAP_32:
+        # Ein 32-Bit-Zähler in der oberen Hälfte ist übergelaufen
+        return neu + WRAP_32 - alt
+    return None
+
+
+class RateEngine:
+    """
+    Merkt sich pro Gerät den letzten Zählerstand und liefert bei jedem
+    update() die Deltas der angegebenen Felder samt vergangener Zeit.
+    Geräte, deren Zähler alle 0 sind (nie benutzt), werden ausgelassen.
+    """
+
+    def __init__(self, felder, clock=time.monotonic, felder_32bit=()):
+        self.felder = felder
+        self.clock = clock
+        self._bits = tuple(32 if feld in felder_32bit else 64 for feld in felder)
+        self.resets = 0  # erkannte Zähler-Resets seit dem Start
+        self._letzte = {}  # Gerät -> (zeit, werte)
+
+    def update(self, zaehler, jetzt=None):
+        """zaehler: {gerät: Objekt mit den Feldern}; gibt {gerät: (dauer_s, {feld: delta})} zurück"""
+        jetzt = self.clock() if jetzt is None else jetzt
+        ergebnis = {}
+        neu_letzte = {}
+        for geraet, werte in zaehler.items():
+            # Felder, die die Plattform nicht kennt (z. B. busy_time außerhalb Linux), bleiben None
+            werte = tuple(getattr(werte, feld, None) for feld in self.felder)
+            if not any(werte):
+                continue
+            neu_letzte[geraet] = (jetzt, werte)
+
+            vorher = self._letzte.get(geraet)
+            if vorher is None:
+                continue
+            dauer = jetzt - vorher[0]
+            if dauer <= 0:
+                # Zweimal im selben Moment gefragt -> alten Stand behalten
+                neu_letzte[geraet] = vorher
+                continue
+
+            deltas = self._deltas(werte, vorher[1])
+            if deltas is None:
+                self.resets += 1  # ab diesem Stand neu messen
+                continue
+            ergebnis[geraet] = (dauer, deltas)
+        # Verschwundene Geräte fallen hier heraus
+        self._letzte = neu_letzte
+        return ergebnis
+
+    def _deltas(self, neu, alt):
+        deltas = {}
+        for feld, bits, n, a in zip(self.felder, self._bits, neu, alt):
+            if n is None or a is None:
+                deltas[feld] = None
+                continue
+            delta = counter_delta(n, a, bits)
+            if delta is None:
+                return None
+            deltas[feld] = delta
+        return deltas
+
+
+class DiskRates:
+    """Bytes/s, Ops/s, Auslastung und mittlere Wartezeit pro Laufwerk"""
+
+    felder = ("read_bytes", "write_bytes", "read_count", "write_count", "read_time", "write_time", "busy_time")
+    # Der Kernel gibt die Zeiten in /proc/diskstats als unsigned int (ms) aus -> Überlauf nach ~49 Tagen
+    felder_32bit = ("read_time", "write_time", "busy_time")
+
+    def __init__(self, clock=time.monotonic):
+        self.engine = RateEngine(self.felder, clock, self.felder_32bit)
+
+    def update(self, zaehler, jetzt=None):
+        raten = {}
+        for geraet, (dauer, d) in self.engine.update(zaehler, jetzt).items():
+            ops = d["read_count"] + d["write_count"]
+            if d["read_time"] is None or d["write_time"] is None:
+                wartezeit = None
+            else:
+                # Zeiten in ms, summiert über alle abgeschlossenen Anfragen
+                wartezeit = (d["read_time"] + d["write_time"]) / ops if ops else 0.0
+            auslastung = None
+            if d["busy_time"] is not None:
+                auslastung = min(100.0, d["busy_time"] / (dauer * 1000) * 100)
+            raten[geraet] = DiskRateSnapshot(
+                read_bytes_s=d["read_bytes"] / dauer,
+                write_bytes_s=d["write_bytes"] / dauer,
+                read_ops_s=d["read_count"] / dauer,
+                write_ops_s=d["write_count"] / dauer,
+                auslastung_prozent=auslastung,
+                wartezeit_ms=wartezeit,
+            )
+        return raten
+
+
+class NicRates:
+    """Bytes/s, Pakete/s sowie Fehler und verworfene Pakete pro Sekunde je Netzwerkkarte"""
+
+    felder = ("bytes_sent", "bytes_recv", "packets_sent", "packets_recv", "errin", "errout", "dropin", "dropout")
+
+    def __init__(self, clock=time.monotonic):
+        self.engine = RateEngine(self.felder, clock)
+
+    def update(self, zaehler, jetzt=None):
+        raten = {}
+        for geraet, (dauer, d) in self.engine.update(zaehler, jetzt).items():
+            raten[geraet] = NicRateSnapshot(
+                gesendet_bytes_s=d["bytes_sent"] / dauer,
+                empfangen_bytes_s=d["bytes_recv"] / dauer,
+                gesendet_pakete_s=d["packets_sent"] / dauer,
+                empfangen_pakete_s=d["packets_recv"] / dauer,
+                fehler_s=((d["errin"] or 0) + (d["errout"] or 0)) / dauer,
+                verworfen_s=((d["dropin"] or 0) + (d["dropout"] or 0)) / dauer,
+            )
+        return raten
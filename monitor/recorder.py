@@ -0,0 +1,225 @@
+"""
+Dauerhafte Aufzeichnung der Snapshots in Segment-Dateien mit fester Satzgröße.
+
+Jede Datei beginnt mit einem kurzen Header, danach folgen die Datensätze
+(RECORD_DTYPE) direkt hintereinander. Gelesen wird per np.memmap – die
+Abfragen liefern also Views auf die Datei, ohne die Daten in den RAM zu
+kopieren. Da die Zeitstempel innerhalb eines Segments aufsteigend sind, findet
+read_range() den gesuchten Bereich per Binärsuche (O(log n)).
+
+Dateiname: <verzeichnis>/segment-<erster zeitstempel in ms>.sysrec
+"""
+import bisect
+import os
+import threading
+import time
+
+import numpy as np
+
+MAGIC = b"SYSMREC1"
+HEADER_SIZE = 16  # MAGIC (8) + Satzgröße (4) + reserviert (4)
+SUFFIX = ".sysrec"
+
+RECORD_DTYPE = np.dtype([
+    ("zeitpunkt", "<f8"),
+    ("cpu_auslastung", "<f4"),
+    ("cpu_user", "<f4"),
+    ("cpu_system", "<f4"),
+    ("cpu_iowait", "<f4"),
+    ("ram_auslastung", "<f4"),
+    ("ram_genutzt", "<u8"),
+    ("netzwerk_gesendet", "<u8"),
+    ("netzwerk_empfangen", "<u8"),
+    ("io_read", "<u8"),
+    ("io_write", "<u8"),
+    ("disk_prozent", "<f4"),
+    ("akku_prozent", "<f4"),     # NaN ohne Akku
+    ("internet_rtt_ms", "<f4"),  # NaN, wenn offline oder noch nicht geprüft
+])
+
+
+def snapshot_to_record(snapshot, out=None):
+    """Füllt einen Datensatz (Array der Länge 1) aus einem SystemSnapshot"""
+    if out is None:
+        out = np.zeros(1, dtype=RECORD_DTYPE)
+    r = out[0]
+    nan = float("nan")
+    r["zeitpunkt"] = snapshot.zeitpunkt
+
+    cpu = snapshot.cpu
+    r["cpu_auslastung"] = cpu.auslastung_prozent if cpu else nan
+    r["cpu_user"] = cpu.modi.user if cpu else nan
+    r["cpu_system"] = cpu.modi.system if cpu else nan
+    r["cpu_iowait"] = cpu.modi.iowait if cpu else nan
+
+    ram = snapshot.ram
+    r["ram_auslastung"] = ram.auslastung if ram else nan
+    r["ram_genutzt"] = ram.genutzt_bytes if ram else 0
+
+    netzwerk = snapshot.netzwerk
+    r["netzwerk_gesendet"] = netzwerk.gesendet_bytes if netzwerk else 0
+    r["netzwerk_empfangen"] = netzwerk.empfangen_bytes if netzwerk else 0
+
+    io = snapshot.io
+    r["io_read"] = io.read_bytes if io else 0
+    r["io_write"] = io.write_bytes if io else 0
+
+    r["disk_prozent"] = snapshot.usage.percent if snapshot.usage else nan
+    r["akku_prozent"] = snapshot.battery.percent if snapshot.battery else nan
+    internet = snapshot.internet
+    rtt = internet.rtt_ms if internet and internet.connection else None
+    r["internet_rtt_ms"] = nan if rtt is None else rtt
+    return out
+
+
+class Recorder:
+    """
+    Schreibt Snapshots in rotierende Segment-Dateien und liest Zeitbereiche
+    per mmap zurück.
+
+    Ein Segment wird nach `segment_records` Datensätzen (Standard: ein Tag bei
+    1 s Takt) oder bei einem Zeitsprung rückwärts abgeschlossen. Ältere
+    Segmente werden gelöscht, sobald `max_segments`, `max_bytes` oder
+    `max_age_s` überschritten sind.
+    """
+
+    def __init__(self, directory, segment_records=86400, max_segments=None,
+                 max_bytes=None, max_age_s=None):
+        self.directory = directory
+        self.segment_records = segment_records
+        self.max_segments = max_segments
+        self.max_bytes = max_bytes
+        self.max_age_s = max_age_s
+
+        self._lock = threading.Lock()
+        self._file = None
+        self._file_records = 0
+        self._last_zeitpunkt = None
+        self._record = np.zeros(1, dtype=RECORD_DTYPE)
+        self._maps = {}  # Pfad -> (Anzahl Datensätze, memmap)
+
+        os.makedirs(directory, exist_ok=True)
+        self._starts, self._paths = self._scan()
+
+    def _scan(self):
+        segmente = []
+        for name in os.listdir(self.directory):
+            if name.startswith("segment-") and name.endswith(SUFFIX):
+                try:
+                    start_ms = int(name[len("segment-"):-len(SUFFIX)])
+                except ValueError:
+                    continue
+                segmente.append((start_ms / 1000, os.path.join(self.directory, name)))
+        segmente.sort()
+        return [s for s, _ in segmente], [p for _, p in segmente]
+
+    # --- Schreiben ---------------------------------------------------------
+
+    def append(self, snapshot):
+        """Hängt einen Snapshot an das aktuelle Segment an (thread-sicher)"""
+        zeitpunkt = snapshot.zeitpunkt
+        with self._lock:
+            # self._record wird wiederverwendet -> erst unter dem Lock füllen
+            record = snapshot_to_record(snapshot, self._record)
+            if (self._file is None or self._file_records >= self.segment_records
+                    or (self._last_zeitpunkt is not None and zeitpunkt < self._last_zeitpunkt)):
+                self._rotate(zeitpunkt)
+            self._file.write(record.tobytes())
+            self._file_records += 1
+            self._last_zeitpunkt = zeitpunkt
+
+    def _rotate(self, zeitpunkt):
+        if self._file is not None:
+            self._file.close()
+        start_ms = int(zeitpunkt * 1000)
+        if self._starts and start_ms / 1000 <= self._starts[-1]:
+            start_ms = int(self._starts[-1] * 1000) + 1  # Dateinamen eindeutig und sortiert halten
+        path = os.path.join(self.directory, f"segment-{start_ms}{SUFFIX}")
+
+        # Ungepuffert: jeder Datensatz ist sofort für Leser (mmap) sichtbar
+        self._file = open(path, "wb", buffering=0)
+        self._file.write(MAGIC + RECORD_DTYPE.itemsize.to_bytes(4, "little") + bytes(4))
+        self._file_records = 0
+        self._starts.append(start_ms / 1000)
+        self._paths.append(path)
+        self._apply_retention(zeitpunkt)
+
+    def _apply_retention(self, jetzt):
+        # Das gerade geöffnete Segment (das letzte) wird nie gelöscht
+        def zu_alt():
+            return self.max_age_s is not None and len(self._starts) > 1 and self._starts[1] < jetzt - self.max_age_s
+
+        def zu_viele():
+            return self.max_segments is not None and len(self._paths) > max(1, self.max_segments)
+
+        def zu_gross():
+            if self.max_bytes is None or len(self._paths) < 2:
+                return False
+            return sum(os.path.getsize(p) for p in self._paths if os.path.exists(p)) > self.max_bytes
+
+        while len(self._paths) > 1 and (zu_alt() or zu_viele() or zu_gross()):
+            path = self._paths.pop(0)
+            self._starts.pop(0)
+            self._maps.pop(path, None)
+            try:
+                os.remove(path)
+            except OSError as e:
+                print(f"Segment konnte nicht gelöscht werden: {path}: {e}")
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    # --- Lesen -------------------------------------------------------------
+
+    def _map(self, path):
+        """memmap eines Segments; wird neu angelegt, wenn die Datei gewachsen ist"""
+        anzahl = max(0, (os.path.getsize(path) - HEADER_SIZE) // RECORD_DTYPE.itemsize)
+        cached = self._maps.get(path)
+        if cached is not None and cached[0] == anzahl:
+            return cached[1]
+        if anzahl == 0:
+            daten = np.zeros(0, dtype=RECORD_DTYPE)
+        else:
+            with open(path, "rb") as f:
+                if f.read(len(MAGIC)) != MAGIC:
+                    raise ValueError(f"Keine Aufzeichnungsdatei: {path}")
+            daten = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_SIZE, shape=(anzahl,))
+        self._maps[path] = (anzahl, daten)
+        return daten
+
+    def iter_range(self, start, ende):
+        """Liefert pro Segment eine View mit allen Datensätzen in [start, ende)"""
+        with self._lock:
+            # Erstes Segment, das vor `start` beginnt, kann noch passende Daten enthalten
+            erstes = max(0, bisect.bisect_right(self._starts, start) - 1)
+            letztes = bisect.bisect_left(self._starts, ende)
+            paths = self._paths[erstes:letztes]
+        for path in paths:
+            daten = self._map(path)
+            zeiten = daten["zeitpunkt"]
+            von = np.searchsorted(zeiten, start, side="left")
+            bis = np.searchsorted(zeiten, ende, side="left")
+            if bis > von:
+                yield daten[von:bis]
+
+    def read_range(self, start, ende=None):
+        """
+        Alle Datensätze in [start, ende) als strukturiertes Array. Liegt der
+        Bereich in einem Segment, ist das Ergebnis eine View ohne Kopie.
+        """
+        if ende is None:
+            ende = time.time() + 1
+        teile = list(self.iter_range(start, ende))
+        if not teile:
+            return np.zeros(0, dtype=RECORD_DTYPE)
+        if len(teile) == 1:
+            return teile[0]
+        return np.concatenate(teile)
+
+    def last(self, sekunden):
+        """Datensätze der letzten `sekunden` (bezogen auf den neuesten Datensatz)"""
+        ende = (self._last_zeitpunkt or time.time()) + 1e-3
+        return self.read_range(ende - sekunden, ende)
@@ -0,0 +1,276 @@
+"""
+Agent und Dashboard-Verbindungen für die Überwachung mehrerer Rechner.
+
+Der Agent (AgentServer, gestartet über agent.py) sammelt im eigenen Takt
+und schickt jedem verbundenen Dashboard den jeweils neuesten Snapshot im
+Binärprotokoll aus monitor/protocol.py. Pro Verbindung wird höchstens ein
+Frame gleichzeitig geschrieben; ist ein Empfänger zu langsam, werden die
+dazwischenliegenden Snapshots verworfen statt aufgestaut.
+
+Das Dashboard hält mit RemoteHub alle Verbindungen in einer asyncio-Schleife
+in einem eigenen Thread, baut abgerissene Verbindungen mit Backoff neu auf
+und merkt sich pro Host nur den neuesten Stand:
+
+    hub = RemoteHub(["server1:9878", "server2:9878"])
+    hub.start()
+    plain = hub.take("server1:9878")  # neuer Stand als dict oder None
+"""
+import asyncio
+import concurrent.futures
+import signal
+import socket
+import threading
+import time
+
+from monitor import protocol
+from monitor.internet import parse_address
+from monitor.snapshots import to_plain
+
+DEFAULT_PORT = 9878
+NOTSENT_LOWAT = 2048       # höchstens so viele ungesendete Bytes im Kernel (Linux, macOS)
+BACKOFF_START = 1.0
+BACKOFF_MAX = 30.0
+CONNECT_TIMEOUT = 5.0
+
+
+class AgentServer:
+    """
+    TCP-Server, der alle `interval` Sekunden `collect_func()` aufruft und den
+    Snapshot an alle verbundenen Dashboards verteilt.
+    """
+
+    def __init__(self, collect_func, host="0.0.0.0", port=DEFAULT_PORT, interval=1.0, hostname=None):
+        self.collect_func = collect_func
+        self.host = host
+        self.port = port
+        self.interval = interval
+        self.hostname = hostname or socket.gethostname()
+        self.seq = 0
+        self.latest = None        # neuester Snapshot im to_plain()-Format
+        self.verworfen = 0        # wegen langsamer Empfänger ausgelassene Frames
+        self._clients = set()     # asyncio.Event pro Verbindung
+        self._frames = {}         # Basis-seq -> fertiger Frame für den aktuellen Snapshot
+        self._server = None
+
+    async def serve(self, bereit=None):
+        """Läuft bis zum Abbruch oder SIGTERM; `bereit(port)` wird nach dem Binden aufgerufen"""
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        except (NotImplementedError, RuntimeError, ValueError):
+            pass  # Windows oder nicht im Hauptthread
+        self._server = await asyncio.start_server(self._client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        if bereit is not None:
+            bereit(self.port)
+        # Ein einzelner Thread, damit die Collector ihren Zustand nicht teilen müssen
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            async with self._server:
+                await self._sammeln(executor)
+
+    def run(self, bereit=None):
+        try:
+            asyncio.run(self.serve(bereit))
+        except asyncio.CancelledError:
+            pass
+
+    async def _sammeln(self, executor):
+        loop = asyncio.get_running_loop()
+        naechster = time.monotonic()
+        while True:
+            try:
+                snapshot = await loop.run_in_executor(executor, self.collect_func)
+            except Exception as e:
+                print(f"Fehler beim Sammeln der Daten: {e}")
+            else:
+                self.seq += 1
+                self.latest = to_plain(snapshot)
+                self._frames = {}
+                for ereignis in self._clients:
+                    ereignis.set()
+            naechster += self.interval
+            jetzt = time.monotonic()
+            if naechster < jetzt:
+                naechster = jetzt  # nach einem langsamen Zyklus nicht nachholen
+            await asyncio.sleep(naechster - jetzt)
+
+    def _frame(self, basis_seq, basis):
+        # Alle Verbindungen auf demselben Stand bekommen denselben Frame -> nur einmal kodieren
+        frame = self._frames.get(basis_seq)
+        if frame is None:
+            if basis is None:
+                frame = protocol.encode_frame(protocol.VOLL, self.seq, self.latest)
+            else:
+                frame = protocol.encode_frame(protocol.DELTA, self.seq, self.latest, basis=basis)
+            self._frames[basis_seq] = frame
+        return frame
+
+    async def _client(self, reader, writer):
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            # Sonst nimmt der Sendepuffer des Kernels (mehrere MB) bei einem langsamen
+            # Empfänger hunderte Frames auf, und drain() würde nie warten
+            if hasattr(socket, "TCP_NOTSENT_LOWAT"):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NOTSENT_LOWAT, NOTSENT_LOWAT)
+        # drain() wartet, bis der letzte Frame beim Kernel ist; bis dahin verworfen statt gepuffert
+        writer.transport.set_write_buffer_limits(high=0)
+        ereignis = asyncio.Event()
+        if self.latest is not None:
+            ereignis.set()
+        self._clients.add(ereignis)
+        basis = None
+        basis_seq = 0
+        try:
+            writer.write(protocol.encode_frame(protocol.HALLO, 0, {
+                "host": self.hostname, "interval": self.interval, "version": protocol.VERSION}))
+            await writer.drain()
+            while True:
+                await ereignis.wait()
+                ereignis.clear()
+                # Während drain() gewartet hat, sind evtl. mehrere Snapshots entstanden -> nur der neueste zählt
+                if basis_seq and self.seq - basis_seq > 1:
+                    self.verworfen += self.seq - basis_seq - 1
+                seq, plain = self.seq, self.latest
+                writer.write(self._frame(basis_seq, basis))
+                await writer.drain()
+                basis, basis_seq = plain, seq
+        except (ConnectionError, OSError, asyncio.CancelledError):
+            pass  # Empfänger weg oder Agent wird beendet
+        finally:
+            self._clients.discard(ereignis)
+            writer.close()
+
+
+class RemoteHost:
+    """Zustand einer Agent-Verbindung; wird nur vom Hub-Thread geschrieben"""
+
+    def __init__(self, adresse):
+        self.adresse = adresse
+        self.host, self.port = parse_address(adresse, DEFAULT_PORT)
+        self.hostname = None      # vom Agenten gemeldet
+        self.interval = None
+        self.verbunden = False
+        self.fehler = None
+        self.plain = None         # neuester Snapshot im to_plain()-Format
+        self.neu = False          # seit dem letzten take() aktualisiert
+        self.frames = 0
+        self.luecken = 0          # vom Agenten ausgelassene Frames
+        self.verbindungen = 0
+        self.letzter_frame = None  # time.monotonic()
+
+    @property
+    def name(self):
+        return self.hostname or self.adresse
+
+
+class RemoteHub:
+    """Hält die Verbindungen zu allen Agenten in einer asyncio-Schleife in einem eigenen Thread"""
+
+    def __init__(self, adressen):
+        self.hosts = {}
+        for adresse in adressen:
+            host = RemoteHost(adresse)
+            self.hosts[host.adresse] = host
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+
+    def start(self):
+        bereit = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(bereit,), name="remote-hub", daemon=True)
+        self._thread.start()
+        bereit.wait()
+
+    def stop(self, timeout=2.0):
+        if self._loop is not None and self._thread is not None and self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._abbrechen)
+            self._thread.join(timeout)
+
+    def take(self, adresse, auch_alt=False):
+        """Neuester Stand eines Hosts, wenn seit dem letzten take() neu (oder mit auch_alt immer)"""
+        host = self.hosts[adresse]
+        with self._lock:
+            if not host.neu and not auch_alt:
+                return None
+            host.neu = False
+            return host.plain
+
+    def _run(self, bereit):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._tasks = [self._loop.create_task(self._verbinden(host)) for host in self.hosts.values()]
+        self._loop.call_soon(bereit.set)
+        try:
+            self._loop.run_until_complete(asyncio.gather(*self._tasks, return_exceptions=True))
+        finally:
+            self._loop.close()
+
+    def _abbrechen(self):
+        for task in self._tasks:
+            task.cancel()
+
+    async def _verbinden(self, host):
+        verzoegerung = BACKOFF_START
+        while True:
+            try:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(host.host, host.port), CONNECT_TIMEOUT)
+            except Exception as e:  # OSError, Timeout, aber z. B. auch UnicodeError bei ungültigen Hostnamen
+                host.fehler = str(e) or type(e).__name__
+            else:
+                host.verbindungen += 1
+                host.fehler = None
+                try:
+                    await self._lesen(host, reader)
+                except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, protocol.ProtocolError) as e:
+                    host.fehler = str(e) or type(e).__name__
+                except Exception as e:
+                    # Unerwartetes vom Agenten darf die Verbindung nicht für immer beenden
+                    host.fehler = f"{type(e).__name__}: {e}"
+                finally:
+                    host.verbunden = False
+                    writer.close()
+                if host.frames:
+                    verzoegerung = BACKOFF_START  # Verbindung hat funktioniert -> schnell neu versuchen
+            await asyncio.sleep(verzoegerung)
+            verzoegerung = min(BACKOFF_MAX, verzoegerung * 2)
+
+    async def _lesen(self, host, reader):
+        typ, _, nutzdaten = await self._frame(reader, CONNECT_TIMEOUT)
+        if typ != protocol.HALLO:
+            raise protocol.ProtocolError("Verbindung beginnt nicht mit HALLO")
+        hallo = protocol.decode_payload(typ, nutzdaten)
+        if not isinstance(hallo, dict):
+            raise protocol.ProtocolError("HALLO ist kein dict")
+        interval = hallo.get("interval") or 1.0
+        if isinstance(interval, bool) or not isinstance(interval, (int, float)) or not 0 < interval < 3600:
+            raise protocol.ProtocolError(f"Ungültiges Intervall im HALLO: {interval!r}")
+        hostname = hallo.get("host")
+        host.hostname = str(hostname) if hostname is not None else None
+        host.interval = float(interval)
+        host.verbunden = True
+
+        # Ohne Frame über mehrere Intervalle gilt der Agent als hängend
+        timeout = host.interval * 3 + CONNECT_TIMEOUT
+        basis = None
+        letzte_seq = None
+        while True:
+            typ, seq, nutzdaten = await self._frame(reader, timeout)
+            plain = protocol.decode_payload(typ, nutzdaten, basis)
+            if typ == protocol.HALLO or not isinstance(plain, dict):
+                raise protocol.ProtocolError("Erwartet wurde ein Snapshot (dict)")
+            if letzte_seq is not None and seq > letzte_seq + 1:
+                host.luecken += seq - letzte_seq - 1
+            basis, letzte_seq = plain, seq
+            host.frames += 1
+            host.letzter_frame = time.monotonic()
+            with self._lock:
+                host.plain = plain
+                host.neu = True
+
+    @staticmethod
+    async def _frame(reader, timeout):
+        kopf = await asyncio.wait_for(reader.readexactly(protocol.HEADER.size), timeout)
+        typ, seq, laenge = protocol.parse_header(kopf)
+        nutzdaten = await asyncio.wait_for(reader.readexactly(laenge), timeout) if laenge else b""
+        return typ, seq, nutzdaten
@@ -0,0 +1,102 @@
+import time
+
+from monitor.instrumentation import profiler
+
+
+# Intervall-Stufen in Sekunden
+EINMALIG = None      # statische Daten (Hostname, Plattform, ...)
+JEDER_TICK = 0       # Zähler (CPU, RAM, Netzwerk, ...)
+
+
+class CollectorSpec:
+    """Beschreibt einen Collector: Name, Funktion, Intervall und relative Kosten"""
+
+    __slots__ = ("name", "func", "interval", "kosten", "wert", "zeitpunkt", "faellig", "aktiv")
+
+    def __init__(self, name, func, interval=JEDER_TICK, kosten=1):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.kosten = kosten
+        self.wert = None
+        self.zeitpunkt = None
+        self.faellig = True
+        self.aktiv = True  # pausierte Collector behalten ihren letzten Wert
+
+    def ist_faellig(self, jetzt):
+        if self.faellig or self.zeitpunkt is None:
+            return True
+        if self.interval is EINMALIG:
+            return False
+        return jetzt - self.zeitpunkt >= self.interval
+
+
+class CollectionScheduler:
+    """
+    Führt bei jedem Tick nur die fälligen Collector aus.
+
+    Jeder Collector gibt sein eigenes Intervall an. Zwischen zwei
+    Aktualisierungen wird der zuletzt gesammelte Wert weitergereicht, sodass
+    tick() immer einen vollständigen Datensatz liefert.
+    """
+
+    def __init__(self, collectors=(), clock=time.monotonic):
+        self.clock = clock
+        self.collectors = {}
+        for spec in collectors:
+            self.register(spec)
+
+    def register(self, spec: CollectorSpec):
+        self.collectors[spec.name] = spec
+        return spec
+
+    def invalidate(self, name=None):
+        """Erzwingt beim nächsten Tick eine Aktualisierung (alle Collector bei name=None)"""
+        specs = self.collectors.values() if name is None else [self.collectors[name]]
+        for spec in specs:
+            spec.faellig = True
+
+    def set_active(self, names=None):
+        """
+        Sammelt nur noch die Collector in `names` (None = alle). Pausierte
+        Collector liefern weiter ihren letzten Wert; wieder aktivierte werden
+        beim nächsten Tick sofort aktualisiert.
+        """
+        for name, spec in self.collectors.items():
+            aktiv = names is None or name in names
+            if aktiv and not spec.aktiv:
+                spec.faellig = True
+            spec.aktiv = aktiv
+
+    def tick(self, now=None):
+        """Gibt (werte, aktualisiert) zurück; aktualisiert enthält die neu gesammelten Namen"""
+        jetzt = self.clock() if now is None else now
+        werte = {}
+        aktualisiert = set()
+        for name, spec in self.collectors.items():
+            if spec.aktiv and spec.ist_faellig(jetzt):
+                try:
+                    if profiler.enabled:
+                        start = time.perf_counter_ns()
+                        spec.wert = spec.func()
+                        profiler.record("collector." + name, time.perf_counter_ns() - start)
+                    else:
+                        spec.wert = spec.func()
+                except Exception as e:
+                    # Letzten Wert behalten, beim nächsten Tick erneut versuchen
+                    print(f"Fehler im Collector '{name}': {e}")
+                else:
+                    spec.zeitpunkt = jetzt
+                    spec.faellig = False
+                    aktualisiert.add(name)
+            werte[name] = spec.wert
+        return werte, aktualisiert
+
+    def kosten_pro_tick(self):
+        """Geschätzte Kosten pro Tick (Kosten eines Collectors / Intervall)"""
+        gesamt = 0.0
+        for spec in self.collectors.values():
+            if spec.interval is EINMALIG:
+                continue
+            gesamt += spec.kosten / max(spec.interval, 1)
+        return gesamt
@@ -0,0 +1,261 @@
+"""
+Typisierte, kompakte Snapshot-Objekte für die Systemdaten.
+
+Die Snapshots enthalten nur Rohwerte. Formatierte Strings (z. B. "3.20 GB")
+werden erst beim Zugriff über die *_unit-Properties erzeugt und über
+format_bytes_cached zwischengespeichert – also nur dann, wenn ein Widget
+sie tatsächlich zeichnet.
+"""
+import datetime
+from typing import NamedTuple, Optional
+
+from utils.helpers import format_bytes_cached
+
+
+class CpuModi(NamedTuple):
+    user: float = 0.0
+    system: float = 0.0
+    iowait: float = 0.0
+    steal: float = 0.0
+    irq: float = 0.0
+
+
+class CpuSnapshot(NamedTuple):
+    auslastung_prozent: float
+    alle_kerne: tuple
+    modi: CpuModi
+    takt: float                       # in MHz (0 wenn unbekannt)
+    intervall: Optional[float] = None  # gemessene Zeit seit dem letzten Sample in s
+
+    @property
+    def kern_anzahl(self):
+        return len(self.alle_kerne)
+
+    @property
+    def takt_unit(self):
+        return f"{self.takt:.0f} MHz" if self.takt else None
+
+
+class RamSnapshot(NamedTuple):
+    genutzt_bytes: int
+    gesamt_bytes: int
+    frei_bytes: int
+    auslastung: float  # in %
+
+    @property
+    def genutzt_unit(self):
+        return format_bytes_cached(self.genutzt_bytes)
+
+    @property
+    def gesamt_unit(self):
+        return format_bytes_cached(self.gesamt_bytes)
+
+    @property
+    def frei_unit(self):
+        return format_bytes_cached(self.frei_bytes)
+
+
+class NetzwerkSnapshot(NamedTuple):
+    gesendet_bytes: int
+    empfangen_bytes: int
+
+    @property
+    def gesendet_unit(self):
+        return format_bytes_cached(self.gesendet_bytes)
+
+    @property
+    def empfangen_unit(self):
+        return format_bytes_cached(self.empfangen_bytes)
+
+
+class DiskIOSnapshot(NamedTuple):
+    read_bytes: int
+    write_bytes: int
+    read_count: int
+    write_count: int
+
+    @property
+    def read_unit(self):
+        return format_bytes_cached(self.read_bytes)
+
+    @property
+    def write_unit(self):
+        return format_bytes_cached(self.write_bytes)
+
+
+class DiskRateSnapshot(NamedTuple):
+    """Raten eines Laufwerks pro Sekunde (siehe monitor/rates.py)"""
+    read_bytes_s: float
+    write_bytes_s: float
+    read_ops_s: float
+    write_ops_s: float
+    auslastung_prozent: Optional[float] = None  # Anteil der Zeit mit laufenden Anfragen (nur Linux)
+    wartezeit_ms: Optional[float] = None        # mittlere Dauer einer Anfrage (await)
+
+
+class NicRateSnapshot(NamedTuple):
+    """Raten einer Netzwerkkarte pro Sekunde (siehe monitor/rates.py)"""
+    gesendet_bytes_s: float
+    empfangen_bytes_s: float
+    gesendet_pakete_s: float
+    empfangen_pakete_s: float
+    fehler_s: float = 0.0
+    verworfen_s: float = 0.0
+
+
+class DiskUsageSnapshot(NamedTuple):
+    total_bytes: int
+    used_bytes: int
+    free_bytes: int
+    percent: float
+
+    @property
+    def total_unit(self):
+        return format_bytes_cached(self.total_bytes)
+
+    @property
+    def used_unit(self):
+        return format_bytes_cached(self.used_bytes)
+
+    @property
+    def free_unit(self):
+        return format_bytes_cached(self.free_bytes)
+
+
+class BatterySnapshot(NamedTuple):
+    percent: float
+    secsleft: Optional[int]  # Sekunden bis leer/voll (None = unbekannt)
+    power_plugged: bool
+
+
+class BootSnapshot(NamedTuple):
+    timestamp: float
+    uptime_seconds: float
+
+    @property
+    def boot_string(self):
+        return datetime.datetime.fromtimestamp(self.timestamp).strftime("%Y-%m-%d %H:%M:%S")
+
+    @property
+    def uptime(self):
+        # z. B. "3:12:45"
+        return str(datetime.timedelta(seconds=int(self.uptime_seconds)))
+
+
+class SystemInfoSnapshot(NamedTuple):
+    hostname: str
+    system: str
+    release: str
+    version: str
+    machine: str
+    processor: str
+
+
+class InternetSnapshot(NamedTuple):
+    connection: bool
+    rtt_ms: Optional[float] = None
+    ziel: Optional[str] = None
+    alter_s: Optional[float] = None
+    veraltet: bool = True
+    fehlversuche: int = 0
+
+
+class InterfaceSnapshot(NamedTuple):
+    is_up: Optional[bool]
+    addresses: tuple
+    speed: Optional[int]
+
+
+class ProzessEintrag(NamedTuple):
+    """Ein Prozess oder – bei Gruppierung – die Summe mehrerer Prozesse"""
+    name: str                          # Prozessname bzw. Benutzer/cgroup der Gruppe
+    cpu_prozent: float
+    pid: Optional[int] = None          # nur bei einzelnen Prozessen
+    rss_bytes: Optional[int] = None
+    threads: Optional[int] = None
+    anzahl: int = 1                    # Prozesse in dieser Zeile
+
+
+class SystemSnapshot(NamedTuple):
+    """Alle Daten eines Erfassungszyklus; nicht gesammelte Teile sind None"""
+
+    zeitpunkt: float  # Unix-Zeit der Erfassung
+    cpu: Optional[CpuSnapshot] = None
+    ram: Optional[RamSnapshot] = None
+    netzwerk: Optional[NetzwerkSnapshot] = None
+    io: Optional[DiskIOSnapshot] = None
+    usage: Optional[DiskUsageSnapshot] = None
+    battery: Optional[BatterySnapshot] = None
+    boot: Optional[BootSnapshot] = None
+    system_info: Optional[SystemInfoSnapshot] = None
+    internet: Optional[InternetSnapshot] = None
+    network_interfaces: Optional[dict] = None  # Name -> InterfaceSnapshot
+    cpu_prozesses: Optional[list] = None       # [ProzessEintrag, ...] absteigend nach CPU
+    disk_raten: Optional[dict] = None          # Laufwerk -> DiskRateSnapshot
+    nic_raten: Optional[dict] = None           # Interface -> NicRateSnapshot
+    aktualisiert: frozenset = frozenset()      # in diesem Zyklus neu gesammelte Teile
+
+    @property
+    def time_jetzt(self):
+        return datetime.datetime.fromtimestamp(self.zeitpunkt)
+
+    @property
+    def time_jetzt_str(self):
+        return self.time_jetzt.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def to_plain(value):
+    """Wandelt Snapshots rekursiv in JSON-taugliche dicts/listen um"""
+    if isinstance(value, tuple) and hasattr(value, "_fields"):
+        return {k: to_plain(v) for k, v in zip(value._fields, value)}
+    if isinstance(value, dict):
+        return {k: to_plain(v) for k, v in value.items()}
+    if isinstance(value, (frozenset, set)):
+        return sorted(value)
+    if isinstance(value, (list, tuple)):
+        return [to_plain(v) for v in value]
+    return value
+
+
+def _aus_dict(cls, werte):
+    # Unbekannte Felder (z. B. von einem neueren Agenten) werden ignoriert
+    if werte is None:
+        return None
+    return cls(**{k: v for k, v in werte.items() if k in cls._fields})
+
+
+def _cpu_aus_dict(werte):
+    cpu = _aus_dict(CpuSnapshot, werte)
+    return cpu._replace(alle_kerne=tuple(cpu.alle_kerne), modi=_aus_dict(CpuModi, cpu.modi))
+
+
+def _interface_aus_dict(werte):
+    interface = _aus_dict(InterfaceSnapshot, werte)
+    return interface._replace(addresses=tuple(interface.addresses))
+
+
+_TEILE = {
+    "cpu": _cpu_aus_dict,
+    "ram": lambda w: _aus_dict(RamSnapshot, w),
+    "netzwerk": lambda w: _aus_dict(NetzwerkSnapshot, w),
+    "io": lambda w: _aus_dict(DiskIOSnapshot, w),
+    "usage": lambda w: _aus_dict(DiskUsageSnapshot, w),
+    "battery": lambda w: _aus_dict(BatterySnapshot, w),
+    "boot": lambda w: _aus_dict(BootSnapshot, w),
+    "system_info": lambda w: _aus_dict(SystemInfoSnapshot, w),
+    "internet": lambda w: _aus_dict(InternetSnapshot, w),
+    "network_interfaces": lambda w: {k: _interface_aus_dict(v) for k, v in w.items()},
+    "cpu_prozesses": lambda w: [_aus_dict(ProzessEintrag, p) for p in w],
+    "disk_raten": lambda w: {k: _aus_dict(DiskRateSnapshot, v) for k, v in w.items()},
+    "nic_raten": lambda w: {k: _aus_dict(NicRateSnapshot, v) for k, v in w.items()},
+}
+
+
+def snapshot_from_plain(plain):
+    """Gegenstück zu to_plain() für einen SystemSnapshot, z. B. nach dem Empfang von einem Agenten"""
+    werte = {"zeitpunkt": plain["zeitpunkt"], "aktualisiert": frozenset(plain.get("aktualisiert", ()))}
+    for name, umwandeln in _TEILE.items():
+        wert = plain.get(name)
+        if wert is not None:
+            werte[name] = umwandeln(wert)
+    return SystemSnapshot(**werte)
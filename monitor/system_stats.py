@@ -1,97 +1,141 @@
 import psutil
-import datetime
-from utils.helpers import format_bytes
-from collections import defaultdict
-import time
+from monitor.snapshots import (CpuSnapshot, CpuModi, RamSnapshot, NetzwerkSnapshot, DiskIOSnapshot,
+                               DiskUsageSnapshot, BatterySnapshot, BootSnapshot, SystemInfoSnapshot,
+                               InterfaceSnapshot, SystemSnapshot)
+from monitor.cpu_sampler import CpuSampler
+from monitor import procfs
+from monitor.rates import DiskRates, NicRates
+from monitor.processes import ProcessCache, GRUPPIERUNGEN
+from monitor.internet import InternetMonitor, targets_from_env
+from monitor.scheduler import CollectionScheduler, CollectorSpec, JEDER_TICK, EINMALIG
 import socket
 import platform
+import os
+import time
 
 
-def get_cpu():
-    usage = psutil.cpu_percent(interval=0.2)
-    core_usages = psutil.cpu_percent(interval=0.2, percpu=True)
-    freq = psutil.cpu_freq()
-    takt_current = freq.current if freq else 0
-    return {
-        "auslastung_prozent": usage,
-        "alle_kerne": core_usages,
-        "kern_anzahl": len(core_usages),
-        "takt": takt_current,  # in MHz
-        "takt_unit": f"{takt_current:.0f} MHz" if freq else None
-    }
+_procfs = None
+_backend_gewaehlt = False
+_sys_root = "/sys"  # auch für das psutil-Backend (Partitionen erkennen)
+
+
+def configure_backend(backend=None, proc_root="/proc", sys_root="/sys"):
+    """
+    Wählt die Quelle der Zähler für CPU, RAM, Netzwerk und Festplatten-IO:
+    "procfs" (nur Linux, siehe monitor/procfs.py), "psutil" oder "auto"
+    (procfs, falls verfügbar). Standard ist SYSMON_BACKEND oder "auto".
+    """
+    global _procfs, _backend_gewaehlt, _cpu_sampler, _sys_root
+    if backend is None:
+        backend = os.environ.get("SYSMON_BACKEND", "auto")
+    if backend not in ("auto", "procfs", "psutil"):
+        raise ValueError(f"Unbekanntes Backend: {backend}")
+    _sys_root = sys_root
+
+    if _procfs is not None:
+        _procfs.close()
+        _procfs = None
+    if backend == "procfs" or (backend == "auto" and procfs.available(proc_root)):
+        try:
+            _procfs = procfs.ProcFs(proc_root, sys_root)
+        except OSError:
+            if backend == "procfs":
+                raise
+    _backend_gewaehlt = True
+    # Neuer Sampler, damit das erste Delta nicht zwischen zwei Quellen gebildet wird
+    _cpu_sampler = CpuSampler(_cpu_times)
+    return "procfs" if _procfs is not None else "psutil"
 
 
+def _get_procfs():
+    if not _backend_gewaehlt:
+        configure_backend()
+    return _procfs
+
+
+def _cpu_times():
+    fs = _get_procfs()
+    if fs is not None:
+        return fs.cpu_times()
+    return psutil.cpu_times(percpu=True)
+
+
+_cpu_sampler = CpuSampler(_cpu_times)
 
-def get_ram():
-    ram = psutil.virtual_memory()
-    return {
-        "genutzt_bytes": ram.used,
-        "gesamt_bytes": ram.total,
-        "frei_bytes": ram.available,
 
-        "genutzt_unit": format_bytes(ram.used),
-        "gesamt_unit": format_bytes(ram.total),
-        "frei_unit": format_bytes(ram.available),
+def get_cpu():
+    # Backend vor dem Sampling wählen, sonst würde der Sampler beim ersten Aufruf ersetzt
+    fs = _get_procfs()
+    # Gesamt, Kerne und Modi aus einem einzigen cpu_times()-Delta (ohne sleep)
+    sample = _cpu_sampler.sample()
+    if fs is not None:
+        takt = fs.cpu_freq_mhz()
+    else:
+        freq = psutil.cpu_freq()
+        takt = freq.current if freq else None
+    return CpuSnapshot(
+        auslastung_prozent=sample["auslastung_prozent"],
+        alle_kerne=tuple(sample["alle_kerne"]),
+        modi=CpuModi(**sample["modi"]),
+        takt=takt or 0,  # in MHz
+        intervall=sample["intervall"],
+    )
+
 
-        "auslastung": ram.percent  # in %
-    }
+
+def get_ram():
+    fs = _get_procfs()
+    ram = fs.memory() if fs is not None else psutil.virtual_memory()
+    return RamSnapshot(
+        genutzt_bytes=ram.used,
+        gesamt_bytes=ram.total,
+        frei_bytes=ram.available,
+        auslastung=ram.percent,  # in %
+    )
 
 def get_netzwerk():
-    net = psutil.net_io_counters()
-    return {
-        "gesendet_bytes": net.bytes_sent,
-        "empfangen_bytes": net.bytes_recv,
+    fs = _get_procfs()
+    net = fs.net_io() if fs is not None else psutil.net_io_counters()
+    return NetzwerkSnapshot(
+        gesendet_bytes=net.bytes_sent,
+        empfangen_bytes=net.bytes_recv,
+    )
+
+_boot_timestamp = None
 
-        "gesendet_unit": format_bytes(net.bytes_sent),
-        "empfangen_unit": format_bytes(net.bytes_recv)
-    }
 
 def get_boot():
-    boot_timestamp = psutil.boot_time()
-    boot_time = datetime.datetime.fromtimestamp(boot_timestamp)
-    uptime = datetime.datetime.now() - boot_time
-    return {
-        "timestamp": boot_timestamp,
-        "boot_string": boot_time.strftime("%Y-%m-%d %H:%M:%S"),
-        "uptime": str(uptime).split('.')[0],  # z. B. "3:12:45"
-        "uptime_seconds": uptime.total_seconds()
-    }
-
-
-def get_active_cpu_processes(wait=0.2):
-    stats = defaultdict(float)
-
-    # 1. Initialisieren der CPU-Messung
-    for proc in psutil.process_iter():
-        try:
-            proc.cpu_percent(interval=None)
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            pass
+    # Die Boot-Zeit ändert sich nicht -> nur einmal abfragen, Uptime jedes Mal neu
+    global _boot_timestamp
+    if _boot_timestamp is None:
+        _boot_timestamp = psutil.boot_time()
+    return BootSnapshot(
+        timestamp=_boot_timestamp,
+        uptime_seconds=time.time() - _boot_timestamp,
+    )
 
-    # 2. Kurze Pause für Messung
-    time.sleep(wait)
 
-    # 3. Aktuelle CPU-Werte abfragen und nur Prozesse mit CPU > 0 speichern
-    for proc in psutil.process_iter(['name', 'cpu_percent']):
-        try:
-            info = proc.info
-            name = info['name'] or "unbekannt"
-            cpu = info['cpu_percent'] or 0.0
+_process_cache = ProcessCache()
+_prozess_gruppierung = None
+_prozess_anzahl = 10
+
 
-            if cpu > 0:
-                stats[name] += cpu
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            pass
+def configure_processes(gruppierung=None, anzahl=10):
+    """
+    Zeilen der Prozessliste: einzeln pro PID (None) oder zusammengefasst nach
+    "name", "user" oder "cgroup"; es werden nur die `anzahl` aktivsten geliefert.
+    """
+    global _prozess_gruppierung, _prozess_anzahl
+    if gruppierung not in GRUPPIERUNGEN:
+        raise ValueError(f"Unbekannte Gruppierung: {gruppierung}")
+    _prozess_gruppierung = gruppierung
+    _prozess_anzahl = anzahl
 
-    # 4. Sortieren nach CPU-Auslastung absteigend
-    sorted_stats = sorted(stats.items(), key=lambda x: x[1], reverse=True)
 
-    #print(sorted_stats)
-    # 5. Ausgabe
-    #for name, cpu in sorted_stats:
-    #    print(f"{name}: CPU {cpu}%")
-    #print(sorted_stats)
-    return sorted_stats
+def get_active_cpu_processes():
+    # CPU-Werte seit dem letzten Tick aus dem Prozess-Cache (kein sleep), nur Prozesse mit CPU > 0,
+    # Top-N per Heap statt vollständiger Sortierung
+    return _process_cache.top(_prozess_anzahl, _prozess_gruppierung)
 
 
 def get_disk_usage():
@@ -105,63 +149,97 @@ def get_disk_usage():
         path = "/"  # Fallback
 
     usage = psutil.disk_usage(path)
-    return {
-        "total_bytes": usage.total,
-        "used_bytes": usage.used,
-        "free_bytes": usage.free,
-
-        "total_unit": format_bytes(usage.total),
-        "used_unit": format_bytes(usage.used),
-        "free_unit": format_bytes(usage.free),
-
-        "percent": usage.percent
-    }
+    return DiskUsageSnapshot(
+        total_bytes=usage.total,
+        used_bytes=usage.used,
+        free_bytes=usage.free,
+        percent=usage.percent,
+    )
 
 def get_battery_info():
     battery = psutil.sensors_battery()
-    if battery.secsleft == -2:
-        secs_left = None
-    else:
-        secs_left = battery.secsleft
     if battery:
-        return {
-            "percent": battery.percent,
-            "secsleft": secs_left,  # Sekunden bis leer/voll
-            "power_plugged": battery.power_plugged
-        }
+        if battery.secsleft == -2:
+            secs_left = None
+        else:
+            secs_left = battery.secsleft
+        return BatterySnapshot(
+            percent=battery.percent,
+            secsleft=secs_left,  # Sekunden bis leer/voll
+            power_plugged=battery.power_plugged,
+        )
     else:
         return None  # Akku nicht vorhanden
 
 def get_system_info():
-    return {
-        "hostname": socket.gethostname(),
-        "system": platform.system(),
-        "release": platform.release(),
-        "version": platform.version(),
-        "machine": platform.machine(),
-        "processor": platform.processor()
-    }
+    return SystemInfoSnapshot(
+        hostname=socket.gethostname(),
+        system=platform.system(),
+        release=platform.release(),
+        version=platform.version(),
+        machine=platform.machine(),
+        processor=platform.processor(),
+    )
 
 def get_disk_io():
-    io = psutil.disk_io_counters()
-    return {
-        "read_bytes": io.read_bytes,
-        "write_bytes": io.write_bytes,
+    fs = _get_procfs()
+    io = fs.disk_io() if fs is not None else psutil.disk_io_counters()
+    return DiskIOSnapshot(
+        read_bytes=io.read_bytes,
+        write_bytes=io.write_bytes,
+        read_count=io.read_count,
+        write_count=io.write_count,
+    )
+
+_disk_raten = DiskRates()
+_nic_raten = NicRates()
+
+
+# Loop- und RAM-Laufwerke (z. B. Snap-Mounts) haben keine eigene Hardware und würden die Geräteliste füllen
+VIRTUELLE_LAUFWERKE = ("loop", "ram", "zram")
+
+
+def _physische_laufwerke(zaehler):
+    """Ganze, physische Laufwerke – für procfs und psutil gleich, sonst zählt psutil Partitionen doppelt"""
+    return {name: werte for name, werte in zaehler.items()
+            if not name.startswith(VIRTUELLE_LAUFWERKE) and not procfs.ist_partition(name, _sys_root)}
+
 
-        "read_unit": format_bytes(io.read_bytes),
-        "write_unit": format_bytes(io.write_bytes),
+def get_disk_rates():
+    # Raten pro Laufwerk gegen die tatsächlich vergangene Zeit; beim ersten Aufruf leer
+    fs = _get_procfs()
+    zaehler = fs.disk_io_perdisk() if fs is not None else psutil.disk_io_counters(perdisk=True)
+    return _disk_raten.update(_physische_laufwerke(zaehler or {}))
 
-        "read_count": io.read_count,
-        "write_count": io.write_count
-    }
 
-def get_internet_connection(host="8.8.8.8", port=53, timeout=1):
-    try:
-        socket.setdefaulttimeout(timeout)
-        socket.socket(socket.AF_INET, socket.SOCK_STREAM).connect((host, port))
-        return {"connection": True}
-    except socket.error:
-        return {"connection": False}
+def get_nic_rates():
+    fs = _get_procfs()
+    zaehler = fs.net_io_pernic() if fs is not None else psutil.net_io_counters(pernic=True)
+    return _nic_raten.update(zaehler)
+
+
+_internet_monitor = None
+
+
+def configure_internet_monitor(targets=None, **kwargs):
+    """
+    Ersetzt den Erreichbarkeits-Monitor, z. B. mit einem lokalen Ziel für Tests:
+    configure_internet_monitor(targets=[("127.0.0.1", 8053)], interval=0.5)
+    """
+    global _internet_monitor
+    if _internet_monitor is not None:
+        _internet_monitor.stop(timeout=0)
+    if targets is None:
+        targets = targets_from_env()
+    _internet_monitor = InternetMonitor(targets=targets, **kwargs).start()
+    return _internet_monitor
+
+
+def get_internet_connection():
+    # Nur den zwischengespeicherten Zustand lesen, die Prüfung läuft im Hintergrund
+    if _internet_monitor is None:
+        configure_internet_monitor()
+    return _internet_monitor.state()
 
 
 def get_network_interfaces():
@@ -179,43 +257,56 @@ def get_network_interfaces():
                 if a.family == socket.AF_INET:
                     ipv4_addresses.append(str(a.address))
 
-        interfaces[intf] = {
-            "is_up": stats[intf].isup if intf in stats else None,
-            "addresses": ipv4_addresses,
-            "speed": stats[intf].speed if intf in stats else None
-        }
+        interfaces[intf] = InterfaceSnapshot(
+            is_up=stats[intf].isup if intf in stats else None,
+            addresses=tuple(ipv4_addresses),
+            speed=stats[intf].speed if intf in stats else None,
+        )
     return interfaces
 
 
 
-def get_all_system_stats():
-    cpu = get_cpu()
-    cpu_processes = get_active_cpu_processes()
-    ram = get_ram()
-    netzwerk = get_netzwerk()
-    boot = get_boot()
-    usage = get_disk_usage()
-    battery = get_battery_info()
-    system_info = get_system_info()
-    time_jetzt = datetime.datetime.now()
-    internet = get_internet_connection()
-    io = get_disk_io()
-    network_interfaces = get_network_interfaces()
-
-    return {
-        "cpu": cpu,
-        "ram": ram,
-        "boot": boot,
-        "usage": usage,
-        "battery": battery,
-        "system_info": system_info,
-        "cpu_prozesses": cpu_processes,
-        "time_jetzt": time_jetzt,
-        "time_jetzt_str": time_jetzt.strftime("%Y-%m-%d %H:%M:%S"),
-        "io": io,
-        "netzwerk": netzwerk,
-        "internet": internet,
-        "network_interfaces": network_interfaces,
-    }
-
-
+def create_default_scheduler(namen=None):
+    """
+    Standard-Stufen: statisch einmal, Kapazitäten alle paar Sekunden, Zähler jeden Tick.
+    Mit `namen` werden nur die angegebenen Collector registriert.
+    """
+    specs = [
+        CollectorSpec("cpu", get_cpu, JEDER_TICK, kosten=1),
+        CollectorSpec("cpu_prozesses", get_active_cpu_processes, JEDER_TICK, kosten=50),
+        CollectorSpec("ram", get_ram, JEDER_TICK, kosten=1),
+        CollectorSpec("netzwerk", get_netzwerk, JEDER_TICK, kosten=1),
+        CollectorSpec("io", get_disk_io, JEDER_TICK, kosten=1),
+        CollectorSpec("disk_raten", get_disk_rates, JEDER_TICK, kosten=1),
+        CollectorSpec("nic_raten", get_nic_rates, JEDER_TICK, kosten=1),
+        CollectorSpec("internet", get_internet_connection, JEDER_TICK, kosten=0),  # nur Cache lesen
+        CollectorSpec("boot", get_boot, JEDER_TICK, kosten=0),
+        CollectorSpec("battery", get_battery_info, 10, kosten=2),
+        CollectorSpec("usage", get_disk_usage, 30, kosten=1),
+        CollectorSpec("network_interfaces", get_network_interfaces, 30, kosten=5),
+        CollectorSpec("system_info", get_system_info, EINMALIG, kosten=5),
+    ]
+    if namen is not None:
+        unbekannt = set(namen) - {spec.name for spec in specs}
+        if unbekannt:
+            raise ValueError(f"Unbekannte Collector: {', '.join(sorted(unbekannt))}")
+        specs = [spec for spec in specs if spec.name in namen]
+    return CollectionScheduler(specs)
+
+
+_scheduler = None
+
+
+def get_all_system_stats(scheduler=None):
+    global _scheduler
+    if scheduler is None:
+        if _scheduler is None:
+            _scheduler = create_default_scheduler()
+        scheduler = _scheduler
+
+    werte, aktualisiert = scheduler.tick()
+    return SystemSnapshot(
+        zeitpunkt=time.time(),
+        aktualisiert=frozenset(aktualisiert),  # in diesem Tick neu gesammelte Collector
+        **werte,
+    )
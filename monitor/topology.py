@@ -0,0 +1,94 @@
+"""
+CPU-Topologie für die Gruppierung der Kerne in der Heatmap (CpuCoreBarsWidget).
+
+Unter Linux werden NUMA-Knoten aus /sys/devices/system/node/node*/cpulist
+und Sockel aus /sys/devices/system/cpu/cpu*/topology/physical_package_id
+gelesen. Gibt es mehrere NUMA-Knoten, wird danach gruppiert, sonst nach
+Sockel; auf anderen Systemen (oder bei nur einem Knoten/Sockel) bilden alle
+Kerne eine Gruppe.
+
+Die Kernwerte aus psutil.cpu_percent(percpu=True) bzw. /proc/stat sind nach
+der Nummer der online-CPUs sortiert; die Gruppen enthalten deshalb Indizes
+in diese Liste, nicht CPU-Nummern.
+
+    gruppen = cpu_groups(len(cpu.alle_kerne))
+    for gruppe in gruppen:
+        werte = [cpu.alle_kerne[i] for i in gruppe.indizes]
+"""
+import functools
+import glob
+import os
+import re
+from typing import NamedTuple
+
+
+class CpuGruppe(NamedTuple):
+    name: str        # z. B. "Node 0", "Socket 1" oder "" bei nur einer Gruppe
+    indizes: tuple   # Positionen in cpu.alle_kerne
+    cpus: tuple      # zugehörige CPU-Nummern (für Tooltips)
+
+
+def parse_cpulist(text):
+    """ "0-3,8,10-11" -> [0, 1, 2, 3, 8, 10, 11] """
+    cpus = []
+    for teil in text.strip().split(","):
+        if not teil:
+            continue
+        von, _, bis = teil.partition("-")
+        cpus.extend(range(int(von), int(bis or von) + 1))
+    return cpus
+
+
+def _lesen(path):
+    try:
+        with open(path, encoding="ascii") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _nummer(path):
+    return int(re.search(r"(\d+)$", path).group(1))
+
+
+def read_topology(sys_root="/sys"):
+    """
+    (online-CPUs, {cpu: numa-knoten}, {cpu: sockel}); leere Angaben, wenn
+    /sys nicht lesbar ist (z. B. unter Windows/macOS)
+    """
+    basis = os.path.join(sys_root, "devices", "system")
+    online = _lesen(os.path.join(basis, "cpu", "online"))
+    cpus = parse_cpulist(online) if online else []
+
+    knoten = {}
+    for pfad in glob.glob(os.path.join(basis, "node", "node[0-9]*")):
+        liste = _lesen(os.path.join(pfad, "cpulist"))
+        for cpu in parse_cpulist(liste or ""):
+            knoten[cpu] = _nummer(pfad)
+
+    sockel = {}
+    for cpu in cpus:
+        wert = _lesen(os.path.join(basis, "cpu", f"cpu{cpu}", "topology", "physical_package_id"))
+        if wert is not None and wert.lstrip("-").isdigit():
+            sockel[cpu] = int(wert)
+    return cpus, knoten, sockel
+
+
+def group_cores(anzahl, cpus, knoten, sockel):
+    """Teilt `anzahl` Kerne nach NUMA-Knoten, sonst nach Sockel, sonst gar nicht auf"""
+    if len(cpus) != anzahl:
+        cpus = list(range(anzahl))  # Topologie passt nicht zu den Messwerten (z. B. Remote-Host)
+    for zuordnung, bezeichnung in ((knoten, "Node"), (sockel, "Socket")):
+        if len({zuordnung.get(cpu) for cpu in cpus}) > 1 and all(cpu in zuordnung for cpu in cpus):
+            gruppen = {}
+            for index, cpu in enumerate(cpus):
+                gruppen.setdefault(zuordnung[cpu], []).append((index, cpu))
+            return [CpuGruppe(f"{bezeichnung} {nummer}", tuple(i for i, _ in eintraege), tuple(c for _, c in eintraege))
+                    for nummer, eintraege in sorted(gruppen.items())]
+    return [CpuGruppe("", tuple(range(anzahl)), tuple(cpus))]
+
+
+@functools.lru_cache(maxsize=8)
+def cpu_groups(anzahl, sys_root="/sys"):
+    """Gruppen für die lokale Maschine; die Topologie wird nur einmal pro Kernzahl gelesen"""
+    return group_cores(anzahl, *read_topology(sys_root))
@@ -1,5 +1,6 @@
 
 import os
+from functools import lru_cache
 
 def print_dict(d, indent=0):
     """
@@ -44,6 +45,10 @@ def format_bytes(size, unit='auto', precision=2):
         return f"{size} B"
 
 
+# Gleiche Werte (z. B. Gesamtgröße von RAM/Festplatte) werden nur einmal formatiert
+format_bytes_cached = lru_cache(maxsize=4096)(format_bytes)
+
+
 def clear_console_1():
     os.system('cls' if os.name == 'nt' else 'clear')
 
@@ -0,0 +1,59 @@
+import time
+
+from PySide6.QtCore import Qt
+
+from widgets.layered import LayeredWidget
+from widgets.theme import theme
+
+
+class AlertBannerWidget(LayeredWidget):
+    """
+    Liste der aktiven Alarme (aus AlertEngine.aktive()) über den Gruppen.
+    Ohne aktive Alarme ist das Banner ausgeblendet; bei sehr vielen Alarmen
+    werden nur die ersten `max_rows` gezeigt.
+    """
+
+    row_height = 18
+    max_rows = 8
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.zeilen = []
+        self.weitere = 0
+        self.setMinimumSize(600, self.row_height + 8)
+        self.hide()
+
+    def set_alerts(self, aktive):
+        zeilen = [(ereignis.schwere, ereignis.text, ereignis.zeitpunkt) for ereignis in aktive[:self.max_rows]]
+        self.weitere = len(aktive) - len(zeilen)
+        hoehe = (len(zeilen) + (1 if self.weitere else 0)) * self.row_height + 8
+        if hoehe != self.height():
+            self.setFixedHeight(hoehe)
+        self.zeilen = zeilen
+        self.setVisible(bool(zeilen))
+        self.request_repaint((tuple(zeilen), self.weitere))
+
+    def paint_background(self, painter):
+        painter.fillRect(self.rect(), theme.color("#2a1f1f"))
+
+    def paint_data(self, painter):
+        painter.setFont(theme.font(9))
+        farben = {"kritisch": theme.brush("#F44336"), "warnung": theme.brush("#FF9800")}
+        weiss = theme.pen("#ffffff")
+        grau = theme.pen("#888888")
+        kein_stift = Qt.NoPen
+
+        y = 4
+        for schwere, text, seit in self.zeilen:
+            painter.setPen(kein_stift)
+            painter.setBrush(farben.get(schwere, farben["warnung"]))
+            painter.drawEllipse(10, y + 5, 8, 8)
+            painter.setPen(weiss)
+            painter.drawText(26, y + 13, text)
+            painter.setPen(grau)
+            seit_text = time.strftime("seit %H:%M:%S", time.localtime(seit))
+            painter.drawText(self.width() - 10 - theme.text_width(seit_text, 9), y + 13, seit_text)
+            y += self.row_height
+        if self.weitere:
+            painter.setPen(grau)
+            painter.drawText(26, y + 13, f"... und {self.weitere} weitere")
@@ -0,0 +1,146 @@
+from typing import NamedTuple, Optional
+
+from PySide6.QtCore import QRectF, Qt, Signal
+
+from widgets.layered import LayeredWidget
+from widgets.theme import theme
+
+
+class HostKachel(NamedTuple):
+    """Anzeigezustand eines Hosts in der Übersicht"""
+    adresse: str
+    name: str
+    verbunden: bool
+    cpu: Optional[float] = None   # in %
+    ram: Optional[float] = None   # in %
+    fehler: Optional[str] = None
+
+
+class HostGridWidget(LayeredWidget):
+    """
+    Kachelübersicht aller Hosts im Remote-Modus: Name, Verbindungsstatus und
+    CPU-/RAM-Auslastung. Alle Kacheln werden in einem Widget gezeichnet, damit
+    auch 100+ Hosts nur ein paint_data() pro Tick kosten; Rahmen und Namen
+    liegen im Hintergrund-Layer. Ein Klick auf eine Kachel sendet
+    host_selected(adresse).
+    """
+
+    host_selected = Signal(str)
+
+    epsilon = 0.5
+    tile_width = 180
+    tile_height = 46
+    spacing = 6
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.kacheln = []
+        self.selected = None
+        self._namen = ()
+        self.setMinimumSize(400, self.tile_height + 2 * self.spacing)
+        self.setCursor(Qt.PointingHandCursor)
+
+    def set_hosts(self, kacheln, selected):
+        if len(kacheln) != len(self.kacheln):
+            self.kacheln = kacheln
+            self._update_height()
+        namen = tuple(kachel.name for kachel in kacheln)
+        if namen != self._namen:
+            # Namen ändern sich nur, wenn ein Agent seinen Hostnamen meldet
+            self._namen = namen
+            self.invalidate_background()
+        self.kacheln = kacheln
+        self.selected = selected
+        self.request_repaint((selected, tuple(kacheln)))
+
+    def _columns(self):
+        return max(1, (self.width() - self.spacing) // (self.tile_width + self.spacing))
+
+    def _update_height(self):
+        zeilen = -(-len(self.kacheln) // self._columns())
+        self.setMinimumHeight(max(1, zeilen) * (self.tile_height + self.spacing) + self.spacing)
+
+    def _tile_rect(self, index):
+        spalte, zeile = index % self._columns(), index // self._columns()
+        return QRectF(self.spacing + spalte * (self.tile_width + self.spacing),
+                      self.spacing + zeile * (self.tile_height + self.spacing),
+                      self.tile_width, self.tile_height)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_height()
+
+    def mousePressEvent(self, event):
+        pos = event.position()
+        for index, kachel in enumerate(self.kacheln):
+            if self._tile_rect(index).contains(pos):
+                self.host_selected.emit(kachel.adresse)
+                return
+        super().mousePressEvent(event)
+
+    def paint_background(self, painter):
+        painter.fillRect(self.rect(), theme.color("#1a1a1a"))
+        rahmen = theme.pen("#333333")
+        kachel_brush = theme.brush("#252525")
+        weiss = theme.pen("#ffffff")
+        painter.setFont(theme.font(9, bold=True))
+        metrics = theme.metrics(9, bold=True)
+        for index, name in enumerate(self._namen):
+            rect = self._tile_rect(index)
+            painter.setPen(rahmen)
+            painter.setBrush(kachel_brush)
+            painter.drawRoundedRect(rect, 4, 4)
+            painter.setPen(weiss)
+            painter.drawText(int(rect.x() + 22), int(rect.y() + 17),
+                             metrics.elidedText(name, Qt.ElideRight, self.tile_width - 30))
+
+    def paint_data(self, painter):
+        if not self.kacheln:
+            painter.setPen(theme.pen("#555555"))
+            painter.drawText(self.rect(), Qt.AlignCenter, "Keine Hosts")
+            return
+
+        balken_brush = theme.brush("#333333")
+        auswahl = theme.pen("#29b6f6", 2)
+        grau = theme.pen("#888888")
+        farben = (theme.brush("#4CAF50"), theme.brush("#FF9800"), theme.brush("#F44336"))
+        online = theme.brush("#4CAF50")
+        offline = theme.brush("#F44336")
+        text_font = theme.font(8)
+
+        kein_stift = Qt.NoPen
+        spalten = self._columns()
+        schritt_x = self.tile_width + self.spacing
+        schritt_y = self.tile_height + self.spacing
+        breite = int(self.tile_width / 2 - 12)
+        painter.setFont(text_font)
+
+        for index, kachel in enumerate(self.kacheln):
+            x = self.spacing + index % spalten * schritt_x
+            y = self.spacing + index // spalten * schritt_y
+            if kachel.adresse == self.selected:
+                painter.setPen(auswahl)
+                painter.setBrush(Qt.NoBrush)
+                painter.drawRoundedRect(self._tile_rect(index), 4, 4)
+
+            painter.setPen(kein_stift)
+            painter.setBrush(online if kachel.verbunden else offline)
+            painter.drawEllipse(x + 8, y + 9, 8, 8)
+
+            if not kachel.verbunden or kachel.cpu is None:
+                painter.setPen(grau)
+                text = kachel.fehler or ("Verbinde ..." if not kachel.verbunden else "Warte auf Daten ...")
+                painter.drawText(x + 8, y + 36, theme.metrics(8).elidedText(text, Qt.ElideRight, self.tile_width - 16))
+                continue
+
+            # Zwei schmale Balken: CPU und RAM
+            for bx, label, wert in ((x + 8, "CPU", kachel.cpu), (x + 16 + breite, "RAM", kachel.ram)):
+                wert = wert or 0.0
+                painter.setPen(grau)
+                painter.drawText(bx, y + 31, f"{label} {wert:.0f}%")
+                painter.setPen(kein_stift)
+                painter.setBrush(balken_brush)
+                painter.drawRect(bx, y + 35, breite, 4)
+                if wert > 0:
+                    painter.setBrush(farben[0] if wert < 30 else farben[1] if wert < 70 else farben[2])
+                    painter.drawRect(bx, y + 35, max(1, int(breite * min(wert, 100) / 100)), 4)
@@ -0,0 +1,125 @@
+import time
+
+from PySide6.QtCore import QEvent, Qt
+from PySide6.QtGui import QPainter, QPixmap
+from PySide6.QtWidgets import QWidget
+
+from monitor.instrumentation import profiler
+
+
+class RepaintStats:
+    """Zählt angeforderte und wegen unveränderter Werte ausgelassene Repaints"""
+
+    def __init__(self):
+        self.angefordert = 0
+        self.uebersprungen = 0
+
+    def reset(self):
+        self.angefordert = 0
+        self.uebersprungen = 0
+
+
+# Von allen Widgets geteilter Zähler (wird in der Statuszeile angezeigt)
+repaint_stats = RepaintStats()
+
+
+def _differs(alt, neu, epsilon):
+    """Vergleicht zwei Zustände; float-Werte gelten erst ab `epsilon` als geändert"""
+    if isinstance(alt, float) and isinstance(neu, float):
+        return abs(neu - alt) > epsilon
+    if isinstance(alt, (tuple, list)) and isinstance(neu, (tuple, list)):
+        return len(alt) != len(neu) or any(_differs(a, b, epsilon) for a, b in zip(alt, neu))
+    return alt != neu
+
+
+class LayeredWidget(QWidget):
+    """
+    Basisklasse für selbst gezeichnete Widgets mit zwei Ebenen.
+
+    paint_background() zeichnet alles Statische (Hintergrund, Gitter, Titel,
+    Legenden) und wird nur einmal in eine QPixmap gerendert. Bei jedem Tick
+    wird diese Pixmap kopiert und nur paint_data() neu ausgeführt. Die
+    Pixmap wird bei Größen-, Stil- oder DPI-Änderungen verworfen; Unterklassen
+    rufen invalidate_background() auf, wenn sich ihr statischer Teil ändert.
+
+    Setter übergeben den sichtbaren Zustand an request_repaint(); neu
+    gezeichnet wird nur, wenn er sich gegenüber dem zuletzt gezeichneten
+    Zustand um mehr als `epsilon` geändert hat.
+    """
+
+    # Schwelle für float-Werte im Zustand (0 = jede Änderung zeichnen)
+    epsilon = 0.0
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._background = None
+        self._state = None
+
+    def request_repaint(self, state) -> bool:
+        """Plant ein update() nur, wenn sich die Anzeige ändern würde"""
+        if self._state is not None and not _differs(self._state, state, self.epsilon):
+            repaint_stats.uebersprungen += 1
+            return False
+        self._state = state
+        repaint_stats.angefordert += 1
+        self.update()
+        return True
+
+    def paint_background(self, painter: QPainter):
+        """Statische Ebene (wird gecacht)"""
+
+    def paint_data(self, painter: QPainter):
+        """Dynamische Ebene (wird bei jedem paintEvent gezeichnet)"""
+
+    def invalidate_background(self):
+        self._background = None
+        self._state = None
+        self.update()
+
+    def resizeEvent(self, event):
+        self._background = None
+        super().resizeEvent(event)
+
+    def changeEvent(self, event):
+        if event.type() in (QEvent.StyleChange, QEvent.PaletteChange, QEvent.FontChange):
+            self._background = None
+        super().changeEvent(event)
+
+    def _render_background(self):
+        if profiler.enabled:
+            start = time.perf_counter_ns()
+            pixmap = self._render_background_pixmap()
+            profiler.record("hintergrund." + type(self).__name__, time.perf_counter_ns() - start)
+            return pixmap
+        return self._render_background_pixmap()
+
+    def _render_background_pixmap(self):
+        dpr = self.devicePixelRatioF()
+        pixmap = QPixmap(self.size() * dpr)
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        self.paint_background(painter)
+        painter.end()
+        return pixmap
+
+    def paintEvent(self, event):
+        if not profiler.enabled:
+            self._paint()
+            return
+        start = time.perf_counter_ns()
+        self._paint()
+        profiler.record("paint." + type(self).__name__, time.perf_counter_ns() - start)
+
+    def _paint(self):
+        if (self._background is None
+                or self._background.devicePixelRatio() != self.devicePixelRatioF()):
+            self._background = self._render_background()
+
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._background)
+        painter.setRenderHint(QPainter.Antialiasing)
+        self.paint_data(painter)
+        painter.end()
@@ -0,0 +1,101 @@
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QGroupBox, QHBoxLayout, QLabel, QWidget
+
+# Qt-Konstante QWIDGETSIZE_MAX (keine Höhenbegrenzung)
+_MAX_HEIGHT = 16777215
+
+
+class LazyGroup(QGroupBox):
+    """
+    Einklappbare GroupBox, deren Widgets erst bei Bedarf gebaut werden.
+
+    build(layout) legt die Widgets der Gruppe an, update(stats) füllt sie mit
+    einem Snapshot. Bis zum ersten build() zeigt die Gruppe nur einen
+    Platzhalter; eingeklappte Gruppen werden weder gebaut noch aktualisiert.
+    Beim Aufklappen wird der zuletzt empfangene Snapshot sofort angezeigt.
+
+    `collectors` nennt die Collector, deren Werte die Gruppe anzeigt. Liegt
+    die Gruppe außerhalb des sichtbaren Bereichs (set_on_screen(False)),
+    werden Updates nur gemerkt und beim Zurückscrollen nachgeholt.
+    """
+
+    collapsed_height = 40
+
+    def __init__(self, title, build, update, expanded=True, minimum_size=(0, 180), collectors=(), parent=None):
+        super().__init__(title, parent)
+        self._build = build
+        self._update = update
+        self._stats = None
+        self.is_built = False
+        self.minimum_size = minimum_size
+        self.collectors = tuple(collectors)
+        self.on_screen = True
+
+        self.setCheckable(True)
+        self.setChecked(expanded)
+
+        self._content = QWidget()
+        self._content.setObjectName("lazyGroupContent")
+        self._content.setStyleSheet("#lazyGroupContent { background: transparent; }")
+        self._content_layout = QHBoxLayout(self._content)
+        self._content_layout.setContentsMargins(0, 0, 0, 0)
+
+        self._placeholder = QLabel("Wird geladen ...")
+        self._placeholder.setAlignment(Qt.AlignCenter)
+        self._placeholder.setStyleSheet("color: #555555; font-size: 11px; font-weight: normal;")
+
+        layout = QHBoxLayout(self)
+        layout.addWidget(self._placeholder)
+        layout.addWidget(self._content)
+        self._content.hide()
+
+        self._apply_expanded(expanded)
+        self.toggled.connect(self._on_toggled)
+
+    def ensure_built(self):
+        """Baut die Widgets der Gruppe (nur beim ersten Aufruf)"""
+        if self.is_built:
+            return
+        self.is_built = True
+        self._build(self._content_layout)
+        self._placeholder.hide()
+        self._content.setVisible(self.isChecked())
+        if self._stats is not None and self.isChecked():
+            self._update(self._stats)
+
+    def update_stats(self, stats):
+        """Merkt sich den Snapshot; aktualisiert nur gebaute, aufgeklappte und sichtbare Gruppen"""
+        self._stats = stats
+        if self.is_built and self.isChecked() and self.on_screen:
+            self._update(stats)
+
+    @property
+    def needs_data(self):
+        return self.isChecked() and self.on_screen
+
+    def set_on_screen(self, on_screen):
+        if on_screen == self.on_screen:
+            return
+        self.on_screen = on_screen
+        if on_screen and self.is_built and self.isChecked() and self._stats is not None:
+            # Beim Zurückscrollen sofort den letzten Stand zeigen
+            self._update(self._stats)
+
+    def _apply_expanded(self, expanded):
+        if expanded:
+            self.setMinimumSize(*self.minimum_size)
+            self.setMaximumHeight(_MAX_HEIGHT)
+        else:
+            self.setMinimumSize(self.minimum_size[0], 0)
+            self.setMaximumHeight(self.collapsed_height)
+        self._content.setVisible(expanded and self.is_built)
+        self._placeholder.setVisible(expanded and not self.is_built)
+
+    def _on_toggled(self, expanded):
+        self._apply_expanded(expanded)
+        if not expanded:
+            return
+        if not self.is_built:
+            self.ensure_built()
+        elif self._stats is not None:
+            self._update(self._stats)
@@ -0,0 +1,108 @@
+import numpy as np
+import shiboken6
+from PySide6.QtCore import QPointF
+from PySide6.QtGui import QPolygonF
+
+
+def _as_array(polygon: QPolygonF):
+    """
+    Liefert eine (n, 2)-float64-View auf die Punkte eines QPolygonF.
+    QPointF besteht aus zwei doubles, daher kann NumPy direkt hineinschreiben.
+    """
+    n = polygon.size()
+    if n == 0:
+        return np.empty((0, 2), dtype=np.float64)
+    try:
+        buffer = shiboken6.VoidPtr(polygon.data(), n * 2 * 8, True)
+        return np.frombuffer(buffer, dtype=np.float64).reshape(n, 2)
+    except (TypeError, ValueError):
+        return None
+
+
+class PolylineBuffer:
+    """
+    Wiederverwendbares QPolygonF für eine Datenreihe.
+
+    Die Punkte werden vektorisiert mit NumPy geschrieben, anschließend reicht
+    ein einziger drawLines()/drawPolygon()-Aufruf pro Reihe. Der Speicher
+    wird nur neu angelegt, wenn sich die Punktanzahl ändert.
+    """
+
+    def __init__(self):
+        self.polygon = QPolygonF()
+        self._array = None
+
+    def _resize(self, n):
+        if self.polygon.size() != n:
+            self.polygon.resize(n)
+            self._array = None
+        if self._array is None:
+            self._array = _as_array(self.polygon)
+
+    def set_points(self, xs, ys) -> QPolygonF:
+        """Setzt die Punkte (xs[i], ys[i]) und gibt das Polygon zurück"""
+        n = len(xs)
+        self._resize(n)
+        if self._array is not None:
+            self._array[:, 0] = xs
+            self._array[:, 1] = ys
+        else:
+            # Fallback ohne direkten Speicherzugriff
+            for i, (x, y) in enumerate(zip(xs, ys)):
+                self.polygon[i] = QPointF(float(x), float(y))
+        return self.polygon
+
+    def set_segments(self, xs, ys) -> QPolygonF:
+        """
+        Punktpaare (p0, p1), (p1, p2), ... für painter.drawLines().
+        Bei Stiftbreiten > 1 mit Antialiasing ist das deutlich schneller als
+        drawPolyline(), weil Qt keinen zusammenhängenden Pfad umranden muss.
+        """
+        n = len(xs)
+        if n < 2:
+            return self.set_points(xs[:0], ys[:0])
+        xs_paare = np.empty(2 * (n - 1))
+        ys_paare = np.empty(2 * (n - 1))
+        xs_paare[0::2] = xs[:-1]
+        xs_paare[1::2] = xs[1:]
+        ys_paare[0::2] = ys[:-1]
+        ys_paare[1::2] = ys[1:]
+        return self.set_points(xs_paare, ys_paare)
+
+    def set_area(self, xs, ys, baseline) -> QPolygonF:
+        """Wie set_points, aber zur Grundlinie geschlossen (für gefüllte Flächen)"""
+        n = len(xs)
+        if n == 0:
+            return self.set_points(xs, ys)
+        xs_area = np.empty(n + 2)
+        ys_area = np.empty(n + 2)
+        xs_area[:n] = xs
+        ys_area[:n] = ys
+        xs_area[n:] = (xs[-1], xs[0])
+        ys_area[n:] = baseline
+        return self.set_points(xs_area, ys_area)
+
+
+def decimate_minmax(werte, ziel_punkte):
+    """
+    Reduziert eine lange Reihe auf etwa 2 * ziel_punkte Punkte, indem pro
+    Block Minimum und Maximum behalten werden (Spitzen bleiben sichtbar).
+    Gibt (indizes, werte) zurück; die Indizes beziehen sich auf die Eingabe.
+    """
+    n = len(werte)
+    if ziel_punkte <= 0 or n <= 2 * ziel_punkte:
+        return np.arange(n), werte
+
+    block = n // ziel_punkte
+    start = n - (n // block) * block  # älteste Werte abschneiden, damit es aufgeht
+    bloecke = np.asarray(werte[start:]).reshape(-1, block)
+
+    ausgabe = np.empty(2 * len(bloecke))
+    ausgabe[0::2] = bloecke.min(axis=1)
+    ausgabe[1::2] = bloecke.max(axis=1)
+
+    basis = start + np.arange(len(bloecke)) * block
+    indizes = np.empty(2 * len(bloecke))
+    indizes[0::2] = basis
+    indizes[1::2] = basis + block - 1
+    return indizes, ausgabe
@@ -0,0 +1,73 @@
+from PySide6.QtCore import Qt
+
+from widgets.layered import LayeredWidget
+from widgets.theme import theme
+
+
+class ProfilerPanel(LayeredWidget):
+    """
+    Tabelle mit p50/p95/max pro Komponente (Collector, Paint, GUI-Update).
+    Zeilen, deren p95 über dem Budget liegt, werden rot markiert.
+    """
+
+    # Budgets in ms: Zeichnen sollte in einen Frame passen, Collector deutlich unter dem Takt bleiben
+    budgets = {"paint.": 8.0, "hintergrund.": 16.0, "collector.": 50.0, "zyklus.": 200.0, "gui.": 16.0}
+    row_height = 16
+    header_height = 44
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = []
+        self.setMinimumSize(600, self.header_height + 10)
+
+    def set_summary(self, summary):
+        rows = [(name, w["n"], w["p50_ms"], w["p95_ms"], w["max_ms"]) for name, w in summary.items()]
+        if len(rows) != len(self.rows):
+            self.setMinimumHeight(self.header_height + len(rows) * self.row_height + 10)
+        self.rows = rows
+        # Anzeige mit zwei Nachkommastellen
+        self.request_repaint(tuple((n, c, round(a, 2), round(b, 2), round(m, 2)) for n, c, a, b, m in rows))
+
+    def _budget(self, name):
+        for prefix, budget in self.budgets.items():
+            if name.startswith(prefix):
+                return budget
+        return None
+
+    def paint_background(self, painter):
+        painter.fillRect(self.rect(), theme.color("#1a1a1a"))
+
+        painter.setPen(theme.pen("#ffffff"))
+        painter.setFont(theme.font(10, bold=True))
+        painter.drawText(10, 20, "Profiler (F12 schließen, Strg+E exportieren)")
+
+        painter.setPen(theme.pen("#888888"))
+        painter.setFont(theme.font(8, bold=True))
+        y = self.header_height - 6
+        painter.drawText(10, y, "Komponente")
+        for x, text in zip(self._columns(), ("Anzahl", "p50 ms", "p95 ms", "max ms")):
+            painter.drawText(x - theme.text_width(text, 8, bold=True), y, text)
+
+    def _columns(self):
+        rechts = self.width() - 10
+        return rechts - 240, rechts - 160, rechts - 80, rechts
+
+    def paint_data(self, painter):
+        painter.setFont(theme.font(8))
+        normal = theme.pen("#ffffff")
+        warnung = theme.pen("#F44336")
+        spalten = self._columns()
+
+        y = self.header_height + self.row_height - 4
+        for name, anzahl, p50, p95, maximum in self.rows:
+            budget = self._budget(name)
+            painter.setPen(warnung if budget is not None and p95 > budget else normal)
+            painter.drawText(10, y, name)
+            for x, text in zip(spalten, (f"{anzahl}", f"{p50:.2f}", f"{p95:.2f}", f"{maximum:.2f}")):
+                painter.drawText(x - theme.text_width(text, 8), y, text)
+            y += self.row_height
+
+        if not self.rows:
+            painter.setPen(theme.pen("#555555"))
+            painter.drawText(self.rect().adjusted(0, self.header_height, 0, 0), Qt.AlignHCenter | Qt.AlignTop,
+                             "Noch keine Messwerte")
@@ -1,13 +1,20 @@
 # widgets/system_widgets.py
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QProgressBar
-from PySide6.QtGui import QPainter, QColor, QFont, QPen
-from PySide6.QtCore import Qt
-from collections import deque
+import numpy as np
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QProgressBar, QToolTip
+from PySide6.QtGui import QImage, QPainter
+from PySide6.QtCore import QEvent, QLine, QRect, Qt
+from monitor.metric_store import MetricStore
+from widgets.layered import LayeredWidget
+from widgets.polyline import PolylineBuffer, decimate_minmax
+from widgets.theme import theme
 
 
 
 
-class CpuCircleWidget(QWidget):
+class CpuCircleWidget(LayeredWidget):
+    # Anzeige mit einer Nachkommastelle
+    epsilon = 0.05
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.auslastung = 0.0  # CPU-Auslastung in %
@@ -15,28 +22,29 @@ class CpuCircleWidget(QWidget):
 
     def set_auslastung(self, value: float):
         self.auslastung = max(0.0, min(100.0, value))  # Clamp zwischen 0 und 100
-        self.update()
+        self.request_repaint(self.auslastung)
 
-    def paintEvent(self, event):
+    def _radii(self):
         size = min(self.width(), self.height())
         background_radius = size / 2 - 4
         progress_radius = background_radius - 3
+        return background_radius, progress_radius
 
+    def paint_background(self, painter):
+        background_radius, _ = self._radii()
         center = self.rect().center()
 
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-
         # Hintergrundfarbe (dunkler Kreis)
         painter.setPen(Qt.NoPen)
-        painter.setBrush(QColor("#1f1f28"))
+        painter.setBrush(theme.brush("#1f1f28"))
         painter.drawEllipse(center, background_radius, background_radius)
 
+    def paint_data(self, painter):
+        _, progress_radius = self._radii()
+        center = self.rect().center()
+
         # Fortschrittsbogen (blau, wie im Screenshot)
-        pen = QPen(QColor("#29b6f6"))
-        pen.setWidth(8)
-        pen.setCapStyle(Qt.FlatCap)
-        painter.setPen(pen)
+        painter.setPen(theme.pen("#29b6f6", 8, Qt.FlatCap))
 
         start_angle = -90 * 16
         span_angle = -int(self.auslastung / 100 * 360 * 16)
@@ -44,33 +52,110 @@ class CpuCircleWidget(QWidget):
                         2 * progress_radius, 2 * progress_radius, start_angle, span_angle)
 
         # Text: zentrierte CPU-Auslastung
-        painter.setPen(QColor("#ffffff"))
-        font = QFont("Segoe UI", 10)
-        font.setBold(True)
-        painter.setFont(font)
+        painter.setPen(theme.pen("#ffffff"))
+        painter.setFont(theme.font(10, bold=True))
         text = f"{self.auslastung:.1f} %"
         painter.drawText(self.rect(), Qt.AlignCenter, text)
 
-        painter.end()
-
 
-class CpuCoreBarsWidget(QWidget):
-    def __init__(self, parent=None):
+def _heatmap_lut():
+    # 0-100 % -> ARGB, Verlauf über dieselben Farben wie die Balken
+    stufen = np.array([0, 30, 70, 100])
+    farben = np.array([(0x26, 0x3a, 0x2c), (0x4C, 0xAF, 0x50), (0xFF, 0x98, 0x00), (0xF4, 0x43, 0x36)])
+    prozent = np.arange(101)
+    kanaele = [np.interp(prozent, stufen, farben[:, k]).astype(np.uint32) for k in range(3)]
+    return 0xFF000000 | (kanaele[0] << 16) | (kanaele[1] << 8) | kanaele[2]
+
+
+_HEATMAP_LUT = _heatmap_lut()
+
+
+class _HeatmapLayout:
+    """Zellgröße, Position jedes Kerns im QImage und Gruppenbeschriftungen für eine Widgetgröße"""
+
+    def __init__(self, gruppen, x0, y0, breite, hoehe):
+        anzahl = sum(len(gruppe.indizes) for gruppe in gruppen)
+        # Spaltenzahl so wählen, dass die Zellen möglichst groß werden (eine Leerzeile zwischen Gruppen)
+        self.zelle, self.spalten = 0, 1
+        for spalten in range(1, anzahl + 1):
+            zeilen = sum(-(-len(gruppe.indizes) // spalten) for gruppe in gruppen) + len(gruppen) - 1
+            zelle = int(min(breite / spalten, hoehe / zeilen))
+            if zelle > self.zelle:
+                self.zelle, self.spalten = zelle, spalten
+        self.zelle = max(2, self.zelle)
+
+        self.pixel = np.zeros(anzahl, dtype=np.intp)  # Kern-Index -> Position im Bild
+        self.beschriftungen = []  # (name, y, Kern-Indizes)
+        zeile = 0
+        for gruppe in gruppen:
+            positionen = zeile * self.spalten + np.arange(len(gruppe.indizes))
+            self.pixel[list(gruppe.indizes)] = positionen
+            self.beschriftungen.append((gruppe.name, y0 + zeile * self.zelle, np.array(gruppe.indizes)))
+            zeile += -(-len(gruppe.indizes) // self.spalten) + 1
+        self.zeilen = zeile - 1
+
+        self.kern_an = np.full(self.zeilen * self.spalten, -1, dtype=np.intp)  # Position -> Kern (Tooltip)
+        self.kern_an[self.pixel] = np.arange(anzahl)
+        self.ziel = QRect(x0, y0, self.spalten * self.zelle, self.zeilen * self.zelle)
+
+        # Zellgrenzen als Linien über dem skalierten Bild; bei sehr kleinen Zellen ohne
+        self.linien = []
+        if self.zelle >= 6:
+            rechts, unten = self.ziel.right() + 1, self.ziel.bottom() + 1
+            self.linien += [QLine(x0 + i * self.zelle, y0, x0 + i * self.zelle, unten) for i in range(1, self.spalten)]
+            self.linien += [QLine(x0, y0 + i * self.zelle, rechts, y0 + i * self.zelle) for i in range(1, self.zeilen)]
+
+    def core_at(self, x, y):
+        spalte, zeile = (x - self.ziel.x()) // self.zelle, (y - self.ziel.y()) // self.zelle
+        if not (0 <= spalte < self.spalten and 0 <= zeile < self.zeilen):
+            return -1
+        return int(self.kern_an[zeile * self.spalten + spalte])
+
+
+class CpuCoreBarsWidget(LayeredWidget):
+    """
+    Auslastung pro Kern: bis `heatmap_threshold` Kerne als Balken mit
+    Prozentwert, darüber als Heatmap. Die Heatmap ist ein QImage mit einem
+    Pixel pro Kern, das pro Tick per NumPy aus den Kernwerten gefüllt und mit
+    einem drawImage() auf Zellgröße skaliert wird. Die Kerne sind nach
+    NUMA-Knoten bzw. Sockel gruppiert (monitor/topology.py); Kern und Wert
+    zeigt der Tooltip.
+    """
+
+    # Prozentwerte werden ohne Nachkommastelle angezeigt
+    epsilon = 0.5
+    heatmap_threshold = 64
+    # Im Remote-Modus aus, da die lokale Topologie nicht zum angezeigten Host passt
+    use_topology = True
+    label_width = 90
+
+    def __init__(self, parent=None, heatmap_threshold=None):
         super().__init__(parent)
+        if heatmap_threshold is not None:
+            self.heatmap_threshold = heatmap_threshold
         self.usages = []
+        self.heatmap = False
+        self._gruppen = None
+        self._heatmap_layout = None
+        self._puffer = None
+        self._bild = None
         self.setMinimumSize(200, 120)
 
     def set_usages(self, usages: list[float]):
+        if len(usages) != len(self.usages):
+            # Anzahl der Kerne hat sich geändert -> Modus, Gruppen und Hintergrund neu bestimmen
+            self.heatmap = len(usages) > self.heatmap_threshold
+            self._gruppen = None
+            self._heatmap_layout = None
+            self.invalidate_background()
         self.usages = usages
-        self.update()
+        self.request_repaint(tuple(usages))
 
-    def paintEvent(self, event):
-        if not self.usages:
-            return
-
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+    def resizeEvent(self, event):
+        self._heatmap_layout = None
+        super().resizeEvent(event)
 
+    def _layout(self):
         # Berechne Layout-Parameter
         num_cores = len(self.usages)
         margin = 10
@@ -79,94 +164,152 @@ class CpuCoreBarsWidget(QWidget):
         bar_width = max(8, (available_width - (num_cores - 1) * spacing) / num_cores)
         bar_width = min(bar_width, 20)  # Maximale Breite erhöht für Prozent-Anzeige
         max_height = self.height() - 40  # Platz für Labels
+        return margin, spacing, bar_width, max_height
+
+    def _heatmap(self):
+        if self._heatmap_layout is None:
+            if self._gruppen is None:
+                if self.use_topology:
+                    from monitor.topology import cpu_groups
+                    self._gruppen = cpu_groups(len(self.usages))
+                else:
+                    from monitor.topology import group_cores
+                    self._gruppen = group_cores(len(self.usages), [], {}, {})
+            margin = 10
+            x0 = margin + (self.label_width if len(self._gruppen) > 1 else 0)
+            layout = _HeatmapLayout(self._gruppen, x0, margin, self.width() - x0 - margin, self.height() - 2 * margin)
+            # Das QImage verweist direkt auf den NumPy-Puffer; pro Tick wird nur der Puffer beschrieben
+            self._puffer = np.full((layout.zeilen, layout.spalten), 0xFF1f1f1f, dtype=np.uint32)
+            self._bild = QImage(self._puffer.data, layout.spalten, layout.zeilen, layout.spalten * 4,
+                                QImage.Format_RGB32)
+            self._heatmap_layout = layout
+        return self._heatmap_layout
+
+    def event(self, event):
+        if event.type() == QEvent.ToolTip and self.heatmap and self.usages:
+            index = self._heatmap().core_at(event.pos().x(), event.pos().y())
+            if index < 0:
+                QToolTip.hideText()
+                event.ignore()
+                return True
+            gruppe = next(g for g in self._gruppen if index in g.indizes)
+            cpu = gruppe.cpus[gruppe.indizes.index(index)]
+            ort = f" ({gruppe.name})" if gruppe.name else ""
+            QToolTip.showText(event.globalPos(), f"CPU {cpu}{ort}: {self.usages[index]:.0f} %", self)
+            return True
+        return super().event(event)
+
+    def paint_background(self, painter):
+        if not self.usages or self.heatmap:
+            return
+        margin, spacing, bar_width, max_height = self._layout()
 
-        # Bestimme Farbe basierend auf Auslastung
-        def get_color(usage):
-            if usage < 30:
-                return QColor("#4CAF50")  # Grün
-            elif usage < 70:
-                return QColor("#FF9800")  # Orange
-            else:
-                return QColor("#F44336")  # Rot
+        painter.setFont(theme.font(8))
 
-        for i, usage in enumerate(self.usages):
-            # Balken-Position berechnen
+        for i in range(len(self.usages)):
             x = margin + i * (bar_width + spacing)
-            height = max(2, max_height * usage / 100)
-            y = self.height() - height - 25
 
             # Hintergrund-Balken (dunkel)
-            painter.setBrush(QColor("#2a2a2a"))
+            painter.setBrush(theme.brush("#2a2a2a"))
             painter.setPen(Qt.NoPen)
             painter.drawRect(int(x), margin, int(bar_width), max_height)
 
-            # Fortschritts-Balken (farbig)
-            painter.setBrush(get_color(usage))
-            painter.drawRect(int(x), int(y), int(bar_width), int(height))
-
             # Core-Nummer als Label (bei 1 anfangen)
-            painter.setPen(QColor("#ffffff"))
-            font = QFont("Segoe UI", 8)
-            painter.setFont(font)
+            painter.setPen(theme.pen("#ffffff"))
             core_text = f"{i + 1}"
-            text_rect = painter.fontMetrics().boundingRect(core_text)
-            text_x = x + (bar_width - text_rect.width()) / 2
+            text_x = x + (bar_width - theme.text_width(core_text, 8)) / 2
             text_y = self.height() - 10
             painter.drawText(int(text_x), int(text_y), core_text)
 
+    def paint_data(self, painter):
+        if not self.usages:
+            return
+        if self.heatmap:
+            self.paint_heatmap(painter)
+            return
+        margin, spacing, bar_width, max_height = self._layout()
+
+        # Bestimme Farbe basierend auf Auslastung (Pinsel einmal holen, nicht pro Kern)
+        green = theme.brush("#4CAF50")
+        orange = theme.brush("#FF9800")
+        red = theme.brush("#F44336")
+        white = theme.pen("#ffffff")
+        painter.setFont(theme.font(7))
+
+        for i, usage in enumerate(self.usages):
+            # Balken-Position berechnen
+            x = margin + i * (bar_width + spacing)
+            height = max(2, max_height * usage / 100)
+            y = self.height() - height - 25
+
+            # Fortschritts-Balken (farbig)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(green if usage < 30 else orange if usage < 70 else red)
+            painter.drawRect(int(x), int(y), int(bar_width), int(height))
+
             # Prozent-Wert über dem Balken
             percent_text = f"{usage:.0f}%"
-            painter.setPen(QColor("#ffffff"))
-            font_small = QFont("Segoe UI", 7)
-            painter.setFont(font_small)
-            percent_rect = painter.fontMetrics().boundingRect(percent_text)
-            percent_x = x + (bar_width - percent_rect.width()) / 2
+            painter.setPen(white)
+            percent_x = x + (bar_width - theme.text_width(percent_text, 7)) / 2
             percent_y = max(15, y - 5)
             painter.drawText(int(percent_x), int(percent_y), percent_text)
 
-        painter.end()
-
-
-class CpuHistoryWidget(QWidget):
+    def paint_heatmap(self, painter):
+        layout = self._heatmap()
+        werte = np.asarray(self.usages, dtype=np.float64)
+        stufen = np.clip(np.rint(werte), 0, 100).astype(np.intp)
+        self._puffer.reshape(-1)[layout.pixel] = _HEATMAP_LUT[stufen]
+        painter.drawImage(layout.ziel, self._bild)
+        if layout.linien:
+            painter.setPen(theme.pen("#1f1f1f"))
+            painter.drawLines(layout.linien)
+
+        if len(layout.beschriftungen) > 1:
+            painter.setFont(theme.font(8))
+            painter.setPen(theme.pen("#ffffff"))
+            for name, y, indizes in layout.beschriftungen:
+                painter.drawText(10, y + 10, name)
+                painter.drawText(10, y + 24, f"Ø {werte[indizes].mean():.0f} %")
+
+
+class CpuHistoryWidget(LayeredWidget):
     """Ein Widget für die CPU-Verlaufsgrafik"""
 
-    def __init__(self, parent=None):
+    # Margins für Achsen-Labels
+    left_margin = 35
+    bottom_margin = 25
+    top_margin = 10
+    right_margin = 10
+
+    def __init__(self, store: MetricStore = None, series="cpu.auslastung", max_points=60,
+                 fill_area=False, parent=None):
         super().__init__(parent)
-        self.history = []  # Liste der letzten CPU-Werte
-        self.max_points = 60  # 60 Sekunden History
+        # Die Werte liegen im (gemeinsamen) MetricStore, nicht im Widget
+        self.store = store if store is not None else MetricStore()
+        self.series = series
+        self.max_points = max_points  # 60 Sekunden History
+        self.fill_area = fill_area    # Fläche unter der Linie füllen
+        self._line = PolylineBuffer()
+        self._area = PolylineBuffer()
         self.setMinimumSize(300, 150)
 
-    def add_value(self, value: float):
-        """Fügt einen neuen CPU-Wert zur History hinzu"""
-        self.history.append(value)
-        if len(self.history) > self.max_points:
-            self.history.pop(0)
-        self.update()
-
-    def paintEvent(self, event):
-        if len(self.history) < 2:
-            return
-
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-
-        # Margins für Achsen-Labels
-        left_margin = 35
-        bottom_margin = 25
-        top_margin = 10
-        right_margin = 10
-
+    def _graph_size(self):
         # Verfügbare Zeichenfläche
-        graph_width = self.width() - left_margin - right_margin
-        graph_height = self.height() - top_margin - bottom_margin
+        graph_width = self.width() - self.left_margin - self.right_margin
+        graph_height = self.height() - self.top_margin - self.bottom_margin
+        return graph_width, graph_height
+
+    def paint_background(self, painter):
+        left_margin = self.left_margin
+        top_margin = self.top_margin
+        graph_width, graph_height = self._graph_size()
 
         # Hintergrund
-        painter.fillRect(self.rect(), QColor("#1a1a1a"))
+        painter.fillRect(self.rect(), theme.color("#1a1a1a"))
 
         # Gitter-Linien und Y-Achse Beschriftung (0-100%)
-        painter.setPen(QPen(QColor("#333333"), 1))
-        font = QFont("Segoe UI", 8)
-        painter.setFont(font)
+        painter.setPen(theme.pen("#333333", 1))
+        painter.setFont(theme.font(8))
 
         for i in range(6):  # 0, 20, 40, 60, 80, 100
             percent = i * 20
@@ -177,16 +320,16 @@ class CpuHistoryWidget(QWidget):
                              left_margin + graph_width, int(y))
 
             # Y-Achse Beschriftung
-            painter.setPen(QColor("#ffffff"))
+            painter.setPen(theme.pen("#ffffff"))
             painter.drawText(5, int(y + 4), f"{percent}%")
-            painter.setPen(QPen(QColor("#333333"), 1))
+            painter.setPen(theme.pen("#333333", 1))
 
         # X-Achse Beschriftung (Zeit - aktueller Wert links)
-        painter.setPen(QColor("#ffffff"))
+        painter.setPen(theme.pen("#ffffff"))
         num_time_labels = 5
         for i in range(num_time_labels):
-            # Zeit von 0s (links/jetzt) bis 60s (rechts/alt)
-            seconds = i * 15  # 0, 15, 30, 45, 60
+            # Zeit von 0s (links/jetzt) bis max_points s (rechts/alt)
+            seconds = round(i * self.max_points / (num_time_labels - 1))  # 0, 15, 30, 45, 60
             x = left_margin + (graph_width * i / (num_time_labels - 1))
 
             if seconds == 0:
@@ -194,85 +337,89 @@ class CpuHistoryWidget(QWidget):
             else:
                 label = f"{seconds}s"
 
-            text_width = painter.fontMetrics().boundingRect(label).width()
+            text_width = theme.text_width(label, 8)
             painter.drawText(int(x - text_width / 2), self.height() - 5, label)
 
+    def paint_data(self, painter):
+        history = self.store.values(self.series, self.max_points)
+        if len(history) < 2:
+            return
+
+        left_margin = self.left_margin
+        top_margin = self.top_margin
+        graph_width, graph_height = self._graph_size()
+
         # CPU-Linie zeichnen (neuer Wert links, alte nach rechts)
-        if len(self.history) > 1:
-            painter.setPen(QPen(QColor("#29b6f6"), 2))
+        # Mehr Punkte als Pixel -> Min/Max pro Pixelspalte behalten
+        indices, values = decimate_minmax(history, graph_width)
 
-            points = []
-            for i, value in enumerate(self.history):
-                # Neuester Wert (letzter in der Liste) erscheint links
-                # Ältere Werte wandern nach rechts
-                reversed_index = len(self.history) - 1 - i
-                x = left_margin + (graph_width * reversed_index / (self.max_points - 1))
-                y = top_margin + graph_height - (graph_height * value / 100)
-                points.append((int(x), int(y)))
+        # Neuester Wert (letzter im Array) erscheint links, ältere wandern nach rechts
+        reversed_index = len(history) - 1 - indices
+        xs = left_margin + graph_width * reversed_index / (self.max_points - 1)
+        ys = top_margin + graph_height - graph_height * values / 100
 
-            # Punkte sind jetzt in umgekehrter Reihenfolge, also umkehren für korrekte Linien
-            points.reverse()
+        if self.fill_area:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(theme.brush("#29b6f6", alpha=60))
+            painter.drawPolygon(self._area.set_area(xs, ys, top_margin + graph_height))
+
+        # Die ganze Linie mit einem einzigen Aufruf zeichnen
+        painter.setPen(theme.pen("#29b6f6", 2))
+        painter.setBrush(Qt.NoBrush)
+        painter.drawLines(self._line.set_segments(xs, ys))
 
-            # Linie zwischen den Punkten zeichnen
-            for i in range(len(points) - 1):
-                painter.drawLine(points[i][0], points[i][1],
-                                 points[i + 1][0], points[i + 1][1])
 
-        painter.end()
+class RamWidget(LayeredWidget):
+    epsilon = 0.05
 
-class RamWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.usage_percent = 0.0
-        self.used_text = "0 GB"
-        self.total_text = "0 GB"
+        self.ram = None  # RamSnapshot, Texte werden erst beim Zeichnen formatiert
         self.setMinimumSize(200, 80)
 
     def set_ram_data(self, ram_data):
-        self.usage_percent = ram_data["auslastung"]
-        self.used_text = ram_data["genutzt_unit"]
-        self.total_text = ram_data["gesamt_unit"]
-        self.update()
-
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+        self.ram = ram_data
+        self.usage_percent = ram_data.auslastung
+        self.request_repaint((ram_data.genutzt_unit, ram_data.gesamt_unit, float(self.usage_percent)))
 
+    def paint_background(self, painter):
         # Hintergrund
-        painter.fillRect(self.rect(), QColor("#1a1a1a"))
+        painter.fillRect(self.rect(), theme.color("#1a1a1a"))
 
+        # Hintergrund-Balken
+        painter.setBrush(theme.brush("#2a2a2a"))
+        painter.setPen(Qt.NoPen)
+        painter.drawRect(10, 30, self.width() - 20, 20)
+
+        # Titel
+        painter.setPen(theme.pen("#ffffff"))
+        painter.setFont(theme.font(10, bold=True))
+        painter.drawText(10, 20, "RAM")
+
+    def paint_data(self, painter):
         # RAM-Balken
         bar_height = 20
         bar_y = 30
         bar_width = self.width() - 20
 
-        # Hintergrund-Balken
-        painter.setBrush(QColor("#2a2a2a"))
-        painter.setPen(Qt.NoPen)
-        painter.drawRect(10, bar_y, bar_width, bar_height)
-
         # Fortschritts-Balken
         progress_width = int(bar_width * self.usage_percent / 100)
-        color = QColor("#FF5722") if self.usage_percent > 80 else QColor("#4CAF50")
+        color = theme.color("#FF5722") if self.usage_percent > 80 else theme.color("#4CAF50")
+        painter.setPen(Qt.NoPen)
         painter.setBrush(color)
         painter.drawRect(10, bar_y, progress_width, bar_height)
 
         # Text
-        painter.setPen(QColor("#ffffff"))
-        font = QFont("Segoe UI", 10)
-        font.setBold(True)
-        painter.setFont(font)
-        painter.drawText(10, 20, "RAM")
-
-        font.setBold(False)
-        painter.setFont(font)
-        text = f"{self.used_text} / {self.total_text} ({self.usage_percent:.1f}%)"
+        painter.setPen(theme.pen("#ffffff"))
+        painter.setFont(theme.font(10))
+        used_text = self.ram.genutzt_unit if self.ram else "0 GB"
+        total_text = self.ram.gesamt_unit if self.ram else "0 GB"
+        text = f"{used_text} / {total_text} ({self.usage_percent:.1f}%)"
         painter.drawText(10, 70, text)
 
-        painter.end()
-
 
-class CpuInfoWidget(QWidget):
+class CpuInfoWidget(LayeredWidget):
     """Widget für CPU-Informationen (Kerne und Takt) - ohne Uptime"""
 
     def __init__(self, parent=None):
@@ -283,168 +430,151 @@ class CpuInfoWidget(QWidget):
         self.setMinimumSize(200, 80)
 
     def set_cpu_info(self, cpu_data, boot_data):
-        self.core_count = cpu_data["kern_anzahl"]
-        self.frequency = cpu_data["takt"]
-        self.frequency_unit = cpu_data["takt_unit"] or "0 MHz"
-        self.update()
-
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+        self.core_count = cpu_data.kern_anzahl
+        self.frequency = cpu_data.takt
+        self.frequency_unit = cpu_data.takt_unit or "0 MHz"
+        self.request_repaint((self.core_count, self.frequency_unit))
 
+    def paint_background(self, painter):
         # Hintergrund
-        painter.fillRect(self.rect(), QColor("#1a1a1a"))
+        painter.fillRect(self.rect(), theme.color("#1a1a1a"))
 
-        # Text
-        painter.setPen(QColor("#ffffff"))
-        font = QFont("Segoe UI", 10)
-        font.setBold(True)
-        painter.setFont(font)
+        # Titel
+        painter.setPen(theme.pen("#ffffff"))
+        painter.setFont(theme.font(10, bold=True))
         painter.drawText(10, 20, "CPU Info")
 
-        font.setBold(False)
-        painter.setFont(font)
+    def paint_data(self, painter):
+        painter.setPen(theme.pen("#ffffff"))
+        painter.setFont(theme.font(10))
         painter.drawText(10, 40, f"Kerne: {self.core_count}")
         painter.drawText(10, 60, f"Takt: {self.frequency_unit}")
 
-        painter.end()
-
 
-class NetworkHistoryWidget(QWidget):
+class NetworkHistoryWidget(LayeredWidget):
     """Widget für Netzwerk-Verlaufsdiagramm mit Zeitachse und Skalierung"""
 
-    def __init__(self, parent=None):
+    # Diagramm-Bereich
+    graph_x = 40
+    graph_y = 25
+    graph_height = 80
+
+    def __init__(self, store: MetricStore = None, sent_series="netzwerk.gesendet_rate",
+                 recv_series="netzwerk.empfangen_rate", max_points=60, fill_area=False, parent=None):
         super().__init__(parent)
-        self.sent_history = deque(maxlen=60)  # 60 Sekunden Verlauf
-        self.recv_history = deque(maxlen=60)
-        self.last_sent = 0
-        self.last_recv = 0
+        self.store = store if store is not None else MetricStore()
+        self.sent_series = sent_series
+        self.recv_series = recv_series
+        self.max_points = max_points  # 60 Sekunden Verlauf
+        self.fill_area = fill_area
+        self._lines = {sent_series: PolylineBuffer(), recv_series: PolylineBuffer()}
+        self._areas = {sent_series: PolylineBuffer(), recv_series: PolylineBuffer()}
         self.setMinimumSize(300, 160)
 
-    def add_network_data(self, network_data):
-        # Berechne Differenz zu letzter Messung für Rate
-        current_sent = network_data["gesendet_bytes"]
-        current_recv = network_data["empfangen_bytes"]
-
-        if self.last_sent > 0:
-            sent_rate = max(0, current_sent - self.last_sent)
-            recv_rate = max(0, current_recv - self.last_recv)
-        else:
-            sent_rate = 0
-            recv_rate = 0
-
-        self.sent_history.append(sent_rate)
-        self.recv_history.append(recv_rate)
-        self.last_sent = current_sent
-        self.last_recv = current_recv
-        self.update()
-
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+    def paint_background(self, painter):
+        graph_x = self.graph_x
+        graph_y = self.graph_y
+        graph_width = self.width() - 60
+        graph_height = self.graph_height
 
         # Hintergrund
-        painter.fillRect(self.rect(), QColor("#1a1a1a"))
+        painter.fillRect(self.rect(), theme.color("#1a1a1a"))
 
         # Titel
-        painter.setPen(QColor("#ffffff"))
-        font = QFont("Segoe UI", 10)
-        font.setBold(True)
-        painter.setFont(font)
+        painter.setPen(theme.pen("#ffffff"))
+        painter.setFont(theme.font(10, bold=True))
         painter.drawText(10, 15, "Netzwerk Verlauf")
 
-        if len(self.sent_history) < 2:
-            painter.end()
-            return
-
-        # Diagramm-Bereich
-        graph_x = 40
-        graph_y = 25
-        graph_width = self.width() - 60
-        graph_height = 80
-
         # Hintergrund des Diagramms
-        painter.setBrush(QColor("#2a2a2a"))
+        painter.setBrush(theme.brush("#2a2a2a"))
         painter.setPen(Qt.NoPen)
         painter.drawRect(graph_x, graph_y, graph_width, graph_height)
 
-        # Maximale Werte finden für Skalierung
-        max_sent = max(self.sent_history) if self.sent_history else 1
-        max_recv = max(self.recv_history) if self.recv_history else 1
-        max_value = max(max_sent, max_recv, 1)
-
-        # Y-Achse Skalierung zeichnen
-        painter.setPen(QColor("#555555"))
-        font_small = QFont("Segoe UI", 8)
-        painter.setFont(font_small)
-
-        # Y-Achse Labels (0%, 50%, 100%)
-        painter.drawText(5, graph_y + graph_height, "0")
-        painter.drawText(5, graph_y + graph_height // 2, self._format_bytes(max_value // 2))
-        painter.drawText(5, graph_y + 10, self._format_bytes(max_value))
-
         # Horizontale Gitterlinien
-        painter.setPen(QPen(QColor("#333333"), 1))
+        painter.setPen(theme.pen("#333333", 1))
         painter.drawLine(graph_x, graph_y + graph_height // 2, graph_x + graph_width, graph_y + graph_height // 2)
 
-        # Linien zeichnen
-        if len(self.sent_history) > 1:
-            # Gesendet (rot)
-            painter.setPen(QPen(QColor("#FF5722"), 2))
-            points = []
-            for i, value in enumerate(self.sent_history):
-                x = graph_x + int(i * graph_width / max(len(self.sent_history) - 1, 1))
-                y = graph_y + graph_height - int(value * graph_height / max_value)
-                points.append((x, y))
-
-            for i in range(len(points) - 1):
-                painter.drawLine(points[i][0], points[i][1], points[i + 1][0], points[i + 1][1])
-
-            # Empfangen (grün)
-            painter.setPen(QPen(QColor("#4CAF50"), 2))
-            points = []
-            for i, value in enumerate(self.recv_history):
-                x = graph_x + int(i * graph_width / max(len(self.recv_history) - 1, 1))
-                y = graph_y + graph_height - int(value * graph_height / max_value)
-                points.append((x, y))
-
-            for i in range(len(points) - 1):
-                painter.drawLine(points[i][0], points[i][1], points[i + 1][0], points[i + 1][1])
-
         # Zeitachse Labels
-        painter.setPen(QColor("#555555"))
-        painter.setFont(font_small)
-        painter.drawText(graph_x, graph_y + graph_height + 15, "-60s")
-        painter.drawText(graph_x + graph_width // 2 - 10, graph_y + graph_height + 15, "-30s")
+        painter.setPen(theme.pen("#555555"))
+        painter.setFont(theme.font(8))
+        painter.drawText(graph_x, graph_y + graph_height + 15, f"-{self.max_points}s")
+        painter.drawText(graph_x + graph_width // 2 - 10, graph_y + graph_height + 15, f"-{self.max_points // 2}s")
         painter.drawText(graph_x + graph_width - 15, graph_y + graph_height + 15, "0s")
 
         # Mehr Platz vor den Labels
         y_labels = graph_y + graph_height + 35
 
         # Legende mit mehr Abstand
-        painter.setPen(QColor("#FF5722"))
+        painter.setPen(theme.pen("#FF5722"))
         painter.drawText(10, y_labels, "↑ Gesendet")
-        painter.setPen(QColor("#4CAF50"))
+        painter.setPen(theme.pen("#4CAF50"))
         painter.drawText(100, y_labels, "↓ Empfangen")
 
+    def paint_data(self, painter):
+        sent = self.store.series(self.sent_series)
+        recv = self.store.series(self.recv_series)
+        sent_history = sent.values(self.max_points)
+        recv_history = recv.values(self.max_points)
+
+        if len(sent_history) < 2:
+            return
+
+        graph_x = self.graph_x
+        graph_y = self.graph_y
+        graph_width = self.width() - 60
+        graph_height = self.graph_height
+
+        # Maximale Werte finden für Skalierung
+        max_sent = sent.max(self.max_points, default=1)
+        max_recv = recv.max(self.max_points, default=1)
+        max_value = max(max_sent, max_recv, 1)
+
+        # Y-Achse Skalierung zeichnen
+        painter.setPen(theme.pen("#555555"))
+        painter.setFont(theme.font(8))
+
+        # Y-Achse Labels (0%, 50%, 100%)
+        painter.drawText(5, graph_y + graph_height, "0")
+        painter.drawText(5, graph_y + graph_height // 2, self._format_bytes(max_value // 2))
+        painter.drawText(5, graph_y + 10, self._format_bytes(max_value))
+
+        # Linien zeichnen
+        # Gesendet (rot), Empfangen (grün) – je ein drawLines-Aufruf
+        self._draw_series(painter, self.sent_series, sent_history, "#FF5722",
+                          graph_x, graph_y, graph_width, graph_height, max_value)
+        self._draw_series(painter, self.recv_series, recv_history, "#4CAF50",
+                          graph_x, graph_y, graph_width, graph_height, max_value)
+
         # Aktuelle Werte
-        if self.sent_history and self.recv_history:
-            current_sent = self.sent_history[-1]
-            current_recv = self.recv_history[-1]
-            font.setBold(False)
-            painter.setFont(font)
+        y_labels = graph_y + graph_height + 35
+        if len(sent_history) and len(recv_history):
+            current_sent = sent.last()
+            current_recv = recv.last()
+            painter.setFont(theme.font(10))
 
             # ↑ Gesendet in orange
-            painter.setPen(QColor("#FF5722"))
+            painter.setPen(theme.pen("#FF5722"))
             painter.drawText(self.width() - 120, y_labels,
                              f"↑{self._format_bytes(current_sent)}/s")
 
             # ↓ Empfangen in grün
-            painter.setPen(QColor("#4CAF50"))
+            painter.setPen(theme.pen("#4CAF50"))
             painter.drawText(self.width() - 120, y_labels + 15,
                              f"↓{self._format_bytes(current_recv)}/s")
 
-        painter.end()
+    def _draw_series(self, painter, name, history, color, graph_x, graph_y, graph_width, graph_height, max_value):
+        indices, values = decimate_minmax(history, graph_width)
+        xs = graph_x + indices * graph_width / max(len(history) - 1, 1)
+        ys = graph_y + graph_height - values * graph_height / max_value
+
+        if self.fill_area:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(theme.brush(color, alpha=50))
+            painter.drawPolygon(self._areas[name].set_area(xs, ys, graph_y + graph_height))
+
+        painter.setPen(theme.pen(color, 2))
+        painter.setBrush(Qt.NoBrush)
+        painter.drawLines(self._lines[name].set_segments(xs, ys))
 
     def _format_bytes(self, bytes_val):
         """Formatiert Bytes in lesbare Einheiten"""
@@ -455,185 +585,323 @@ class NetworkHistoryWidget(QWidget):
         elif bytes_val >= 1024:
             return f"{bytes_val / 1024:.1f}KB"
         else:
-            return f"{bytes_val}B"
+            return f"{bytes_val:.0f}B"
+
 
+class DiskWidget(LayeredWidget):
+    epsilon = 0.05
 
-class DiskWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.usage_percent = 0.0
-        self.used_text = "0 GB"
-        self.total_text = "0 GB"
+        self.disk = None  # DiskUsageSnapshot
         self.setMinimumSize(200, 80)
 
     def set_disk_data(self, disk_data):
-        self.usage_percent = disk_data["percent"]
-        self.used_text = disk_data["used_unit"]
-        self.total_text = disk_data["total_unit"]
-        self.update()
-
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+        self.disk = disk_data
+        self.usage_percent = disk_data.percent
+        self.request_repaint((disk_data.used_unit, disk_data.total_unit, float(self.usage_percent)))
 
+    def paint_background(self, painter):
         # Hintergrund
-        painter.fillRect(self.rect(), QColor("#1a1a1a"))
+        painter.fillRect(self.rect(), theme.color("#1a1a1a"))
 
+        # Hintergrund-Balken
+        painter.setBrush(theme.brush("#2a2a2a"))
+        painter.setPen(Qt.NoPen)
+        painter.drawRect(10, 30, self.width() - 20, 20)
+
+        # Titel
+        painter.setPen(theme.pen("#ffffff"))
+        painter.setFont(theme.font(10, bold=True))
+        painter.drawText(10, 20, "Festplatte")
+
+    def paint_data(self, painter):
         # Disk-Balken
         bar_height = 20
         bar_y = 30
         bar_width = self.width() - 20
 
-        # Hintergrund-Balken
-        painter.setBrush(QColor("#2a2a2a"))
-        painter.setPen(Qt.NoPen)
-        painter.drawRect(10, bar_y, bar_width, bar_height)
-
         # Fortschritts-Balken
         progress_width = int(bar_width * self.usage_percent / 100)
-        color = QColor("#FF5722") if self.usage_percent > 85 else QColor("#2196F3")
+        color = theme.color("#FF5722") if self.usage_percent > 85 else theme.color("#2196F3")
+        painter.setPen(Qt.NoPen)
         painter.setBrush(color)
         painter.drawRect(10, bar_y, progress_width, bar_height)
 
         # Text
-        painter.setPen(QColor("#ffffff"))
-        font = QFont("Segoe UI", 10)
-        font.setBold(True)
-        painter.setFont(font)
-        painter.drawText(10, 20, "Festplatte")
-
-        font.setBold(False)
-        painter.setFont(font)
-        text = f"{self.used_text} / {self.total_text} ({self.usage_percent:.1f}%)"
+        painter.setPen(theme.pen("#ffffff"))
+        painter.setFont(theme.font(10))
+        used_text = self.disk.used_unit if self.disk else "0 GB"
+        total_text = self.disk.total_unit if self.disk else "0 GB"
+        text = f"{used_text} / {total_text} ({self.usage_percent:.1f}%)"
         painter.drawText(10, 70, text)
 
-        painter.end()
-
 
-class NetworkWidget(QWidget):
+class NetworkWidget(LayeredWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.sent_text = "0 B"
-        self.recv_text = "0 B"
+        self.netzwerk = None  # NetzwerkSnapshot
         self.is_connected = False
+        self.rtt_ms = None
         self.interfaces = {}
         self.setMinimumSize(300, 120)
 
     def set_network_data(self, network_data, internet_data, interfaces_data):
-        self.sent_text = network_data["gesendet_unit"]
-        self.recv_text = network_data["empfangen_unit"]
-        self.is_connected = internet_data["connection"]
+        self.netzwerk = network_data
+        self.is_connected = internet_data.connection
+        self.rtt_ms = internet_data.rtt_ms
         self.interfaces = interfaces_data
-        self.update()
-
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+        rtt = round(self.rtt_ms) if self.rtt_ms is not None else None
+        self.request_repaint((network_data.gesendet_unit, network_data.empfangen_unit,
+                              self.is_connected, rtt, interfaces_data))
 
+    def paint_background(self, painter):
         # Hintergrund
-        painter.fillRect(self.rect(), QColor("#1a1a1a"))
+        painter.fillRect(self.rect(), theme.color("#1a1a1a"))
+
+        # Titel
+        painter.setPen(theme.pen("#ffffff"))
+        painter.setFont(theme.font(10, bold=True))
+        painter.drawText(10, 20, "Netzwerk")
+
+        painter.setFont(theme.font(10))
+        painter.setPen(theme.pen("#FFF59D"))
+        painter.drawText(10, 40, f"Gesendet / Empfangen seit Boot:")
 
+    def paint_data(self, painter):
         # Internet-Status-Indikator
-        status_color = QColor("#4CAF50") if self.is_connected else QColor("#F44336")
+        status_color = theme.color("#4CAF50") if self.is_connected else theme.color("#F44336")
         painter.setBrush(status_color)
         painter.setPen(Qt.NoPen)
         painter.drawEllipse(self.width() - 20, 10, 12, 12)
 
-        # Text
-        painter.setPen(QColor("#ffffff"))
-        font = QFont("Segoe UI", 10)
-        font.setBold(True)
-        painter.setFont(font)
-        painter.drawText(10, 20, "Netzwerk")
-
         # Internet-Status
-        font.setBold(False)
-        painter.setFont(font)
+        painter.setPen(theme.pen("#ffffff"))
+        painter.setFont(theme.font(10))
         status_text = "Online" if self.is_connected else "Offline"
-        painter.drawText(self.width() - 70, 20, status_text)
+        if self.is_connected and self.rtt_ms is not None:
+            status_text += f" ({self.rtt_ms:.0f} ms)"
+        text_width = theme.text_width(status_text, 10)
+        painter.drawText(self.width() - 30 - text_width, 20, status_text)
 
         # Traffic
-        #painter.setPen(QColor("#ffffff"))
-
-        painter.setPen(QColor("#FFF59D"))
-        painter.drawText(10, 40, f"Gesendet / Empfangen seit Boot:")
+        sent_text = self.netzwerk.gesendet_unit if self.netzwerk else "0 B"
+        recv_text = self.netzwerk.empfangen_unit if self.netzwerk else "0 B"
 
-        painter.setPen(QColor("#4CAF50"))
-        painter.drawText(10, 60, f"     ↑ Gesendet: {self.sent_text}")
+        painter.setPen(theme.pen("#4CAF50"))
+        painter.drawText(10, 60, f"     ↑ Gesendet: {sent_text}")
 
-        painter.setPen(QColor("#FF5722"))
-        painter.drawText(10, 80, f"     ↓ Empfangen: {self.recv_text}")
+        painter.setPen(theme.pen("#FF5722"))
+        painter.drawText(10, 80, f"     ↓ Empfangen: {recv_text}")
 
-        painter.setPen(QColor("#ffffff"))
+        painter.setPen(theme.pen("#ffffff"))
 
         # Aktive Interfaces
         y_offset = 100
         active_interfaces = [name for name, info in self.interfaces.items()
-                             if info["is_up"] and info["addresses"]]
+                             if info.is_up and info.addresses]
         if active_interfaces:
             interface_text = f"Aktiv:"
             for item in active_interfaces:
-                ip = self.interfaces[item]["addresses"][0]
+                ip = self.interfaces[item].addresses[0]
                 interface_text += f" {item} ({ip}),"
             interface_text = interface_text[:-1]
 
-            painter.setPen(QColor("#FFF59D"))
+            painter.setPen(theme.pen("#FFF59D"))
             painter.drawText(10, y_offset, interface_text)
-            painter.setPen(QColor("#FFFFFF"))
+            painter.setPen(theme.pen("#FFFFFF"))
 
-        painter.end()
 
-
-class DiskIOWidget(QWidget):
+class DiskIOWidget(LayeredWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.read_text = "0 B"
-        self.write_text = "0 B"
+        self.io = None  # DiskIOSnapshot
         self.read_count = 0
         self.write_count = 0
         self.setMinimumSize(280, 100)
 
     def set_disk_io_data(self, io_data):
-        self.read_text = io_data["read_unit"]
-        self.write_text = io_data["write_unit"]
-        self.read_count = io_data["read_count"]
-        self.write_count = io_data["write_count"]
-        self.update()
-
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+        self.io = io_data
+        self.read_count = io_data.read_count
+        self.write_count = io_data.write_count
+        self.request_repaint((io_data.read_unit, io_data.write_unit, self.read_count, self.write_count))
 
+    def paint_background(self, painter):
         # Hintergrund
-        painter.fillRect(self.rect(), QColor("#1a1a1a"))
+        painter.fillRect(self.rect(), theme.color("#1a1a1a"))
 
-        # Text
-        painter.setPen(QColor("#ffffff"))
-        font = QFont("Segoe UI", 10)
-        font.setBold(True)
-        painter.setFont(font)
+        # Titel
+        painter.setPen(theme.pen("#ffffff"))
+        painter.setFont(theme.font(10, bold=True))
         painter.drawText(10, 20, "Disk I/O")
 
-        font.setBold(False)
-        painter.setFont(font)
-
-        painter.setPen(QColor("#FFF59D"))
+        painter.setFont(theme.font(10))
+        painter.setPen(theme.pen("#FFF59D"))
         painter.drawText(10, 40, f"Gelesen / Geschrieben seit Boot:")
 
-        painter.setPen(QColor("#4CAF50"))
-        painter.drawText(10, 60, f"     Gelesen: {self.read_text}")
+    def paint_data(self, painter):
+        painter.setFont(theme.font(10))
+
+        read_text = self.io.read_unit if self.io else "0 B"
+        write_text = self.io.write_unit if self.io else "0 B"
+
+        painter.setPen(theme.pen("#4CAF50"))
+        painter.drawText(10, 60, f"     Gelesen: {read_text}")
 
-        painter.setPen(QColor("#FF5722"))
-        painter.drawText(10, 80, f"     Geschrieben: {self.write_text}")
+        painter.setPen(theme.pen("#FF5722"))
+        painter.drawText(10, 80, f"     Geschrieben: {write_text}")
 
-        painter.setPen(QColor("#ffffff"))
+        painter.setPen(theme.pen("#ffffff"))
         painter.drawText(10, 100, f"Ops: {self.read_count:,} / {self.write_count:,}")
 
 
-        painter.end()
+class DeviceThroughputWidget(LayeredWidget):
+    """
+    Durchsatz-Verlauf pro Gerät: je Gerät eine Zeile mit den aktuellen Raten
+    und einem kleinen Diagramm der letzten max_points Werte aus dem MetricStore
+    (Reihen "<prefix>.<gerät>.<suffix>", geschrieben von MainWindow.record_metrics).
+    Unterklassen legen Titel, Reihen und Zusatztext fest.
+    """
+
+    title = ""
+    prefix = ""
+    series = ()  # (suffix, feld im Raten-Snapshot, farbe, symbol) je Linie
+    header_height = 28
+    row_height = 42
+    max_geraete = 8
+
+    def __init__(self, store: MetricStore = None, max_points=60, parent=None):
+        super().__init__(parent)
+        self.store = store if store is not None else MetricStore()
+        self.max_points = max_points
+        self.raten = {}
+        self.geraete = ()
+        self._lines = {}
+        self.setMinimumSize(300, self.header_height + self.row_height)
+
+    def set_rates(self, raten, zeitpunkt=None):
+        raten = raten or {}
+        geraete = sorted(raten)
+        if len(geraete) > self.max_geraete:
+            # Bei mehr Geräten als Zeilen die aktivsten zeigen, weiter nach Namen sortiert
+            aktivste = sorted(geraete, key=lambda g: sum(self._werte(raten[g])), reverse=True)[:self.max_geraete]
+            geraete = sorted(aktivste)
+        geraete = tuple(geraete)
+        if len(geraete) != len(self.geraete):
+            self.setMinimumHeight(self.header_height + max(len(geraete), 1) * self.row_height)
+        if geraete != self.geraete:
+            # Linienpuffer nicht mehr gezeigter Geräte freigeben
+            namen = {self._name(g, suffix) for g in geraete for suffix, _, _, _ in self.series}
+            self._lines = {name: line for name, line in self._lines.items() if name in namen}
+        self.raten = raten
+        self.geraete = geraete
+        # Solange ein Verlauf sichtbar ist, wandert er mit jedem Tick weiter
+        aktiv = any(self.store.series(self._name(g, suffix)).max(self.max_points) > 0
+                    for g in geraete for suffix, _, _, _ in self.series)
+        self.request_repaint((geraete, tuple(self._text(raten[g]) for g in geraete), zeitpunkt if aktiv else None))
+
+    def _name(self, geraet, suffix):
+        return f"{self.prefix}.{geraet}.{suffix}"
+
+    def _werte(self, rate):
+        """Aktuelle Werte in der Reihenfolge von `series`"""
+        return [getattr(rate, feld) for _, feld, _, _ in self.series]
+
+    def _extra(self, rate):
+        return ""
+
+    def _text(self, rate):
+        teile = [f"{symbol} {_format_rate(wert)}" for (_, _, _, symbol), wert in zip(self.series, self._werte(rate))]
+        extra = self._extra(rate)
+        return "   ".join(teile + ([extra] if extra else []))
+
+    def paint_background(self, painter):
+        painter.fillRect(self.rect(), theme.color("#1a1a1a"))
+        painter.setPen(theme.pen("#ffffff"))
+        painter.setFont(theme.font(10, bold=True))
+        painter.drawText(10, 18, self.title)
+
+    def paint_data(self, painter):
+        if not self.geraete:
+            painter.setPen(theme.pen("#555555"))
+            painter.setFont(theme.font(9))
+            painter.drawText(10, self.header_height + 16, "Noch keine Messwerte")
+            return
+
+        breite = self.width() - 20
+        for i, geraet in enumerate(self.geraete):
+            y = self.header_height + i * self.row_height
+            if y + self.row_height > self.height():
+                break
+
+            painter.setPen(theme.pen("#ffffff"))
+            painter.setFont(theme.font(9, bold=True))
+            painter.drawText(10, y + 12, geraet)
+            painter.setPen(theme.pen("#aaaaaa"))
+            painter.setFont(theme.font(8))
+            painter.drawText(90, y + 12, self._text(self.raten[geraet]))
 
+            # Mini-Diagramm, alle Linien eines Geräts mit gemeinsamer Skala
+            graph_y = y + 17
+            graph_height = self.row_height - 21
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(theme.brush("#2a2a2a"))
+            painter.drawRect(10, graph_y, breite, graph_height)
+
+            reihen = [(self.store.series(self._name(geraet, suffix)), suffix, farbe)
+                      for suffix, _, farbe, _ in self.series]
+            max_value = max([reihe.max(self.max_points, default=0) for reihe, _, _ in reihen] + [1])
+            painter.setBrush(Qt.NoBrush)
+            for reihe, suffix, farbe in reihen:
+                history = reihe.values(self.max_points)
+                if len(history) < 2:
+                    continue
+                indices, values = decimate_minmax(history, breite)
+                xs = 10 + indices * breite / max(len(history) - 1, 1)
+                ys = graph_y + graph_height - values * graph_height / max_value
+                line = self._lines.setdefault(self._name(geraet, suffix), PolylineBuffer())
+                painter.setPen(theme.pen(farbe, 1))
+                painter.drawLines(line.set_segments(xs, ys))
+
+
+class DiskThroughputWidget(DeviceThroughputWidget):
+    title = "Laufwerke"
+    prefix = "disk"
+    series = (("read_rate", "read_bytes_s", "#4CAF50", "R"), ("write_rate", "write_bytes_s", "#FF5722", "W"))
+
+    def _extra(self, rate):
+        teile = [f"{rate.read_ops_s + rate.write_ops_s:.0f} IOPS"]
+        if rate.auslastung_prozent is not None:
+            teile.append(f"{rate.auslastung_prozent:.0f}%")
+        if rate.wartezeit_ms is not None:
+            teile.append(f"{rate.wartezeit_ms:.1f} ms")
+        return "  ".join(teile)
+
+
+class NicThroughputWidget(DeviceThroughputWidget):
+    title = "Netzwerkkarten"
+    prefix = "nic"
+    series = (("empfangen_rate", "empfangen_bytes_s", "#4CAF50", "↓"),
+              ("gesendet_rate", "gesendet_bytes_s", "#FF5722", "↑"))
+
+    def _extra(self, rate):
+        text = f"{rate.empfangen_pakete_s + rate.gesendet_pakete_s:.0f} Pkt/s"
+        if rate.fehler_s or rate.verworfen_s:
+            text += f"  Fehler {rate.fehler_s:.0f}/s  Drops {rate.verworfen_s:.0f}/s"
+        return text
+
+
+class BatteryWidget(LayeredWidget):
+    # Prozent ohne Nachkommastelle
+    epsilon = 0.5
+
+    # Akku-Symbol
+    battery_width = 60
+    battery_height = 30
+    battery_x = 10
+    battery_y = 25
 
-class BatteryWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.percent = 0.0
@@ -642,72 +910,62 @@ class BatteryWidget(QWidget):
         self.setMinimumSize(200, 80)
 
     def set_battery_data(self, battery_data):
+        has_battery = bool(battery_data)
+        if has_battery != self.has_battery:
+            # Akku-Rahmen bzw. "Kein Akku"-Text gehört zum statischen Teil
+            self.invalidate_background()
+        self.has_battery = has_battery
         if battery_data:
-            self.has_battery = True
-            self.percent = battery_data["percent"]
-            self.plugged = battery_data["power_plugged"]
-        else:
-            self.has_battery = False
-        self.update()
-
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+            self.percent = battery_data.percent
+            self.plugged = battery_data.power_plugged
+        self.request_repaint((self.has_battery, float(self.percent), self.plugged))
 
+    def paint_background(self, painter):
         # Hintergrund
-        painter.fillRect(self.rect(), QColor("#1a1a1a"))
+        painter.fillRect(self.rect(), theme.color("#1a1a1a"))
 
         if not self.has_battery:
-            painter.setPen(QColor("#ffffff"))
-            font = QFont("Segoe UI", 10)
-            painter.setFont(font)
+            painter.setPen(theme.pen("#ffffff"))
+            painter.setFont(theme.font(10))
             painter.drawText(10, 40, "Kein Akku vorhanden")
-            painter.end()
             return
 
-        # Akku-Symbol zeichnen
-        battery_width = 60
-        battery_height = 30
-        battery_x = 10
-        battery_y = 25
-
         # Akku-Rahmen
-        painter.setPen(QPen(QColor("#ffffff"), 2))
-        painter.setBrush(QColor("#2a2a2a"))
-        painter.drawRect(battery_x, battery_y, battery_width, battery_height)
+        painter.setPen(theme.pen("#ffffff", 2))
+        painter.setBrush(theme.brush("#2a2a2a"))
+        painter.drawRect(self.battery_x, self.battery_y, self.battery_width, self.battery_height)
 
         # Akku-Spitze
-        painter.drawRect(battery_x + battery_width, battery_y + 8, 4, 14)
+        painter.drawRect(self.battery_x + self.battery_width, self.battery_y + 8, 4, 14)
+
+    def paint_data(self, painter):
+        if not self.has_battery:
+            return
 
         # Akku-Füllung
-        fill_width = int((battery_width - 4) * self.percent / 100)
+        fill_width = int((self.battery_width - 4) * self.percent / 100)
         if self.percent > 20:
-            fill_color = QColor("#4CAF50")
+            fill_color = theme.color("#4CAF50")
         elif self.percent > 10:
-            fill_color = QColor("#FF9800")
+            fill_color = theme.color("#FF9800")
         else:
-            fill_color = QColor("#F44336")
+            fill_color = theme.color("#F44336")
 
         painter.setBrush(fill_color)
         painter.setPen(Qt.NoPen)
-        painter.drawRect(battery_x + 2, battery_y + 2, fill_width, battery_height - 4)
+        painter.drawRect(self.battery_x + 2, self.battery_y + 2, fill_width, self.battery_height - 4)
 
         # Text
-        painter.setPen(QColor("#ffffff"))
-        font = QFont("Segoe UI", 10)
-        font.setBold(True)
-        painter.setFont(font)
+        painter.setPen(theme.pen("#ffffff"))
+        painter.setFont(theme.font(10, bold=True))
         painter.drawText(80, 35, f"{self.percent:.0f}%")
 
-        font.setBold(False)
-        painter.setFont(font)
+        painter.setFont(theme.font(10))
         status = "Lädt" if self.plugged else "Entlädt"
         painter.drawText(80, 50, status)
 
-        painter.end()
 
-
-class SystemInfoWidget(QWidget):
+class SystemInfoWidget(LayeredWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.hostname = ""
@@ -717,80 +975,108 @@ class SystemInfoWidget(QWidget):
         self.setMinimumSize(300, 120)
 
     def set_system_data(self, system_data, boot_data):
-        self.hostname = system_data["hostname"]
-        self.system = f"{system_data['system']} {system_data['release']}"
-        self.uptime = boot_data["uptime"]
-        self.boot_time = boot_data["boot_string"]
-        self.update()
-
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+        self.hostname = system_data.hostname
+        self.system = f"{system_data.system} {system_data.release}"
+        self.uptime = boot_data.uptime
+        self.boot_time = boot_data.boot_string
+        self.request_repaint((self.hostname, self.system, self.uptime, self.boot_time))
 
+    def paint_background(self, painter):
         # Hintergrund
-        painter.fillRect(self.rect(), QColor("#1a1a1a"))
+        painter.fillRect(self.rect(), theme.color("#1a1a1a"))
 
-        # Text
-        painter.setPen(QColor("#ffffff"))
-        font = QFont("Segoe UI", 10)
-        font.setBold(True)
-        painter.setFont(font)
+        # Titel
+        painter.setPen(theme.pen("#ffffff"))
+        painter.setFont(theme.font(10, bold=True))
         painter.drawText(10, 20, "System Info")
 
-        font.setBold(False)
-        painter.setFont(font)
+    def paint_data(self, painter):
+        painter.setPen(theme.pen("#ffffff"))
+        painter.setFont(theme.font(10))
         painter.drawText(10, 40, f"Host: {self.hostname}")
         painter.drawText(10, 60, f"OS: {self.system}")
         painter.drawText(10, 80, f"Uptime: {self.uptime}")
         painter.drawText(10, 100, f"Boot: {self.boot_time}")
 
-        painter.end()
 
+class ProcessListWidget(LayeredWidget):
+    # Anzeige mit einer Nachkommastelle
+    epsilon = 0.05
 
-class ProcessListWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.processes = []
-        self.setMinimumSize(300, 200)
+        self.setMinimumSize(420, 200)
 
     def set_processes(self, processes):
-        # Nur die Top 10 Prozesse anzeigen
+        # Nur die Top 10 Prozesse anzeigen; RSS auf 0,1 MB gerundet, damit kleine Änderungen nicht neu zeichnen
         self.processes = processes[:10]
-        self.update()
+        self.request_repaint(tuple(
+            (p.name, p.pid, p.anzahl, p.threads, round((p.rss_bytes or 0) / 1024 ** 2, 1), float(p.cpu_prozent))
+            for p in self.processes))
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+    def _columns(self):
+        # rechte Kanten der Spalten Threads, RSS, CPU
+        rechts = self.width() - 10
+        return rechts - 150, rechts - 70, rechts
 
+    def paint_background(self, painter):
         # Hintergrund
-        painter.fillRect(self.rect(), QColor("#1a1a1a"))
+        painter.fillRect(self.rect(), theme.color("#1a1a1a"))
 
         # Header
-        painter.setPen(QColor("#ffffff"))
-        font = QFont("Segoe UI", 10)
-        font.setBold(True)
-        painter.setFont(font)
+        painter.setPen(theme.pen("#ffffff"))
+        painter.setFont(theme.font(10, bold=True))
         painter.drawText(10, 20, "Top CPU Prozesse")
 
-        # Prozesse auflisten
-        font.setBold(False)
-        painter.setFont(font)
-        y_offset = 40
+        painter.setPen(theme.pen("#888888"))
+        painter.setFont(theme.font(8, bold=True))
+        painter.drawText(10, 36, "PID")
+        painter.drawText(70, 36, "Name")
+        for x, text in zip(self._columns(), ("Threads", "RSS", "CPU")):
+            painter.drawText(x - theme.text_width(text, 8, bold=True), 36, text)
 
-        for i, (name, cpu_usage) in enumerate(self.processes):
-            if y_offset > self.height() - 20:
+    def paint_data(self, painter):
+        # Prozesse auflisten
+        painter.setFont(theme.font(10))
+        weiss = theme.pen("#ffffff")
+        grau = theme.pen("#888888")
+        rot = theme.pen("#F44336")
+        threads_x, rss_x, cpu_x = self._columns()
+        y_offset = 54
+
+        for p in self.processes:
+            if y_offset > self.height() - 10:
                 break
 
+            # PID, bei zusammengefassten Zeilen die Anzahl der Prozesse
+            painter.setPen(grau)
+            painter.drawText(10, y_offset, str(p.pid) if p.pid is not None else f"{p.anzahl}×")
+
             # Prozessname (gekürzt falls zu lang)
-            display_name = name[:25] + "..." if len(name) > 25 else name
-            painter.drawText(10, y_offset, display_name)
+            painter.setPen(weiss)
+            display_name = p.name[:25] + "..." if len(p.name) > 25 else p.name
+            painter.drawText(70, y_offset, display_name)
 
-            # CPU-Nutzung
-            painter.setPen(QColor("#F44336"))
-            painter.drawText(self.width() - 60, y_offset, f"{cpu_usage:.1f}%")
-            painter.setPen(QColor("#ffffff"))
+            for x, text in ((threads_x, "" if p.threads is None else str(p.threads)),
+                            (rss_x, "" if p.rss_bytes is None else _format_mb(p.rss_bytes))):
+                painter.drawText(x - theme.text_width(text, 10), y_offset, text)
 
+            # CPU-Nutzung
+            painter.setPen(rot)
+            text = f"{p.cpu_prozent:.1f}%"
+            painter.drawText(cpu_x - theme.text_width(text, 10), y_offset, text)
 
             y_offset += 18
 
-        painter.end()
\ No newline at end of file
+
+def _format_mb(bytes_val):
+    mb = bytes_val / 1024 ** 2
+    return f"{mb / 1024:.1f} GB" if mb >= 1024 else f"{mb:.1f} MB"
+
+
+def _format_rate(bytes_per_s):
+    for grenze, einheit in ((1024 ** 3, "GB"), (1024 ** 2, "MB"), (1024, "KB")):
+        if bytes_per_s >= grenze:
+            return f"{bytes_per_s / grenze:.1f} {einheit}/s"
+    return f"{bytes_per_s:.0f} B/s"
@@ -0,0 +1,91 @@
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QBrush, QColor, QFont, QFontMetrics, QPen
+
+
+class Theme:
+    """
+    Gemeinsamer Cache für Farben, Stifte, Pinsel, Schriften und Textmaße.
+
+    Alle Widgets holen ihre Zeichenobjekte hier, statt sie in jedem
+    paintEvent (oder sogar pro CPU-Kern) neu zu erzeugen. Die Objekte werden
+    beim ersten Zugriff angelegt und danach geteilt – sie dürfen deshalb
+    von den Widgets nicht verändert werden.
+    """
+
+    def __init__(self, font_family="Segoe UI", max_text_cache=4096):
+        self.font_family = font_family
+        self.max_text_cache = max_text_cache
+        self._colors = {}
+        self._pens = {}
+        self._brushes = {}
+        self._fonts = {}
+        self._metrics = {}
+        self._text_widths = {}
+
+    def color(self, spec, alpha=None) -> QColor:
+        key = (spec, alpha)
+        color = self._colors.get(key)
+        if color is None:
+            color = QColor(spec)
+            if alpha is not None:
+                color.setAlpha(alpha)
+            self._colors[key] = color
+        return color
+
+    def pen(self, spec, width=1, cap=Qt.SquareCap) -> QPen:
+        key = (spec, width, cap)
+        pen = self._pens.get(key)
+        if pen is None:
+            pen = QPen(self.color(spec), width)
+            pen.setCapStyle(cap)
+            self._pens[key] = pen
+        return pen
+
+    def brush(self, spec, alpha=None) -> QBrush:
+        key = (spec, alpha)
+        brush = self._brushes.get(key)
+        if brush is None:
+            brush = QBrush(self.color(spec, alpha))
+            self._brushes[key] = brush
+        return brush
+
+    def font(self, size, bold=False) -> QFont:
+        key = (size, bold)
+        font = self._fonts.get(key)
+        if font is None:
+            font = QFont(self.font_family, size)
+            font.setBold(bold)
+            self._fonts[key] = font
+        return font
+
+    def metrics(self, size, bold=False) -> QFontMetrics:
+        key = (size, bold)
+        metrics = self._metrics.get(key)
+        if metrics is None:
+            metrics = QFontMetrics(self.font(size, bold))
+            self._metrics[key] = metrics
+        return metrics
+
+    def text_width(self, text, size, bold=False) -> int:
+        """Breite eines Textes in Pixeln (gecacht, z. B. für Kern-Nummern und Prozentwerte)"""
+        key = (text, size, bold)
+        width = self._text_widths.get(key)
+        if width is None:
+            if len(self._text_widths) >= self.max_text_cache:
+                self._text_widths.clear()
+            width = self.metrics(size, bold).boundingRect(text).width()
+            self._text_widths[key] = width
+        return width
+
+    def clear(self):
+        """Leert alle Caches (z. B. nach einem Wechsel der Schriftart)"""
+        self._colors.clear()
+        self._pens.clear()
+        self._brushes.clear()
+        self._fonts.clear()
+        self._metrics.clear()
+        self._text_widths.clear()
+
+
+# Von allen Widgets geteilte Instanz
+theme = Theme()